@@ -2,22 +2,52 @@
 AI-powered project idea generator.
 Uses AI to generate all content dynamically instead of hardcoded data.
 """
+import hashlib
 import json
+import math
 import random
+import re
+import time
 from typing import List, Optional, Dict
 import os
 
+from cache import TTLCache
+from compression import packed, unpacked
+from prompts import PROMPT_VERSION
+from project_corpus import CORPUS_FRESH_RATIO, get_project_corpus, title_fingerprint
+from shared_state import get_shared_state
+from similar_index import index_projects
+
 # Check if AI generation is enabled
 USE_AI = os.getenv("USE_AI", "true").lower() == "true"
 
 # Try to import AI generator
 try:
-    from ai_generator import ai_generate_project_ideas, ai_generate_implementation_guidance
+    from ai_generator import (
+        AI_PROVIDER, ai_generate_project_ideas_sharded, ai_generate_project_detail, ai_generate_implementation_guidance
+    )
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
     USE_AI = False
 
+# Projects recently served, by id, so their detail can be generated on request.
+# Kept in shared state so any worker can find them; PROJECT_REGISTRY is this
+# worker's copy (both caches hold compressed values; use registered_project
+# and the detail helpers)
+PROJECT_REGISTRY_SIZE = int(os.getenv("PROJECT_REGISTRY_SIZE", "10000"))
+# Entries in the shared registry, which holds the projects served by all workers
+PROJECT_REGISTRY_SHARED_SIZE = int(os.getenv("PROJECT_REGISTRY_SHARED_SIZE", "100000"))
+PROJECT_REGISTRY_TTL = 24 * 3600
+PROJECT_REGISTRY = TTLCache(maxsize=PROJECT_REGISTRY_SIZE, ttl=PROJECT_REGISTRY_TTL)
+# Heavy fields generated for summary-mode projects, keyed by (project id, course)
+DETAIL_CACHE = TTLCache(maxsize=int(os.getenv("DETAIL_CACHE_SIZE", "2048")), ttl=24 * 3600)
+
+DETAIL_FIELDS = ["hardware", "software", "implementation_steps", "estimated_time", "job_relevance"]
+SUMMARY_FIELDS = ["title", "difficulty", "description", "tech_stack", "success_percentage"]
+
+NUM_PROJECTS = 5
+
 # Fallback project bank (used only if AI is not available)
 PROJECT_BANK = {
     "ai": {
@@ -339,25 +369,86 @@ PROJECT_BANK = {
     }
 }
 
+# Spellings of the same course, mapped to one canonical token (longest match first)
+COURSE_ALIASES = {
+    "bachelor of technology": "btech",
+    "b tech": "btech",
+    "bachelor of engineering": "be",
+    "computer science and engineering": "cse",
+    "computer science engineering": "cse",
+    "computer science": "cse",
+    "artificial intelligence and machine learning": "aiml",
+    "artificial intelligence and data science": "aids",
+    "artificial intelligence": "ai",
+    "ai and ml": "aiml",
+    "ai ml": "aiml",
+    "electronics and communication engineering": "ece",
+    "electronics and communication": "ece",
+    "information technology": "it"
+}
+_COURSE_ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(alias) for alias in sorted(COURSE_ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+def canonical_course(course: str) -> str:
+    """
+    Normalize a course name so equivalent spellings compare equal,
+    e.g. "B.Tech  CSE", "btech cse" and "BTech Computer Science" -> "btech cse".
+    """
+    text = course.lower().replace("&", " and ").replace("/", " ")
+    text = re.sub(r"(?<=\b[a-z])\.(?=\s*[a-z])", "", text)  # b.tech -> btech, b. tech -> b tech
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    return _COURSE_ALIAS_PATTERN.sub(lambda m: COURSE_ALIASES[m.group(1)], text)
+
+def project_id(title: str) -> str:
+    """Stable id for a project, derived from its normalized title."""
+    normalized = " ".join(title.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+def _register_projects(projects: List[dict]) -> List[dict]:
+    """Give each project an id and remember it for later detail requests."""
+    for project in projects:
+        project["id"] = project_id(project["title"])
+        PROJECT_REGISTRY.set(project["id"], packed(project))
+    shared = get_shared_state("projects", PROJECT_REGISTRY_SHARED_SIZE)
+    if shared is not None:
+        shared.set_many([(project["id"], json.dumps(project)) for project in projects], PROJECT_REGISTRY_TTL)
+    index_projects(projects)
+    return projects
+
+def registered_project(project_id: str) -> Optional[dict]:
+    """A recently served project by id (by any worker), or None if unknown or expired."""
+    project = unpacked(PROJECT_REGISTRY.get(project_id))
+    if project is None:
+        shared = get_shared_state("projects", PROJECT_REGISTRY_SHARED_SIZE)
+        value = shared.get(project_id) if shared is not None else None
+        if value is not None:
+            project = json.loads(value)
+            PROJECT_REGISTRY.set(project_id, packed(project))
+    return project
+
 def get_project_ideas(
     course: str,
     academic_year: Optional[int] = None,
     difficulty_level: Optional[str] = None,
-    project_type: Optional[str] = None
+    project_type: Optional[str] = None,
+    detail: str = "full",
+    exclude_titles: Optional[List[str]] = None,
+    num_projects: Optional[int] = None
 ) -> List[dict]:
     """
     Get project ideas based on course, academic year, and difficulty level.
     Uses AI generation if available, otherwise falls back to hardcoded data.
+    detail="summary" returns only title, difficulty, description, tech_stack and
+    success_percentage; use get_project_detail to fill in the rest.
+    Ideas matching exclude_titles (already shown to the user) are not returned.
+    num_projects defaults to NUM_PROJECTS (up to 10 from the fallback bank).
     """
     # Use AI generation if enabled and available
     if USE_AI and AI_AVAILABLE:
         try:
-            return ai_generate_project_ideas(
-                course=course,
-                academic_year=academic_year,
-                difficulty_level=difficulty_level,
-                project_type=project_type,
-                num_projects=5
+            return _corpus_or_ai_project_ideas(
+                course, academic_year, difficulty_level, project_type, detail, exclude_titles or [], num_projects or NUM_PROJECTS
             )
         except Exception as e:
             # If AI fails, fall back to hardcoded data
@@ -414,6 +505,10 @@ def get_project_ideas(
         project_copy = project.copy()
         project_copy["difficulty"] = difficulty
         project_copy["success_percentage"] = success_pct
+        if detail == "summary":
+            for field in DETAIL_FIELDS:
+                project_copy.pop(field, None)
+        project_copy["detail_level"] = detail
         result.append(project_copy)
     
     # Filter by academic year if specified (after adding difficulty)
@@ -427,9 +522,120 @@ def get_project_ideas(
         elif academic_year == 4:
             result = [p for p in result if p["difficulty"].lower() in ["medium", "advanced"]]
     
-    # Shuffle and return (limit to 10 if too many)
+    if exclude_titles:
+        excluded = {title_fingerprint(title) for title in exclude_titles}
+        result = [p for p in result if title_fingerprint(p["title"]) not in excluded]
+    
+    # Shuffle and return (limit to 10, or the requested number, if too many)
     random.shuffle(result)
-    return result[:10] if len(result) > 10 else result
+    return _register_projects(result[:num_projects or 10])
+
+def _corpus_or_ai_project_ideas(
+    course: str,
+    academic_year: Optional[int],
+    difficulty_level: Optional[str],
+    project_type: Optional[str],
+    detail: str,
+    exclude_titles: List[str],
+    num_projects: int
+) -> List[dict]:
+    """
+    Serve stored ideas from the project corpus and ask the LLM only for the rest
+    (at least CORPUS_FRESH_RATIO of the response). New ideas are added to the corpus.
+    Stored or generated ideas matching exclude_titles are skipped.
+    """
+    from local_generator import allowed_difficulties
+
+    # The local generator is free and deterministic, so its ideas are not worth storing
+    corpus = get_project_corpus() if AI_PROVIDER != "local" else None
+    course_key = canonical_course(course)
+    excluded = {title_fingerprint(title) for title in exclude_titles}
+    stored = []
+    if corpus is not None:
+        stored = corpus.sample(
+            course_key,
+            allowed_difficulties(academic_year, difficulty_level),
+            project_type,
+            num_projects - math.ceil(num_projects * CORPUS_FRESH_RATIO),
+            detail,
+            exclude=excluded
+        )
+
+    generated = []
+    if len(stored) < num_projects:
+        # Large shortfalls are generated as concurrent shards
+        generated = ai_generate_project_ideas_sharded(
+            course=course,
+            academic_year=academic_year,
+            difficulty_level=difficulty_level,
+            project_type=project_type,
+            num_projects=num_projects - len(stored),
+            detail=detail,
+            exclude_titles=exclude_titles
+        )
+        if corpus is not None:
+            # Local fallback ideas that filled failed shards are not worth storing
+            corpus.add(course_key, project_type, [project for project in generated if not project.get("fallback")])
+        for project in generated:
+            project.pop("fallback", None)
+        # The LLM does not always honour the exclusion list
+        seen = excluded | {title_fingerprint(project["title"]) for project in stored}
+        generated = [project for project in generated if title_fingerprint(project["title"]) not in seen]
+
+    if detail == "summary":
+        # Stored ideas may be fully detailed: register that copy, return the summary
+        stored = [
+            dict({field: project[field] for field in SUMMARY_FIELDS if field in project}, id=project["id"], detail_level="summary")
+            for project in _register_projects(stored)
+        ]
+        return stored + _register_projects(generated)
+    return _register_projects(stored + generated)
+
+def get_project_detail(project_id: str, course: str) -> Optional[dict]:
+    """
+    Get the full version of a previously served project.
+    Heavy fields are generated on first request and cached per course.
+    Returns None if the project id is unknown or has expired.
+    """
+    project = registered_project(project_id)
+    if project is None:
+        return None
+    if project.get("detail_level") != "summary":
+        return project
+    
+    cache_key = (project_id, canonical_course(course))
+    detail = unpacked(DETAIL_CACHE.get(cache_key))
+    if detail is None:
+        detail = _generate_project_detail(project, course)
+        DETAIL_CACHE.set(cache_key, packed(detail))
+    
+    full_project = dict(project)
+    full_project.update(detail)
+    full_project["detail_level"] = "full"
+    return full_project
+
+def _generate_project_detail(project: dict, course: str) -> dict:
+    """Generate heavy fields with AI, falling back to the closest bank project."""
+    if USE_AI and AI_AVAILABLE:
+        try:
+            return ai_generate_project_detail(
+                project["title"], course, project["difficulty"],
+                project.get("description", ""), project.get("tech_stack", [])
+            )
+        except Exception:
+            pass
+    
+    for category in PROJECT_BANK.values():
+        for projects in category.values():
+            for bank_project in projects:
+                if bank_project["title"].lower() == project["title"].lower():
+                    return {field: bank_project[field] for field in DETAIL_FIELDS}
+    
+    from local_generator import generate_project_detail
+    return generate_project_detail(
+        project["title"], course, project["difficulty"],
+        project.get("description", ""), project.get("tech_stack", [])
+    )
 
 def get_implementation_guidance(project_title: str, course: str, description: str = "") -> dict:
     """
@@ -502,3 +708,15 @@ def get_implementation_guidance(project_title: str, course: str, description: st
             "deployment": "Choose appropriate hosting platform, configure deployment pipeline."
         }
     }
+
+def caches_version() -> Dict:
+    return {"prompt_version": PROMPT_VERSION}
+
+def snapshot_caches() -> Optional[tuple]:
+    """(objects, arrays) for a warm-restart snapshot of the project registry and detail cache."""
+    return {"saved_at": time.time(), "registry": PROJECT_REGISTRY.dump(), "details": DETAIL_CACHE.dump()}, {}
+
+def restore_caches(objects: Dict, arrays: Dict) -> None:
+    elapsed = max(0.0, time.time() - objects["saved_at"])
+    PROJECT_REGISTRY.load(objects["registry"], elapsed)
+    DETAIL_CACHE.load(objects["details"], elapsed)
@@ -2,43 +2,121 @@
 AI-powered project idea generator using LLM APIs.
 Generates all content dynamically using AI instead of hardcoded data.
 """
+import importlib.util
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Dict
-import requests
 
-# Try to import OpenAI, fallback to other options
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# Provider SDKs are imported on first use to keep process start-up fast
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+
+from prompts import (
+    PROMPT_VERSION, DEFAULT_SYSTEM_PROMPT, SUMMARY_KEYS, DETAIL_KEYS,
+    system_prompt_for, schema_for, projects_token_budget, build_projects_prompt,
+    build_detail_prompt, build_guidance_prompt, build_score_prompt
+)
+from cancellation import Cancelled, check_cancelled, current_scope, record_call_cancelled, submit_in_context
+from model_profiles import metered_call, profile_for, report_usage
+from providers import ProviderPool, ProviderUnavailable
+from shared_cache import get_shared_cache, make_key
 
 # Configuration
-AI_PROVIDER = os.getenv("AI_PROVIDER", "openai")  # openai, huggingface, or local
+AI_PROVIDER = os.getenv("AI_PROVIDER", "openai")  # openai, huggingface, local, or pool
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
+# Default model; calls made through generate_with_ai use the task's profile (model_profiles.py)
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+HUGGINGFACE_MODEL = os.getenv("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
+
+# Provider pool (AI_PROVIDER=pool): primaries are ranked by health, fallbacks used last
+AI_POOL_PROVIDERS = [p.strip() for p in os.getenv("AI_POOL_PROVIDERS", "openai,huggingface").split(",") if p.strip()]
+AI_POOL_FALLBACK = [p.strip() for p in os.getenv("AI_POOL_FALLBACK", "local").split(",") if p.strip()]
+# Latency-sensitive tasks that get a hedged second request
+HEDGE_TASKS = {t.strip() for t in os.getenv("HEDGE_TASKS", "score,project_summaries").split(",") if t.strip()}
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "90"))
+
+# Requests for more ideas than this are split into concurrent smaller generations
+PROJECT_SHARD_SIZE = int(os.getenv("PROJECT_SHARD_SIZE", "5"))
+PROJECT_SHARD_WORKERS = int(os.getenv("PROJECT_SHARD_WORKERS", "8"))
+
+HF_MAX_NEW_TOKENS = 1024
+HF_MAX_LOAD_WAIT = 20.0
+
+# Models that accept strict json_schema response formats; others use JSON mode
+JSON_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
 
-def call_openai_api(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int = 2000) -> str:
-    """Call OpenAI API to generate content."""
+def call_openai_api(
+    prompt: str,
+    model: str = OPENAI_MODEL,
+    max_tokens: int = 2000,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+    schema: Optional[tuple] = None,
+    temperature: float = 0.7,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    Call OpenAI API to generate content.
+    schema is an optional (name, JSON schema) pair; when given, the response is
+    constrained to JSON (strict schema on models that support it, JSON mode otherwise).
+    Inside a cancel scope the response is streamed, so a cancelled request stops
+    generating as soon as the next chunk arrives. Token usage is reported to
+    the model metrics.
+    """
     if not OPENAI_AVAILABLE:
         raise ImportError("OpenAI library not installed. Run: pip install openai")
     
     if not OPENAI_API_KEY or OPENAI_API_KEY == "your_openai_api_key_here":
         raise ValueError("OPENAI_API_KEY not set. Set it as environment variable or in .env file")
     
+    import openai
+    
+    kwargs = {}
+    if schema:
+        name, json_schema = schema
+        if model.startswith(JSON_SCHEMA_MODEL_PREFIXES):
+            kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": name, "schema": json_schema, "strict": True}
+            }
+        else:
+            kwargs["response_format"] = {"type": "json_object"}
+    
     try:
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
+        client = openai.OpenAI(api_key=OPENAI_API_KEY, **({"timeout": timeout} if timeout else {}))
+        request = dict(
             model=model,
             messages=[
-                {"role": "system", "content": "You are an expert project advisor for students. Generate detailed, practical project ideas with complete information."},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=max_tokens,
-            temperature=0.7
+            temperature=temperature,
+            **kwargs
         )
-        return response.choices[0].message.content
+        scope = current_scope()
+        if scope is None:
+            response = client.chat.completions.create(**request)
+            if response.usage:
+                report_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+            return response.choices[0].message.content
+        
+        parts = []
+        # The final chunk carries the usage of the whole response
+        stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **request)
+        try:
+            for chunk in stream:
+                if scope.cancelled:
+                    # Closing the stream drops the connection, which ends generation
+                    raise Cancelled(max(0, max_tokens - len(parts)), started=True)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                if getattr(chunk, "usage", None):
+                    report_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        finally:
+            stream.close()
+        return "".join(parts)
     except openai.AuthenticationError:
         raise ValueError("Invalid OpenAI API key. Please check your API key.")
     except openai.RateLimitError:
@@ -46,116 +124,265 @@ def call_openai_api(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int =
     except Exception as e:
         raise Exception(f"OpenAI API error: {str(e)}")
 
-def call_huggingface_api(prompt: str, model: str = "mistralai/Mistral-7B-Instruct-v0.2") -> str:
-    """Call Hugging Face API to generate content."""
+def call_huggingface_api(
+    prompt: str,
+    model: str = HUGGINGFACE_MODEL,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+    max_tokens: int = 2000,
+    wait_for_model: bool = True,
+    temperature: float = 0.7,
+    timeout: float = 30
+) -> str:
+    """
+    Call Hugging Face API to generate content.
+    A 503 means the model is still loading: wait and retry once when
+    wait_for_model is set, otherwise raise ProviderUnavailable so a pool can
+    move on to another provider.
+    """
     if not HUGGINGFACE_API_KEY:
         raise ValueError("HUGGINGFACE_API_KEY not set")
     
+    import requests
+    
     api_url = f"https://api-inference.huggingface.co/models/{model}"
     headers = {"Authorization": f"Bearer {HUGGINGFACE_API_KEY}"}
+    # Static instructions first, then the request-specific part
+    inputs = f"{system_prompt}\n\n{prompt}"
+    payload = {
+        "inputs": inputs,
+        "parameters": {
+            "return_full_text": False,
+            "max_new_tokens": min(max_tokens, HF_MAX_NEW_TOKENS),
+            "temperature": temperature
+        }
+    }
     
     try:
-        response = requests.post(api_url, headers=headers, json={"inputs": prompt}, timeout=30)
+        for attempt in range(2):
+            response = requests.post(api_url, headers=headers, json=payload, timeout=timeout)
+            if response.status_code != 503:
+                break
+            try:
+                estimated_time = float(response.json().get("estimated_time", HF_MAX_LOAD_WAIT))
+            except ValueError:
+                estimated_time = HF_MAX_LOAD_WAIT
+            if not wait_for_model or attempt == 1 or estimated_time > HF_MAX_LOAD_WAIT:
+                raise ProviderUnavailable(f"model {model} is loading (estimated {estimated_time:.0f}s)")
+            time.sleep(estimated_time)
         response.raise_for_status()
         result = response.json()
         
         if isinstance(result, list) and len(result) > 0:
-            return result[0].get("generated_text", "")
+            text = result[0].get("generated_text", "")
+            # Some backends ignore return_full_text and echo the prompt anyway
+            if text.startswith(inputs):
+                text = text[len(inputs):]
+            return text
         return str(result)
+    except ProviderUnavailable:
+        raise
     except Exception as e:
         raise Exception(f"Hugging Face API error: {str(e)}")
 
-def generate_with_ai(prompt: str) -> str:
-    """Generate content using configured AI provider."""
-    if AI_PROVIDER == "openai":
-        return call_openai_api(prompt)
-    elif AI_PROVIDER == "huggingface":
-        return call_huggingface_api(prompt)
+def call_local_provider(task: str, params: Optional[Dict] = None) -> str:
+    """Generate content in-process with the local template generator (no network)."""
+    from local_generator import generate_local
+    return generate_local(task, params)
+
+def _openai_provider(prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> str:
+    profile = profile_for(task)
+    return call_openai_api(
+        prompt, model=profile["model"], max_tokens=max_tokens, system_prompt=system_prompt_for(task),
+        schema=schema_for(task), temperature=profile["temperature"], timeout=profile["timeout"]
+    )
+
+def _huggingface_provider(prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> str:
+    # One Hugging Face model serves every tier; the profile still sets temperature and timeout
+    profile = profile_for(task)
+    # In a pool, fail over instead of waiting for a cold model
+    return call_huggingface_api(
+        prompt, system_prompt=system_prompt_for(task), max_tokens=max_tokens,
+        wait_for_model=AI_PROVIDER != "pool", temperature=profile["temperature"], timeout=profile["timeout"]
+    )
+
+def _local_provider(prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> str:
+    return call_local_provider(task, params)
+
+PROVIDERS = {
+    "openai": _openai_provider,
+    "huggingface": _huggingface_provider,
+    "local": _local_provider
+}
+
+# Providers that stop mid-call when their cancel scope is cancelled (OpenAI
+# streams and checks the scope per chunk; the Hugging Face call blocks)
+INTERRUPTIBLE_PROVIDERS = {"openai"}
+
+_provider_pool = None
+
+def get_provider_pool() -> ProviderPool:
+    """Build the provider pool from AI_POOL_PROVIDERS / AI_POOL_FALLBACK on first use."""
+    global _provider_pool
+    if _provider_pool is None:
+        for name in AI_POOL_PROVIDERS + AI_POOL_FALLBACK:
+            if name not in PROVIDERS:
+                raise ValueError(f"Unknown AI provider in pool: {name}")
+        _provider_pool = ProviderPool(
+            {name: PROVIDERS[name] for name in AI_POOL_PROVIDERS},
+            fallback={name: PROVIDERS[name] for name in AI_POOL_FALLBACK},
+            hedge_percentile=HEDGE_PERCENTILE,
+            interruptible=INTERRUPTIBLE_PROVIDERS
+        )
+    return _provider_pool
+
+PROVIDER_MODELS = {
+    "openai": OPENAI_MODEL,
+    "huggingface": HUGGINGFACE_MODEL,
+    "local": "local"
+}
+
+# Providers whose answers are cheap enough that caching them is not worth it
+UNCACHED_PROVIDERS = {"local"}
+
+def _provider_model(provider: str, task: str) -> str:
+    """Model a provider uses for a task: the task's profile model for OpenAI."""
+    return profile_for(task)["model"] if provider == "openai" else PROVIDER_MODELS.get(provider, "")
+
+def _cache_identity(task: str) -> tuple:
+    """(provider, model) used in shared cache keys for a task in the current configuration."""
+    if AI_PROVIDER == "pool":
+        return "pool", ",".join(f"{name}:{_provider_model(name, task)}" for name in AI_POOL_PROVIDERS)
+    return AI_PROVIDER, _provider_model(AI_PROVIDER, task)
+
+def _generate_uncached(prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> tuple:
+    """Call the configured provider; returns (provider name, response text)."""
+    if AI_PROVIDER == "pool":
+        return get_provider_pool().call_with_provider(prompt, task, params, max_tokens, hedge=task in HEDGE_TASKS)
+    elif AI_PROVIDER in PROVIDERS:
+        return AI_PROVIDER, PROVIDERS[AI_PROVIDER](prompt, task, params, max_tokens)
     else:
         raise ValueError(f"Unknown AI provider: {AI_PROVIDER}")
 
+def generate_with_ai(
+    prompt: str,
+    task: str = "generic",
+    params: Optional[Dict] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Generate content using configured AI provider.
+    See generate_with_ai_info for how the call is made.
+    """
+    return generate_with_ai_info(prompt, task, params, max_tokens)[0]
+
+def generate_with_ai_info(
+    prompt: str,
+    task: str = "generic",
+    params: Optional[Dict] = None,
+    max_tokens: Optional[int] = None
+) -> tuple:
+    """
+    Generate content using configured AI provider; returns (response, info).
+    task selects the static system prompt and output schema; params describe the
+    request in structured form for providers that do not read the prompt
+    (e.g. the local generator). With AI_PROVIDER=pool the call is routed to the
+    healthiest provider and tasks in HEDGE_TASKS are hedged.
+    The task's model profile sets the model, temperature and timeout;
+    max_tokens defaults to the profile's limit and cannot exceed it.
+    Responses are stored in the shared cross-process cache, keyed by provider,
+    model, prompt version, task and the normalized prompt.
+    info is {"cached", "served_by", "latency"}: whether the answer came from the
+    shared cache, and otherwise the provider that served it and the seconds
+    its call took.
+    """
+    cache = get_shared_cache() if AI_PROVIDER not in UNCACHED_PROVIDERS else None
+    if cache is not None:
+        provider, model = _cache_identity(task)
+        key = make_key(provider, model, PROMPT_VERSION, task, prompt)
+        cached = cache.get(key, task)
+        if cached is not None:
+            return cached, {"cached": True, "served_by": None, "latency": 0.0}
+    
+    profile = profile_for(task)
+    max_tokens = profile["max_tokens"] if max_tokens is None else min(max_tokens, profile["max_tokens"])
+    try:
+        check_cancelled(max_tokens)
+        with metered_call(task, prompt, AI_PROVIDER) as call:
+            started = time.perf_counter()
+            served_by, response = _generate_uncached(prompt, task, params, max_tokens)
+            info = {"cached": False, "served_by": served_by, "latency": time.perf_counter() - started}
+            call["response"] = response
+            call["provider"] = served_by
+            call["model"] = _provider_model(served_by, task)
+    except Cancelled as e:
+        record_call_cancelled(task, e.tokens_saved, e.started)
+        raise
+    
+    # Only cache well-formed answers from real models
+    if cache is not None and served_by not in UNCACHED_PROVIDERS:
+        try:
+            parse_json_response(response)
+        except ValueError:
+            return response, info
+        cache.set(key, task, response)
+    return response, info
+
+def parse_json_response(ai_response: str):
+    """Parse a JSON response, stripping markdown code fences some models add."""
+    ai_response = ai_response.strip()
+    if ai_response.startswith("```json"):
+        ai_response = ai_response[7:]
+    if ai_response.startswith("```"):
+        ai_response = ai_response[3:]
+    if ai_response.endswith("```"):
+        ai_response = ai_response[:-3]
+    return json.loads(ai_response.strip())
+
 def ai_generate_project_ideas(
     course: str,
     academic_year: Optional[int] = None,
     difficulty_level: Optional[str] = None,
     project_type: Optional[str] = None,
-    num_projects: int = 5
+    num_projects: int = 5,
+    detail: str = "full",
+    exclude_titles: Optional[List[str]] = None,
+    variant: int = 0
 ) -> List[Dict]:
     """
     Generate project ideas using AI based on user input.
     All content is AI-generated, not from hardcoded data.
+    detail="summary" asks only for title, difficulty, description and tech_stack;
+    the remaining fields can be filled later with ai_generate_project_detail.
+    exclude_titles lists ideas the user has already seen, so they are not repeated.
+    variant tells apart otherwise identical requests made in parallel.
+    Ideas served by an uncached provider (e.g. the pool's local fallback) are
+    marked "fallback", like _fallback_project_ideas, so they stay out of the corpus.
     """
-    # Build prompt for AI
-    difficulty_text = difficulty_level if difficulty_level and difficulty_level != "All" else "Beginner, Medium, and Advanced"
-    year_text = f"for {academic_year} year students" if academic_year else "for all academic years"
-    type_text = f"for {project_type}" if project_type else "for both hackathon and academic projects"
-    
-    prompt = f"""Generate {num_projects} unique and innovative project ideas for a student pursuing {course} {year_text}.
-
-Requirements:
-- Difficulty levels: {difficulty_text}
-- Project type: {type_text}
-- Each project should be practical and implementable
-- Include projects suitable for hackathons and academic submissions
-
-For each project, provide:
-1. title: A catchy project title
-2. difficulty: One of "Beginner", "Medium", or "Advanced"
-3. description: A detailed 2-3 sentence description
-4. tech_stack: List of 5-7 relevant technologies/tools
-5. hardware: Hardware requirements (or "None" if software-only)
-6. software: List of 3-5 software tools/IDEs needed
-7. implementation_steps: List of 6-8 step-by-step implementation steps
-8. estimated_time: Time estimate (e.g., "3-4 weeks", "2 months")
-9. job_relevance: How this project helps in job preparation (1-2 sentences)
-
-Return ONLY a valid JSON array. Each project should be a JSON object with these exact keys:
-title, difficulty, description, tech_stack (array), hardware, software (array), implementation_steps (array), estimated_time, job_relevance
-
-Example format:
-[
-  {{
-    "title": "AI-Powered Study Planner",
-    "difficulty": "Beginner",
-    "description": "An intelligent study planner that uses machine learning to optimize study schedules based on learning patterns and deadlines.",
-    "tech_stack": ["Python", "Flask", "SQLite", "Scikit-learn", "React"],
-    "hardware": "None",
-    "software": ["Python 3.8+", "VS Code", "Node.js"],
-    "implementation_steps": [
-      "Set up development environment",
-      "Design database schema for users and tasks",
-      "Implement ML model for schedule optimization",
-      "Create REST API endpoints",
-      "Build frontend interface",
-      "Add user authentication",
-      "Test and deploy"
-    ],
-    "estimated_time": "3-4 weeks",
-    "job_relevance": "High - Demonstrates full-stack development and ML integration skills"
-  }}
-]
-
-Generate {num_projects} unique projects now:"""
+    prompt = build_projects_prompt(course, academic_year, difficulty_level, project_type, num_projects, exclude_titles or (), variant)
+    task = "project_summaries" if detail == "summary" else "projects"
+    params = {
+        "course": course,
+        "academic_year": academic_year,
+        "difficulty_level": difficulty_level,
+        "project_type": project_type,
+        "num_projects": num_projects
+    }
+    if exclude_titles:
+        params["exclude_titles"] = exclude_titles
+    if variant:
+        params["variant"] = variant
 
     try:
         # Call AI to generate projects
-        ai_response = generate_with_ai(prompt)
-        
-        # Parse JSON response
-        # Sometimes AI adds markdown code blocks, remove them
-        ai_response = ai_response.strip()
-        if ai_response.startswith("```json"):
-            ai_response = ai_response[7:]
-        if ai_response.startswith("```"):
-            ai_response = ai_response[3:]
-        if ai_response.endswith("```"):
-            ai_response = ai_response[:-3]
-        ai_response = ai_response.strip()
+        ai_response, info = generate_with_ai_info(prompt, task=task, params=params, max_tokens=projects_token_budget(num_projects, detail))
         
-        projects = json.loads(ai_response)
+        projects = parse_json_response(ai_response)
+        # Structured output wraps the array in {"projects": [...]}
+        if isinstance(projects, dict):
+            projects = projects.get("projects", [])
         
         # Validate and add success percentage
-        from predictor import predict_success_ai
+        from predictor import predict_success_batch
         
         result = []
         for project in projects:
@@ -167,83 +394,195 @@ Generate {num_projects} unique projects now:"""
             project.setdefault("difficulty", "Beginner")
             project.setdefault("description", "")
             project.setdefault("tech_stack", [])
-            project.setdefault("hardware", "None")
-            project.setdefault("software", [])
-            project.setdefault("implementation_steps", [])
-            project.setdefault("estimated_time", "N/A")
-            project.setdefault("job_relevance", "")
-            
-            # Calculate success percentage using AI
-            success_pct = predict_success_ai(
-                course=course,
-                project_name=project["title"],
-                difficulty=project["difficulty"],
-                description=project["description"],
-                tech_stack=project["tech_stack"]
-            )
-            
-            project["success_percentage"] = success_pct
+            if detail == "summary":
+                project = {key: project[key] for key in SUMMARY_KEYS}
+            else:
+                project.setdefault("hardware", "None")
+                project.setdefault("software", [])
+                project.setdefault("implementation_steps", [])
+                project.setdefault("estimated_time", "N/A")
+                project.setdefault("job_relevance", "")
+            project["detail_level"] = detail
+            if info["served_by"] in UNCACHED_PROVIDERS:
+                project["fallback"] = True
             result.append(project)
+        result = result[:num_projects]
         
-        return result[:num_projects]
+        # Calculate success percentages (LLM, learned model or heuristic; see SUCCESS_SCORER)
+        for project, success_pct in zip(result, predict_success_batch(course, result)):
+            project["success_percentage"] = success_pct
+        
+        return result
         
     except json.JSONDecodeError as e:
         raise Exception(f"AI returned invalid JSON. Response: {ai_response[:200]}... Error: {str(e)}")
     except Exception as e:
         raise Exception(f"Error generating projects with AI: {str(e)}")
 
+_shard_executor = None
+
+def _project_shards(academic_year: Optional[int], difficulty_level: Optional[str], num_projects: int) -> List[tuple]:
+    """
+    Split a request into (difficulty, count, variant) shards: one per allowed
+    level, split evenly so none exceeds PROJECT_SHARD_SIZE. variant numbers the
+    shards of one level.
+    """
+    from local_generator import allowed_difficulties
+
+    difficulties = allowed_difficulties(academic_year, difficulty_level)
+    counts = [num_projects // len(difficulties) + (i < num_projects % len(difficulties)) for i in range(len(difficulties))]
+    shards = []
+    for difficulty, count in zip(difficulties, counts):
+        # Evenly sized pieces, e.g. 7 -> 4 + 3 rather than 5 + 2
+        pieces = -(-count // PROJECT_SHARD_SIZE)
+        for i in range(pieces):
+            shards.append((difficulty.capitalize(), count // pieces + (i < count % pieces), i))
+    return shards
+
+def _fallback_project_ideas(
+    course: str,
+    academic_year: Optional[int],
+    difficulty: str,
+    project_type: Optional[str],
+    num_projects: int,
+    detail: str,
+    exclude_titles: List[str]
+) -> List[Dict]:
+    """
+    Ideas from the local generator, scored heuristically, to fill a failed shard.
+    They are marked "fallback" so callers can keep them out of the corpus.
+    """
+    from local_generator import generate_project_ideas
+    from predictor import predict_success_batch
+
+    projects = generate_project_ideas(course, academic_year, difficulty, project_type, num_projects, exclude_titles)
+    if detail == "summary":
+        projects = [{key: project[key] for key in SUMMARY_KEYS} for project in projects]
+    for project, success_pct in zip(projects, predict_success_batch(course, projects, scorer="heuristic")):
+        project["detail_level"] = detail
+        project["success_percentage"] = success_pct
+        project["fallback"] = True
+    return projects
+
+def ai_generate_project_ideas_sharded(
+    course: str,
+    academic_year: Optional[int] = None,
+    difficulty_level: Optional[str] = None,
+    project_type: Optional[str] = None,
+    num_projects: int = 5,
+    detail: str = "full",
+    exclude_titles: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Like ai_generate_project_ideas, but large requests are split into shards
+    (per difficulty level, at most PROJECT_SHARD_SIZE ideas each) generated
+    concurrently, so latency stays close to one small generation. Titles are
+    deduplicated across shards as they finish; shards that fail or come back
+    short are filled with local fallback ideas.
+    """
+    global _shard_executor
+    from project_corpus import title_fingerprint
+
+    if num_projects <= PROJECT_SHARD_SIZE:
+        return ai_generate_project_ideas(course, academic_year, difficulty_level, project_type, num_projects, detail, exclude_titles)
+    if _shard_executor is None:
+        _shard_executor = ThreadPoolExecutor(max_workers=PROJECT_SHARD_WORKERS, thread_name_prefix="shard")
+
+    exclude_titles = list(exclude_titles or [])
+    # Shards run in the caller's context, so cancelling the request cancels them too
+    futures = {
+        submit_in_context(
+            _shard_executor, ai_generate_project_ideas,
+            course, academic_year, difficulty, project_type, count, detail, exclude_titles, variant
+        ): (difficulty, count)
+        for difficulty, count, variant in _project_shards(academic_year, difficulty_level, num_projects)
+    }
+    result, seen = [], {title_fingerprint(title) for title in exclude_titles}
+    shortfall, errors = {}, []
+    for future in as_completed(futures):
+        difficulty, count = futures[future]
+        try:
+            projects = future.result()
+        except Exception as e:
+            errors.append(e)
+            projects = []
+        added = 0
+        for project in projects:
+            fingerprint = title_fingerprint(project["title"])
+            if fingerprint not in seen and added < count:
+                seen.add(fingerprint)
+                result.append(project)
+                added += 1
+        if added < count:
+            shortfall[difficulty] = shortfall.get(difficulty, 0) + count - added
+    if len(errors) == len(futures):
+        # Nothing was generated: let the caller fall back as it would for one request
+        raise errors[0]
+
+    for difficulty, count in shortfall.items():
+        fallback = _fallback_project_ideas(
+            course, academic_year, difficulty, project_type, count, detail,
+            exclude_titles + [project["title"] for project in result]
+        )
+        for project in fallback:
+            fingerprint = title_fingerprint(project["title"])
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                result.append(project)
+    return result
+
+def ai_generate_project_detail(
+    project_title: str,
+    course: str,
+    difficulty: str = "Beginner",
+    description: str = "",
+    tech_stack: Optional[List[str]] = None
+) -> Dict:
+    """
+    Generate the heavy fields (hardware, software, implementation_steps,
+    estimated_time, job_relevance) for a project returned in summary mode.
+    """
+    tech_stack = tech_stack or []
+    prompt = build_detail_prompt(project_title, course, difficulty, description, tech_stack)
+
+    try:
+        ai_response = generate_with_ai(prompt, task="project_detail", params={
+            "project_title": project_title,
+            "course": course,
+            "difficulty": difficulty,
+            "description": description,
+            "tech_stack": tech_stack
+        })
+        
+        detail = parse_json_response(ai_response)
+        
+        detail.setdefault("hardware", "None")
+        detail.setdefault("software", [])
+        detail.setdefault("implementation_steps", [])
+        detail.setdefault("estimated_time", "N/A")
+        detail.setdefault("job_relevance", "")
+        return {key: detail[key] for key in DETAIL_KEYS}
+        
+    except json.JSONDecodeError as e:
+        raise Exception(f"AI returned invalid JSON. Error: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Error generating project detail with AI: {str(e)}")
+
 def ai_generate_implementation_guidance(project_title: str, course: str, description: str = "") -> Dict:
     """
     Generate detailed implementation guidance using AI.
     All guidance is AI-generated.
     """
-    prompt = f"""Generate comprehensive implementation guidance for a project: "{project_title}"
-
-Student's course: {course}
-Project description: {description if description else "Not provided"}
-
-Provide detailed guidance including:
-
-1. hardware_setup: Detailed steps for hardware setup (if hardware is needed, otherwise explain it's software-only)
-2. software_setup: Step-by-step software installation and environment setup
-3. implementation_steps: Detailed 8-10 step implementation guide
-4. best_practices: List of 5-7 best practices for this project
-5. common_challenges: List of 5-7 common challenges students might face
-6. resources: List of 3-5 helpful resources (tutorials, documentation, etc.)
-7. testing_strategy: How to test the project
-8. deployment_guide: How to deploy the project
-
-Return ONLY a valid JSON object with these exact keys:
-hardware_setup, software_setup, implementation_steps (array), best_practices (array), common_challenges (array), resources (array), testing_strategy, deployment_guide
-
-Example format:
-{{
-  "hardware_setup": "This is a software-only project. No hardware setup required...",
-  "software_setup": "1. Install Python 3.8+...",
-  "implementation_steps": ["Step 1", "Step 2", ...],
-  "best_practices": ["Practice 1", "Practice 2", ...],
-  "common_challenges": ["Challenge 1", "Challenge 2", ...],
-  "resources": ["Resource 1", "Resource 2", ...],
-  "testing_strategy": "Testing approach...",
-  "deployment_guide": "Deployment steps..."
-}}
-
-Generate the guidance now:"""
+    prompt = build_guidance_prompt(project_title, course, description)
 
     try:
-        ai_response = generate_with_ai(prompt)
+        ai_response = generate_with_ai(prompt, task="guidance", params={
+            "project_title": project_title,
+            "course": course,
+            "description": description
+        })
         
-        # Clean response
-        ai_response = ai_response.strip()
-        if ai_response.startswith("```json"):
-            ai_response = ai_response[7:]
-        if ai_response.startswith("```"):
-            ai_response = ai_response[3:]
-        if ai_response.endswith("```"):
-            ai_response = ai_response[:-3]
-        ai_response = ai_response.strip()
-        
-        guidance = json.loads(ai_response)
+        guidance = parse_json_response(ai_response)
         
         # Add project title
         guidance["project_title"] = project_title
@@ -266,45 +605,25 @@ def ai_calculate_success_percentage(
     """
     Use AI to calculate success percentage based on project details.
     """
-    prompt = f"""Analyze this project idea and calculate its success percentage (0-100):
-
-Course: {course}
-Project Title: {project_title}
-Difficulty: {difficulty}
-Description: {description}
-Tech Stack: {', '.join(tech_stack)}
-
-Consider factors:
-- Difficulty level appropriateness for the course
-- Project feasibility
-- Tech stack relevance and learning curve
-- Market demand and job relevance
-- Implementation complexity
-- Hackathon/portfolio appeal
-
-Return ONLY a JSON object with this format:
-{{
-  "success_percentage": 75.5,
-  "reasoning": "Brief explanation of the score"
-}}
-
-Calculate now:"""
+    prompt = build_score_prompt(course, project_title, difficulty, description, tech_stack)
 
     try:
-        ai_response = generate_with_ai(prompt)
-        
-        # Clean response
-        ai_response = ai_response.strip()
-        if ai_response.startswith("```json"):
-            ai_response = ai_response[7:]
-        if ai_response.startswith("```"):
-            ai_response = ai_response[3:]
-        if ai_response.endswith("```"):
-            ai_response = ai_response[:-3]
-        ai_response = ai_response.strip()
+        ai_response, info = generate_with_ai_info(prompt, task="score", params={
+            "course": course,
+            "project_title": project_title,
+            "difficulty": difficulty,
+            "description": description,
+            "tech_stack": tech_stack
+        })
         
-        result = json.loads(ai_response)
-        return float(result.get("success_percentage", 70.0))
+        result = parse_json_response(ai_response)
+        score = float(result.get("success_percentage", 70.0))
+        if not info["cached"] and info["served_by"] not in UNCACHED_PROVIDERS:
+            # Keep fresh real model scores as training data for the learned scorer
+            from success_model import log_score
+            log_score(course, project_title, difficulty, description, tech_stack, score,
+                      info["latency"], info["served_by"])
+        return score
         
     except Exception as e:
         # Fallback to default calculation
@@ -1,9 +1,15 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-import pandas as pd
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Dict, List, Literal, Optional
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+import asyncio
+import base64
+import csv
+import io
 import json
 import os
 
@@ -14,13 +20,152 @@ try:
 except ImportError:
     pass  # dotenv not installed, use system env vars
 
-from ai_brain import get_project_ideas, get_implementation_guidance
+from ai_brain import get_project_ideas, get_project_detail, get_implementation_guidance, canonical_course
 from predictor import predict_success
+from data_store import get_hackathon_index, add_hackathon as append_hackathon, import_hackathons as import_hackathon_rows, parse_date
+from jobs import JobManager, JobQueueFull
+from cancellation import CancelScope, cancel_scope, record_request_cancelled
+import snapshots
+from hackathon_changes import ResyncRequired, get_change_log
+
+# Bulk generation limits for /projects/batch
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "100"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+
+# Seconds between client-disconnect checks while generation runs
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.5"))
+
+# Most project ideas one /projects request may ask for
+PROJECTS_MAX_PER_REQUEST = int(os.getenv("PROJECTS_MAX_PER_REQUEST", "30"))
+
+# Largest page /hackathons and /sih return when a limit is given
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "500"))
+
+# Background job runners, keyed by job kind
+JOB_RUNNERS = {
+    "projects": lambda request: get_project_ideas(**request),
+    "guidance": lambda request: get_implementation_guidance(
+        request["project_title"], request["course"], request.get("description", "")
+    )
+}
+
+job_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    global job_manager
+    if job_manager is None:
+        job_manager = JobManager(JOB_RUNNERS)
+        job_manager.start()
+    return job_manager
+
+class _Flight:
+    """One run of generation work and the number of clients waiting on it."""
+
+    def __init__(self, task: asyncio.Future, scope: CancelScope):
+        self.task = task
+        self.scope = scope
+        self.waiters = 0
+
+# Runs in progress, by request key, so identical concurrent requests share one
+_flights: Dict[tuple, _Flight] = {}
+
+async def _run_cancellable(http_request: Request, key: Optional[tuple], func, *args, **kwargs):
+    """
+    Run blocking generation work in the thread pool on behalf of a client.
+    Concurrent requests with the same key share one run. When every client
+    waiting on a run has disconnected, the run is cancelled: provider calls not
+    yet started are skipped and streaming calls stop mid-response. Returns
+    None to a client that disconnected.
+    """
+    flight = _flights.get(key) if key is not None else None
+    if flight is None:
+        scope = CancelScope()
+        
+        def work():
+            with cancel_scope(scope):
+                return func(*args, **kwargs)
+        
+        flight = _Flight(asyncio.ensure_future(run_in_threadpool(work)), scope)
+        # Nobody may be left to read the result of a cancelled run
+        flight.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        if key is not None:
+            _flights[key] = flight
+            flight.task.add_done_callback(lambda _: _flights.get(key) is flight and _flights.pop(key))
+    
+    flight.waiters += 1
+    disconnected = True
+    try:
+        while True:
+            done, _ = await asyncio.wait({flight.task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                disconnected = False
+                return flight.task.result()
+            if await http_request.is_disconnected():
+                return None
+    finally:
+        flight.waiters -= 1
+        if disconnected and flight.waiters == 0 and not flight.task.done():
+            flight.scope.cancel()
+            record_request_cancelled()
+            if key is not None and _flights.get(key) is flight:
+                _flights.pop(key)
+
+def _encode_cursor(position) -> str:
+    """Opaque pagination cursor for a position in a listing index."""
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, valid) -> object:
+    """Decode a cursor, answering 400 if it is malformed or valid(position) is false."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        position = None
+    if position is None or not valid(position):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+def _parse_fields(fields: Optional[str], model) -> Optional[List[str]]:
+    """Field names requested with fields=, checked against the response model."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(model.model_fields)}")
+    return names
+
+def _list_response(
+    response: Response, records: List[dict], field_names: Optional[List[str]], next_cursor: Optional[str],
+    headers: Optional[Dict[str, str]] = None
+):
+    """
+    Return one page of a listing. Projected pages are built as plain dicts and
+    returned directly, skipping response-model validation of unused fields.
+    """
+    headers = dict(headers or {})
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if field_names is None:
+        response.headers.update(headers)
+        return records
+    return JSONResponse([{name: record.get(name) for name in field_names} for record in records], headers=headers)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Restore indexes and caches from the last snapshot (unless preload already did)
+    snapshots.ensure_loaded()
+    snapshots.start_periodic_snapshots()
+    # Start job workers at boot so jobs queued before a restart resume
+    get_job_manager()
+    yield
+    job_manager.stop()
+    snapshots.stop_periodic_snapshots()
 
 app = FastAPI(
     title="AI Project & Hackathon Assistant API",
     description="Comprehensive API for project ideas, hackathon information, and academic guidance",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -30,20 +175,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Session-Token", "X-Hackathons-Version"],
 )
 
 # Pydantic Models
 class ProjectIdea(BaseModel):
+    id: Optional[str] = None
     title: str
     difficulty: str  # Beginner, Medium, Advanced
     success_percentage: float
     description: str
     tech_stack: List[str]
-    hardware: str
-    software: List[str]
-    implementation_steps: List[str]
-    estimated_time: str
-    job_relevance: str
+    detail_level: str = "full"  # summary or full
+    # Heavy fields, omitted when detail_level is "summary"
+    hardware: Optional[str] = None
+    software: Optional[List[str]] = None
+    implementation_steps: Optional[List[str]] = None
+    estimated_time: Optional[str] = None
+    job_relevance: Optional[str] = None
 
 class Hackathon(BaseModel):
     name: str
@@ -54,6 +203,16 @@ class Hackathon(BaseModel):
     prize_pool: Optional[str] = None
     description: Optional[str] = None
 
+class HackathonChanges(BaseModel):
+    version: int  # pass as since= on the next poll
+    has_more: bool  # more changes after version; poll again right away
+    # Records (with their "key") added, updated or removed since the requested version
+    added: List[dict]
+    updated: List[dict]
+    removed: List[dict]
+    # With since=0 while has_more: pass back as cursor= (with since=0) for the next page
+    cursor: Optional[str] = None
+
 class SIHProblem(BaseModel):
     year: int
     problem_statement: str
@@ -61,45 +220,70 @@ class SIHProblem(BaseModel):
     difficulty: Optional[str] = None
     tech_stack: Optional[List[str]] = None
 
+class SIHRecommendation(SIHProblem):
+    score: float
+    matched_skills: List[str] = []
+
+class SimilarProject(BaseModel):
+    id: str
+    title: str
+    difficulty: str
+    description: str
+    tech_stack: List[str]
+    similarity: float
+
 class ProjectRequest(BaseModel):
     course: str
     academic_year: Optional[int] = None  # 1, 2, 3, 4 for BTech
     difficulty_level: Optional[str] = None  # Beginner, Medium, Advanced, or All
     project_type: Optional[str] = None  # hackathon, academic, both
+    detail: Literal["summary", "full"] = "full"  # summary skips heavy fields
+    num_projects: Optional[int] = Field(None, ge=1, le=PROJECTS_MAX_PER_REQUEST)  # default 5
+
+class MoreProjectsRequest(BaseModel):
+    session: str  # X-Session-Token header from /projects
+
+class BatchProjectRequest(BaseModel):
+    requests: List[ProjectRequest]
+    max_concurrency: Optional[int] = None  # capped by BATCH_MAX_CONCURRENCY
+
+class GuidanceRequest(BaseModel):
+    project_title: str
+    course: str
+    description: str = ""
+
+class JobRequest(BaseModel):
+    kind: Literal["projects", "guidance"] = "projects"
+    projects: Optional[ProjectRequest] = None  # required when kind is "projects"
+    guidance: Optional[GuidanceRequest] = None  # required when kind is "guidance"
+    webhook_url: Optional[str] = None  # local URL notified when the job finishes
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    created: float
+    updated: float
+    result: Optional[object] = None
+    error: Optional[str] = None
 
 class HackathonRequest(BaseModel):
     name: str
     organizer: str
-    date: str
+    date: str  # stored as YYYY-MM-DD; 15/03/2026 or March 15, 2026 are converted
     location: str
     registration_link: Optional[str] = None
     prize_pool: Optional[str] = None
     description: Optional[str] = None
 
-# Load data from CSV files
-def load_hackathons():
-    try:
-        df = pd.read_csv("hackathons.csv")
-        return df.to_dict('records')
-    except:
-        return []
-
-def load_sih_problems():
-    try:
-        df = pd.read_csv("sih.csv")
-        records = df.to_dict('records')
-        # Convert tech_stack string to list if it exists
-        for record in records:
-            if 'tech_stack' in record and isinstance(record['tech_stack'], str):
-                # Parse comma-separated string to list
-                record['tech_stack'] = [t.strip() for t in record['tech_stack'].split(',') if t.strip()]
-        return records
-    except:
-        return []
-
-def save_hackathons(hackathons):
-    df = pd.DataFrame(hackathons)
-    df.to_csv("hackathons.csv", index=False)
+    @field_validator("date")
+    @classmethod
+    def iso_date(cls, value: str) -> str:
+        # Listings, facets and dedupe all rely on YYYY-MM-DD dates
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f"unrecognised date '{value}', use YYYY-MM-DD")
+        return date
 
 @app.get("/")
 async def root():
@@ -108,102 +292,437 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/projects": "Get project ideas based on course and preferences",
+            "/projects/more": "Get more project ideas for a session, without repeats",
+            "/projects/{project_id}/detail": "Get full details for a project returned in summary mode",
+            "/projects/{project_id}/similar": "Find project ideas similar to a given one",
+            "/projects/batch": "Generate project ideas for many courses at once (NDJSON stream)",
+            "/projects/jobs": "Queue project or guidance generation in the background",
             "/hackathons": "Get upcoming hackathons",
+            "/hackathons/changes": "Get hackathons added, updated or removed since a version",
             "/hackathons/add": "Add a new hackathon",
+            "/hackathons/import": "Bulk-import hackathons from a CSV or NDJSON file",
             "/sih": "Get SIH problem statements",
-            "/guidance/{project_title}": "Get implementation guidance for a project"
+            "/facets": "Get filter counts for SIH problems and hackathons",
+            "/sih/recommend": "Rank SIH problems by fit with a course and skills",
+            "/guidance/{project_title}": "Get implementation guidance for a project",
+            "/metrics": "Cache hit ratios, model tier latency and tokens, and provider health"
         }
     }
 
-@app.post("/projects", response_model=List[ProjectIdea])
-async def get_projects(request: ProjectRequest):
+@app.post("/projects", response_model=List[ProjectIdea], response_model_exclude_none=True)
+async def get_projects(request: ProjectRequest, response: Response, http_request: Request):
     """
     Get project ideas based on course, academic year, and difficulty level.
     Returns beginner, medium, and advanced level suggestions with success percentages.
+    Use detail="summary" for a lighter response and fetch /projects/{id}/detail on demand.
+    The X-Session-Token response header can be sent to /projects/more for new ideas.
+    Generation stops if the client disconnects and no identical request is waiting.
     """
+    from project_sessions import start_session
+    
+    key = ("projects", canonical_course(request.course)) + tuple(request.dict(exclude={"course"}).values())
     try:
-        projects = get_project_ideas(
+        projects = await _run_cancellable(
+            http_request, key, get_project_ideas,
             course=request.course,
             academic_year=request.academic_year,
             difficulty_level=request.difficulty_level,
-            project_type=request.project_type
+            project_type=request.project_type,
+            detail=request.detail,
+            num_projects=request.num_projects
         )
+        if projects is None:
+            return Response(status_code=499)
+        response.headers["X-Session-Token"] = start_session(request.dict(), projects)
         return projects
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/projects/more", response_model=List[ProjectIdea], response_model_exclude_none=True)
+async def get_more_projects(request: MoreProjectsRequest, response: Response, http_request: Request):
+    """
+    Get more project ideas for an earlier /projects request, skipping every idea
+    already shown in that session. Only the missing ideas are generated; unseen
+    stored ideas are served first.
+    """
+    from project_sessions import load_session, record_served
+    
+    state = load_session(request.session)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired. Request /projects again.")
+    try:
+        projects = await _run_cancellable(http_request, None, get_project_ideas, **state["params"], exclude_titles=state["titles"])
+        if projects is None:
+            return Response(status_code=499)
+        record_served(request.session, state, projects)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response.headers["X-Session-Token"] = request.session
+    return projects
+
+@app.post("/projects/batch")
+async def get_projects_batch(batch: BatchProjectRequest):
+    """
+    Generate project ideas for many course/year combinations in one call.
+    Requests that differ only in course spelling are generated once. Results are
+    streamed as NDJSON, one line per unique request, in completion order; each
+    line lists the indexes of the input requests it answers. Generation still
+    running when the client disconnects is cancelled.
+    """
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_REQUESTS} requests per batch")
+    
+    # Dedupe on the canonical form of each request
+    unique = {}
+    for index, request in enumerate(batch.requests):
+        key = (
+            canonical_course(request.course),
+            request.academic_year,
+            (request.difficulty_level or "all").lower(),
+            (request.project_type or "both").lower(),
+            request.detail,
+            request.num_projects
+        )
+        unique.setdefault(key, (request, []))[1].append(index)
+    
+    concurrency = min(batch.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    # One scope per unique request, so an abandoned stream stops the worker threads too
+    scopes = [CancelScope() for _ in unique]
+    
+    async def generate(request: ProjectRequest, indexes: List[int], scope: CancelScope) -> dict:
+        async with semaphore:
+            line = {"indexes": indexes, "request": request.dict()}
+            
+            def work():
+                with cancel_scope(scope):
+                    return get_project_ideas(
+                        course=request.course,
+                        academic_year=request.academic_year,
+                        difficulty_level=request.difficulty_level,
+                        project_type=request.project_type,
+                        detail=request.detail,
+                        num_projects=request.num_projects
+                    )
+            
+            try:
+                projects = await run_in_threadpool(work)
+                line["projects"] = [
+                    ProjectIdea(**project).dict(exclude_none=True) for project in projects
+                ]
+            except Exception as e:
+                line["error"] = str(e)
+            return line
+    
+    async def stream():
+        tasks = [
+            asyncio.create_task(generate(request, indexes, scope))
+            for (request, indexes), scope in zip(unique.values(), scopes)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished) + "\n"
+        finally:
+            unfinished = [scope for task, scope in zip(tasks, scopes) if not task.done()]
+            for task in tasks:
+                task.cancel()
+            for scope in unfinished:
+                scope.cancel()
+            if unfinished:
+                record_request_cancelled()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/projects/jobs", status_code=202)
+def create_project_job(job: JobRequest):
+    """
+    Queue project or guidance generation in the background and return a job id at once.
+    Poll /projects/jobs/{job_id} for the result, or pass a local webhook_url to be notified.
+    """
+    payload = job.projects if job.kind == "projects" else job.guidance
+    if payload is None:
+        raise HTTPException(status_code=422, detail=f"'{job.kind}' request body is required for kind '{job.kind}'")
+    try:
+        job_id = get_job_manager().submit(job.kind, payload.dict(), job.webhook_url)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id, "status": "queued", "status_url": f"/projects/jobs/{job_id}"}
+
+@app.get("/projects/jobs/{job_id}", response_model=JobStatus)
+def get_project_job(job_id: str):
+    """Get the status of a background job, and its result once it has finished."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.get("/projects/{project_id}/detail", response_model=ProjectIdea)
+def get_project_details(project_id: str, course: str = Query(..., description="Student's course")):
+    """
+    Get the full version of a project returned by /projects.
+    Heavy fields are generated on the first request and cached.
+    """
+    try:
+        project = get_project_detail(project_id, course)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found or expired. Request /projects again.")
+    return project
+
+@app.get("/projects/{project_id}/similar", response_model=List[SimilarProject])
+def get_similar_projects(project_id: str, k: int = Query(5, ge=1, le=50, description="Number of similar projects")):
+    """
+    Find project ideas similar to a given one, from the project bank and all
+    stored generated projects, using an approximate nearest-neighbour index.
+    """
+    from ai_brain import registered_project
+    from similar_index import get_similar_index
+    
+    index = get_similar_index()
+    similar = index.similar(project_id, k)
+    if similar is None:
+        # Served by another worker and not stored in the corpus: index it now if we know it
+        project = registered_project(project_id)
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found or expired. Request /projects again.")
+        index.add(project)
+        similar = index.similar(project_id, k)
+    return similar
+
 @app.get("/guidance/{project_title}")
-async def get_guidance(project_title: str, course: str = Query(..., description="Student's course")):
+async def get_guidance(http_request: Request, project_title: str, course: str = Query(..., description="Student's course")):
     """
     Get detailed implementation guidance for a specific project.
     Includes both hardware and software implementation steps.
     """
+    key = ("guidance", " ".join(project_title.split()).casefold(), canonical_course(course))
     try:
-        guidance = get_implementation_guidance(project_title, course)
+        guidance = await _run_cancellable(http_request, key, get_implementation_guidance, project_title, course)
+        if guidance is None:
+            return Response(status_code=499)
         return guidance
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/hackathons", response_model=List[Hackathon])
-async def get_hackathons(
-    months_ahead: int = Query(3, description="Number of months ahead to show hackathons")
+def get_hackathons(
+    response: Response,
+    months_ahead: int = Query(3, description="Number of months ahead to show hackathons"),
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT, description="Page size (default: all matches)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,date,location")
 ):
     """
-    Get upcoming hackathons for the next N months.
-    Default is 3 months.
+    Get upcoming hackathons for the next N months, ordered by date.
+    Default is 3 months. With a limit, the response carries an X-Next-Cursor
+    header while more pages remain. X-Hackathons-Version is the current
+    version of /hackathons/changes.
     """
+    field_names = _parse_fields(fields, Hackathon)
+    headers = {}
+    change_log = get_change_log()
+    if change_log is not None:
+        try:
+            headers["X-Hackathons-Version"] = str(change_log.sync())
+        except Exception:
+            pass  # the listing does not depend on the change feed
     try:
-        hackathons = load_hackathons()
-        # Filter by date (next N months)
+        index = get_hackathon_index()
+        # Dates sort lexically, so the window is a contiguous slice of the index
         today = datetime.now()
-        future_date = today + timedelta(days=months_ahead * 30)
-        
-        filtered = []
-        for hack in hackathons:
-            try:
-                hack_date = datetime.strptime(hack.get('date', ''), '%Y-%m-%d')
-                if today <= hack_date <= future_date:
-                    filtered.append(hack)
-            except:
-                continue
-        
-        return filtered
+        start, end = index.date_range(today.strftime("%Y-%m-%d"), (today + timedelta(days=months_ahead * 30)).strftime("%Y-%m-%d"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if cursor:
+        position = _decode_cursor(cursor, lambda p: isinstance(p, list) and len(p) == 2 and all(isinstance(v, str) for v in p))
+        start = index.seek(tuple(position), start, end)
+    stop = end if limit is None else min(end, start + limit)
+    next_cursor = _encode_cursor(index.positions[stop - 1]) if stop < end else None
+    return _list_response(response, index.records[start:stop], field_names, next_cursor, headers)
+
+@app.get("/hackathons/changes", response_model=HackathonChanges)
+def get_hackathon_changes(
+    response: Response,
+    since: int = Query(..., ge=0, description="Version from the previous poll (0 = all current hackathons)"),
+    limit: int = Query(LIST_MAX_LIMIT, ge=1, le=LIST_MAX_LIMIT, description="Most changes to return"),
+    cursor: Optional[str] = Query(None, description="With since=0: cursor from the previous page")
+):
+    """
+    Hackathons added, updated or removed since a version, so polling clients
+    fetch deltas instead of the full list. since=0 pages through every current
+    hackathon: while has_more, pass the returned cursor back with since=0, then
+    poll changes from the returned version. Answers 410 (resync required) when
+    the version is older than the change log keeps; poll from since=0 then.
+    """
+    change_log = get_change_log()
+    if change_log is None:
+        raise HTTPException(status_code=503, detail="Hackathon change feed is disabled")
+    if cursor and since != 0:
+        raise HTTPException(status_code=400, detail="cursor is only used with since=0")
+    if cursor:
+        # [version of the first page, key of the last record sent]
+        position = _decode_cursor(cursor, lambda p: isinstance(p, list) and len(p) == 2 and isinstance(p[0], int) and isinstance(p[1], str))
+    try:
+        changes = change_log.snapshot(limit, position[1], position[0]) if cursor else change_log.changes(since, limit)
+    except ResyncRequired as e:
+        raise HTTPException(status_code=410, detail=str(e), headers={"X-Hackathons-Version": str(e.version)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    after = changes.pop("after", None)
+    if after is not None:
+        changes["cursor"] = _encode_cursor([changes["version"], after])
+    response.headers["X-Hackathons-Version"] = str(changes["version"])
+    return changes
 
 @app.post("/hackathons/add")
-async def add_hackathon(hackathon: HackathonRequest):
+def add_hackathon(hackathon: HackathonRequest):
     """
     Add a new hackathon. Universities and companies can use this to update hackathon information.
+    Hackathons with the same name, organizer and date as an existing one are rejected.
     """
     try:
-        hackathons = load_hackathons()
         new_hackathon = hackathon.dict()
-        hackathons.append(new_hackathon)
-        save_hackathons(hackathons)
-        return {"message": "Hackathon added successfully", "hackathon": new_hackathon}
+        added = append_hackathon(new_hackathon)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if not added:
+        raise HTTPException(status_code=409, detail="A hackathon with this name, organizer and date already exists")
+    return {"message": "Hackathon added successfully", "hackathon": new_hackathon}
+
+def _iter_upload_rows(upload: UploadFile, fmt: str):
+    """Stream-parse an uploaded CSV or NDJSON file one row at a time."""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            yield {key: (value if value != "" else None) for key, value in row.items() if key is not None}
+    else:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+
+def _validate_hackathon_row(row) -> dict:
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("Row is not a JSON object")
+    try:
+        return HackathonRequest(**row).dict()
+    except ValidationError as e:
+        # Report "field: message" pairs rather than pydantic's multi-line text
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+@app.post("/hackathons/import")
+def import_hackathons(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one hackathon per line)"),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="File format; detected from the file name if omitted")
+):
+    """
+    Bulk-import hackathons from an event calendar file.
+    Rows are validated and deduplicated (by name, organizer and date) while the
+    upload is streamed, then all new rows are saved in a single write.
+    """
+    fmt = format
+    if fmt is None:
+        name = (file.filename or "").lower()
+        is_json = name.endswith((".ndjson", ".jsonl", ".json")) or "json" in (file.content_type or "")
+        fmt = "ndjson" if is_json else "csv"
+    try:
+        counts = import_hackathon_rows(_iter_upload_rows(file, fmt), _validate_hackathon_row)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse {fmt} upload: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return counts
 
 @app.get("/sih", response_model=List[SIHProblem])
-async def get_sih_problems(
+def get_sih_problems(
+    response: Response,
     domain: Optional[str] = Query(None, description="Filter by domain (AI, IoT, Web, etc.)"),
-    year: Optional[int] = Query(None, description="Filter by year")
+    year: Optional[int] = Query(None, description="Filter by year"),
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT, description="Page size (default: all matches)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. year,problem_statement")
 ):
     """
-    Get Smart India Hackathon problem statements.
-    Students can discover SIH problems and get inspired.
+    Get Smart India Hackathon problem statements, in file order.
+    Students can discover SIH problems and get inspired. With a limit, the
+    response carries an X-Next-Cursor header while more pages remain.
     """
+    import numpy as np
+    from sih_recommender import get_sih_index
+    
+    field_names = _parse_fields(fields, SIHProblem)
     try:
-        problems = load_sih_problems()
-        
+        index = get_sih_index()
+        mask = np.ones(len(index.problems), dtype=bool)
         if domain:
-            problems = [p for p in problems if p.get('domain', '').lower() == domain.lower()]
-        
+            mask &= index.domains == domain.lower()
         if year:
-            problems = [p for p in problems if p.get('year') == year]
-        
-        return problems
+            mask &= index.years == year
+        matches = np.flatnonzero(mask)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    start = 0
+    if cursor:
+        start = int(np.searchsorted(matches, _decode_cursor(cursor, lambda p: isinstance(p, int)), side="right"))
+    stop = len(matches) if limit is None else min(len(matches), start + limit)
+    next_cursor = _encode_cursor(int(matches[stop - 1])) if stop < len(matches) else None
+    return _list_response(response, [index.problems[i] for i in matches[start:stop]], field_names, next_cursor)
+
+@app.get("/facets")
+def get_facets(
+    dataset: Optional[Literal["sih", "hackathons"]] = Query(None, description="Only this dataset (default: both)"),
+    domain: Optional[str] = Query(None, description="SIH domain filter"),
+    year: Optional[int] = Query(None, description="SIH year filter"),
+    difficulty: Optional[str] = Query(None, description="SIH difficulty filter"),
+    tech: Optional[str] = Query(None, description="SIH tech stack filter"),
+    month: Optional[str] = Query(None, description="Hackathon month filter (YYYY-MM)"),
+    location: Optional[str] = Query(None, description="Hackathon location filter")
+):
+    """
+    Facet counts for filter dropdowns: SIH problems by domain, year, difficulty
+    and tech, hackathons by month and location. Each facet is counted with the
+    other filters applied, alongside the total and matching record counts.
+    """
+    from facets import get_hackathon_facets, get_sih_facets
+    
+    result = {}
+    try:
+        if dataset in (None, "sih"):
+            result["sih"] = get_sih_facets().facet_counts({
+                "domain": domain, "year": str(year) if year else None, "difficulty": difficulty, "tech": tech
+            })
+        if dataset in (None, "hackathons"):
+            result["hackathons"] = get_hackathon_facets().facet_counts({"month": month, "location": location})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return result
+
+@app.get("/sih/recommend", response_model=List[SIHRecommendation])
+def recommend_sih(
+    course: str = Query(..., description="Student's course"),
+    skills: Optional[str] = Query(None, description="Comma-separated skills, e.g. Python, React, IoT"),
+    top_k: int = Query(5, ge=1, le=50, description="Number of problems to return"),
+    domain: Optional[str] = Query(None, description="Only recommend problems in this domain"),
+    year: Optional[int] = Query(None, description="Only recommend problems from this year")
+):
+    """
+    Recommend SIH problem statements for a student.
+    Problems are ranked by TF-IDF cosine similarity between the student's course
+    and skills and each problem's statement and tech stack.
+    """
+    from sih_recommender import recommend_sih_problems
+    
+    skill_list = [s.strip() for s in (skills or "").split(",") if s.strip()]
+    try:
+        return recommend_sih_problems(course, skill_list, top_k, domain, year)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -233,6 +752,7 @@ async def predict_project_success(
 
 @app.get("/academic-projects")
 async def get_academic_projects(
+    http_request: Request,
     course: str = Query(..., description="Student's course"),
     academic_year: int = Query(..., description="Academic year (1-4 for BTech)"),
     focus: str = Query("job_preparation", description="Focus: job_preparation, portfolio, or both")
@@ -242,16 +762,19 @@ async def get_academic_projects(
     Projects are tailored to help students build skills relevant to their course and career.
     """
     try:
-        projects = get_project_ideas(
+        projects = await _run_cancellable(
+            http_request, ("academic-projects", canonical_course(course), academic_year), get_project_ideas,
             course=course,
             academic_year=academic_year,
             difficulty_level="All",
             project_type="academic"
         )
+        if projects is None:
+            return Response(status_code=499)
         
-        # Filter and enhance with job relevance
+        # Filter and enhance with job relevance (copies: coalesced requests share the list)
         academic_projects = []
-        for project in projects:
+        for project in map(dict, projects):
             if focus == "job_preparation" or focus == "both":
                 project['job_relevance'] = f"Builds skills in {', '.join(project['tech_stack'][:3])} - highly valued in industry"
             academic_projects.append(project)
@@ -266,6 +789,31 @@ async def get_academic_projects(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    Operational metrics: shared LLM cache hit ratio per prompt kind, project
+    corpus size, job counts by status, requests cancelled by client disconnects
+    (with the estimated output tokens that saved), latency and tokens per
+    model tier and, when AI_PROVIDER=pool, provider health scores.
+    """
+    import ai_generator
+    import cancellation
+    import model_profiles
+    from project_corpus import get_project_corpus
+    from shared_cache import get_shared_cache
+    
+    cache = get_shared_cache()
+    corpus = get_project_corpus()
+    return {
+        "shared_cache": cache.stats() if cache else None,
+        "project_corpus": corpus.stats() if corpus else None,
+        "jobs": get_job_manager().stats(),
+        "cancellation": cancellation.stats(),
+        "models": model_profiles.stats(),
+        "providers": ai_generator.get_provider_pool().stats() if ai_generator.AI_PROVIDER == "pool" else None
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
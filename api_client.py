@@ -0,0 +1,124 @@
+"""
+HTTP client for the FastAPI service, used by app.py in thin-client mode
+(BACKEND_MODE=api). Mirrors the in-process functions so the app can switch
+backends without other changes. All calls share one pooled keep-alive session.
+"""
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000").rstrip("/")
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "60"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "32"))
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the shared requests session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                # Retry idempotent GETs on connection errors and 502/503/504
+                retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+def _request(method: str, path: str, **kwargs):
+    response = get_session().request(method, f"{API_BASE_URL}{path}", timeout=API_TIMEOUT, **kwargs)
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise Exception(f"API error {response.status_code} on {path}: {detail}")
+    return response.json()
+
+def get_project_ideas(
+    course: str,
+    academic_year: Optional[int] = None,
+    difficulty_level: Optional[str] = None,
+    project_type: Optional[str] = None,
+    detail: str = "full"
+) -> List[dict]:
+    return _request("POST", "/projects", json={
+        "course": course,
+        "academic_year": academic_year,
+        "difficulty_level": difficulty_level,
+        "project_type": project_type,
+        "detail": detail
+    })
+
+def get_project_detail(project_id: str, course: str) -> dict:
+    return _request("GET", f"/projects/{quote(project_id, safe='')}/detail", params={"course": course})
+
+def get_implementation_guidance(project_title: str, course: str, description: str = "") -> dict:
+    return _request("GET", f"/guidance/{quote(project_title, safe='')}", params={"course": course})
+
+# Local copy of all hackathons by key, kept current from /hackathons/changes
+_hackathons = {}
+_hackathons_version = 0
+_hackathons_lock = threading.Lock()
+
+def sync_hackathons() -> Dict[str, Dict]:
+    """Apply hackathon changes since the last sync (everything on the first call)."""
+    global _hackathons_version
+    with _hackathons_lock:
+        while True:
+            response = get_session().get(
+                f"{API_BASE_URL}/hackathons/changes", params={"since": _hackathons_version}, timeout=API_TIMEOUT
+            )
+            if response.status_code == 410 and _hackathons_version:
+                # Too far behind the change log: start over from a full copy
+                _hackathons.clear()
+                _hackathons_version = 0
+                continue
+            if response.status_code >= 400:
+                raise Exception(f"API error {response.status_code} on /hackathons/changes: {response.text}")
+            changes = response.json()
+            for record in changes["added"] + changes["updated"]:
+                _hackathons[record["key"]] = record
+            for record in changes["removed"]:
+                _hackathons.pop(record["key"], None)
+            _hackathons_version = changes["version"]
+            if not changes["has_more"]:
+                return dict(_hackathons)
+
+def get_hackathons(months_ahead: int = 3) -> List[Dict]:
+    """Upcoming hackathons from the synced local copy, filtered like /hackathons."""
+    today = datetime.now()
+    after, until = today.strftime("%Y-%m-%d"), (today + timedelta(days=months_ahead * 30)).strftime("%Y-%m-%d")
+    upcoming = [
+        record for record in sync_hackathons().values()
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", record.get("date") or "") and after < record["date"] <= until
+    ]
+    return sorted(upcoming, key=lambda record: (record["date"], record["key"]))
+
+def get_sih_problems(domain: Optional[str] = None, year: Optional[int] = None) -> List[Dict]:
+    params = {}
+    if domain:
+        params["domain"] = domain
+    if year:
+        params["year"] = year
+    return _request("GET", "/sih", params=params)
+
+def predict_success(course: str, project_name: str, difficulty: str, hardware_required: str) -> float:
+    result = _request("GET", "/predict-success", params={
+        "course": course,
+        "project_title": project_name,
+        "difficulty": difficulty,
+        "hardware_required": hardware_required
+    })
+    return result["success_percentage"]
@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import json
 import os
 
 # Load environment variables
@@ -10,8 +9,14 @@ try:
 except ImportError:
     pass  # dotenv not installed, use system env vars
 
-from ai_brain import get_project_ideas, get_implementation_guidance
-from predictor import predict_success
+# "local" calls the generators in-process; "api" goes through the shared FastAPI service
+BACKEND_MODE = os.getenv("BACKEND_MODE", "local").lower()
+
+if BACKEND_MODE == "api":
+    from api_client import get_project_ideas, get_implementation_guidance, predict_success, get_hackathons, get_sih_problems
+else:
+    from ai_brain import get_project_ideas, get_implementation_guidance
+    from predictor import predict_success
 
 st.set_page_config(
     page_title="AI Project & Hackathon Assistant",
@@ -30,72 +35,113 @@ with st.sidebar:
     difficulty_level = st.selectbox("Difficulty Level", ["All", "Beginner", "Medium", "Advanced"])
     project_type = st.selectbox("Project Type", ["both", "hackathon", "academic"])
 
+# Cached across sessions: identical inputs from different students share one result
+@st.cache_data(ttl=3600, show_spinner="Generating project ideas...")
+def cached_project_ideas(course, academic_year, difficulty_level, project_type):
+    return get_project_ideas(
+        course=course,
+        academic_year=academic_year,
+        difficulty_level=difficulty_level,
+        project_type=project_type
+    )
+
+@st.cache_data(ttl=24 * 3600, show_spinner="Generating implementation guide...")
+def cached_guidance(project_title, course):
+    return get_implementation_guidance(project_title, course)
+
+# The file modification time is part of the key, so edits to the CSV show up immediately
+@st.cache_data(ttl=600)
+def load_csv(path, mtime):
+    return pd.read_csv(path)
+
+@st.cache_data(ttl=60)
+def load_from_api(path):
+    if path == "hackathons.csv":
+        return pd.DataFrame(get_hackathons(months_ahead=3))
+    return pd.DataFrame(get_sih_problems())
+
+def load_data(path):
+    if BACKEND_MODE == "api":
+        return load_from_api(path)
+    return load_csv(path, os.path.getmtime(path))
+
 # Main content
 if st.button("Get Project Ideas", type="primary"):
     try:
-        projects = get_project_ideas(
-            course=course,
-            academic_year=academic_year,
-            difficulty_level=difficulty_level if difficulty_level != "All" else None,
-            project_type=project_type
+        st.session_state["projects"] = cached_project_ideas(
+            " ".join(course.split()),
+            academic_year,
+            difficulty_level if difficulty_level != "All" else None,
+            project_type
         )
-
-        if projects:
-            st.success(f"🎉 Found {len(projects)} project ideas!")
-            
-            for idx, project in enumerate(projects, 1):
-                with st.expander(f"📌 {project['title']} - {project['difficulty']} ({project['success_percentage']}% Success Rate)", expanded=(idx == 1)):
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Success Rate", f"{project['success_percentage']}%")
-                    with col2:
-                        st.metric("Difficulty", project['difficulty'])
-                    with col3:
-                        st.metric("Time Estimate", project.get('estimated_time', 'N/A'))
-                    
-                    st.markdown("---")
-                    st.write(f"**Description:** {project['description']}")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write("**Tech Stack:**")
-                        st.write(", ".join(project['tech_stack']))
-                        st.write("**Software Required:**")
-                        st.write(", ".join(project.get('software', ['N/A'])))
-                    with col2:
-                        st.write("**Hardware Required:**")
-                        st.write(project.get('hardware', 'None'))
-                        st.write("**Job Relevance:**")
-                        st.write(project.get('job_relevance', 'N/A'))
-                    
-                    if st.button(f"Get Implementation Guide", key=f"guide_{idx}"):
-                        guidance = get_implementation_guidance(project['title'], course)
-                        st.session_state[f'guidance_{idx}'] = guidance
-                    
-                    if f'guidance_{idx}' in st.session_state:
-                        guidance = st.session_state[f'guidance_{idx}']
-                        st.markdown("### 📋 Implementation Steps:")
-                        for step_num, step in enumerate(guidance.get('implementation_steps', []), 1):
-                            st.write(f"{step_num}. {step}")
-                        
-                        if 'guidance' in guidance:
-                            st.markdown("### 💡 Best Practices:")
-                            for practice in guidance['guidance'].get('best_practices', []):
-                                st.write(f"• {practice}")
-        else:
-            st.warning("No projects found. Try adjusting your filters.")
-
+        st.session_state["projects_course"] = course
+        st.session_state["guidance"] = {}
     except Exception as e:
+        st.session_state.pop("projects", None)
         st.error("Something went wrong")
         st.code(str(e))
         st.exception(e)
 
+# Render from session state so other widgets (e.g. guidance buttons) don't drop the list
+if "projects" in st.session_state:
+    projects = st.session_state["projects"]
+    projects_course = st.session_state["projects_course"]
+    guidance_by_title = st.session_state.setdefault("guidance", {})
+
+    if projects:
+        st.success(f"🎉 Found {len(projects)} project ideas!")
+        
+        for idx, project in enumerate(projects, 1):
+            with st.expander(f"📌 {project['title']} - {project['difficulty']} ({project['success_percentage']}% Success Rate)", expanded=(idx == 1)):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Success Rate", f"{project['success_percentage']}%")
+                with col2:
+                    st.metric("Difficulty", project['difficulty'])
+                with col3:
+                    st.metric("Time Estimate", project.get('estimated_time', 'N/A'))
+                
+                st.markdown("---")
+                st.write(f"**Description:** {project['description']}")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write("**Tech Stack:**")
+                    st.write(", ".join(project['tech_stack']))
+                    st.write("**Software Required:**")
+                    st.write(", ".join(project.get('software', ['N/A'])))
+                with col2:
+                    st.write("**Hardware Required:**")
+                    st.write(project.get('hardware', 'None'))
+                    st.write("**Job Relevance:**")
+                    st.write(project.get('job_relevance', 'N/A'))
+                
+                if st.button(f"Get Implementation Guide", key=f"guide_{idx}"):
+                    try:
+                        guidance_by_title[project['title']] = cached_guidance(project['title'], projects_course)
+                    except Exception as e:
+                        st.error(f"Could not load guidance: {str(e)}")
+                
+                if project['title'] in guidance_by_title:
+                    guidance = guidance_by_title[project['title']]
+                    st.markdown("### 📋 Implementation Steps:")
+                    for step_num, step in enumerate(guidance.get('implementation_steps', []), 1):
+                        st.write(f"{step_num}. {step}")
+                    
+                    best_practices = guidance.get('best_practices') or guidance.get('guidance', {}).get('best_practices', [])
+                    if best_practices:
+                        st.markdown("### 💡 Best Practices:")
+                        for practice in best_practices:
+                            st.write(f"• {practice}")
+    else:
+        st.warning("No projects found. Try adjusting your filters.")
+
 # ---------- HACKATHONS SECTION ----------
 st.markdown("---")
 st.header("🏆 Upcoming Hackathons")
 
 try:
-    hackathons_df = pd.read_csv("hackathons.csv")
+    hackathons_df = load_data("hackathons.csv").copy()
     if not hackathons_df.empty:
         # Filter by date (next 3 months)
         from datetime import datetime, timedelta
@@ -122,7 +168,7 @@ st.markdown("---")
 st.header("🏆 Smart India Hackathon Problems")
 
 try:
-    sih_df = pd.read_csv("sih.csv")
+    sih_df = load_data("sih.csv")
     if not sih_df.empty:
         # Add filters for SIH
         col1, col2 = st.columns(2)
@@ -0,0 +1,197 @@
+"""
+Token report for the AI prompts.
+Compares the legacy inline prompts with the current system/user layout.
+Uses tiktoken when installed, otherwise estimates 4 characters per token.
+
+Usage: python bench_prompts.py
+"""
+import json
+
+from prompts import (
+    GUIDANCE_TOKENS, SCORE_TOKENS, system_prompt_for, projects_token_budget,
+    build_projects_prompt, build_guidance_prompt, build_score_prompt
+)
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+    TOKENIZER = "tiktoken cl100k_base"
+except Exception:
+    # Not installed, or the encoding file cannot be downloaded
+    _encoding = None
+    TOKENIZER = "estimate (4 chars/token)"
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
+
+LEGACY_SYSTEM_PROMPT = "You are an expert project advisor for students. Generate detailed, practical project ideas with complete information."
+LEGACY_MAX_TOKENS = 2000
+
+# Prompts as sent before the system/user split (kept for comparison only)
+def legacy_projects_prompt(course, academic_year, difficulty_level, project_type, num_projects):
+    difficulty_text = difficulty_level if difficulty_level and difficulty_level != "All" else "Beginner, Medium, and Advanced"
+    year_text = f"for {academic_year} year students" if academic_year else "for all academic years"
+    type_text = f"for {project_type}" if project_type else "for both hackathon and academic projects"
+    return f"""Generate {num_projects} unique and innovative project ideas for a student pursuing {course} {year_text}.
+
+Requirements:
+- Difficulty levels: {difficulty_text}
+- Project type: {type_text}
+- Each project should be practical and implementable
+- Include projects suitable for hackathons and academic submissions
+
+For each project, provide:
+1. title: A catchy project title
+2. difficulty: One of "Beginner", "Medium", or "Advanced"
+3. description: A detailed 2-3 sentence description
+4. tech_stack: List of 5-7 relevant technologies/tools
+5. hardware: Hardware requirements (or "None" if software-only)
+6. software: List of 3-5 software tools/IDEs needed
+7. implementation_steps: List of 6-8 step-by-step implementation steps
+8. estimated_time: Time estimate (e.g., "3-4 weeks", "2 months")
+9. job_relevance: How this project helps in job preparation (1-2 sentences)
+
+Return ONLY a valid JSON array. Each project should be a JSON object with these exact keys:
+title, difficulty, description, tech_stack (array), hardware, software (array), implementation_steps (array), estimated_time, job_relevance
+
+Example format:
+[
+  {{
+    "title": "AI-Powered Study Planner",
+    "difficulty": "Beginner",
+    "description": "An intelligent study planner that uses machine learning to optimize study schedules based on learning patterns and deadlines.",
+    "tech_stack": ["Python", "Flask", "SQLite", "Scikit-learn", "React"],
+    "hardware": "None",
+    "software": ["Python 3.8+", "VS Code", "Node.js"],
+    "implementation_steps": [
+      "Set up development environment",
+      "Design database schema for users and tasks",
+      "Implement ML model for schedule optimization",
+      "Create REST API endpoints",
+      "Build frontend interface",
+      "Add user authentication",
+      "Test and deploy"
+    ],
+    "estimated_time": "3-4 weeks",
+    "job_relevance": "High - Demonstrates full-stack development and ML integration skills"
+  }}
+]
+
+Generate {num_projects} unique projects now:"""
+
+def legacy_guidance_prompt(project_title, course, description=""):
+    return f"""Generate comprehensive implementation guidance for a project: "{project_title}"
+
+Student's course: {course}
+Project description: {description if description else "Not provided"}
+
+Provide detailed guidance including:
+
+1. hardware_setup: Detailed steps for hardware setup (if hardware is needed, otherwise explain it's software-only)
+2. software_setup: Step-by-step software installation and environment setup
+3. implementation_steps: Detailed 8-10 step implementation guide
+4. best_practices: List of 5-7 best practices for this project
+5. common_challenges: List of 5-7 common challenges students might face
+6. resources: List of 3-5 helpful resources (tutorials, documentation, etc.)
+7. testing_strategy: How to test the project
+8. deployment_guide: How to deploy the project
+
+Return ONLY a valid JSON object with these exact keys:
+hardware_setup, software_setup, implementation_steps (array), best_practices (array), common_challenges (array), resources (array), testing_strategy, deployment_guide
+
+Example format:
+{{
+  "hardware_setup": "This is a software-only project. No hardware setup required...",
+  "software_setup": "1. Install Python 3.8+...",
+  "implementation_steps": ["Step 1", "Step 2", ...],
+  "best_practices": ["Practice 1", "Practice 2", ...],
+  "common_challenges": ["Challenge 1", "Challenge 2", ...],
+  "resources": ["Resource 1", "Resource 2", ...],
+  "testing_strategy": "Testing approach...",
+  "deployment_guide": "Deployment steps..."
+}}
+
+Generate the guidance now:"""
+
+def legacy_score_prompt(course, project_title, difficulty, description, tech_stack):
+    return f"""Analyze this project idea and calculate its success percentage (0-100):
+
+Course: {course}
+Project Title: {project_title}
+Difficulty: {difficulty}
+Description: {description}
+Tech Stack: {', '.join(tech_stack)}
+
+Consider factors:
+- Difficulty level appropriateness for the course
+- Project feasibility
+- Tech stack relevance and learning curve
+- Market demand and job relevance
+- Implementation complexity
+- Hackathon/portfolio appeal
+
+Return ONLY a JSON object with this format:
+{{
+  "success_percentage": 75.5,
+  "reasoning": "Brief explanation of the score"
+}}
+
+Calculate now:"""
+
+def main():
+    from local_generator import generate_project_ideas, generate_implementation_guidance, calculate_success_percentage
+
+    course = "BTech CSE"
+    title = "Smart Water Monitoring"
+    description = "Monitor water quality and usage in real time with sensors and a dashboard."
+    tech_stack = ["Python", "Arduino", "MQTT", "React", "Firebase"]
+
+    rows = []
+    for num_projects in (1, 5, 10):
+        sample = generate_project_ideas(course, 3, None, "both", num_projects)
+        rows.append((
+            f"projects n={num_projects}",
+            count_tokens(LEGACY_SYSTEM_PROMPT) + count_tokens(legacy_projects_prompt(course, 3, None, "both", num_projects)),
+            count_tokens(system_prompt_for("projects")) + count_tokens(build_projects_prompt(course, 3, None, "both", num_projects)),
+            count_tokens(system_prompt_for("projects")),
+            LEGACY_MAX_TOKENS,
+            projects_token_budget(num_projects),
+            count_tokens(json.dumps(sample, indent=2)),
+            count_tokens(json.dumps({"projects": sample}))
+        ))
+
+    guidance = generate_implementation_guidance(title, course, description)
+    rows.append((
+        "guidance",
+        count_tokens(LEGACY_SYSTEM_PROMPT) + count_tokens(legacy_guidance_prompt(title, course, description)),
+        count_tokens(system_prompt_for("guidance")) + count_tokens(build_guidance_prompt(title, course, description)),
+        count_tokens(system_prompt_for("guidance")),
+        LEGACY_MAX_TOKENS,
+        GUIDANCE_TOKENS,
+        count_tokens(json.dumps(guidance, indent=2)),
+        count_tokens(json.dumps(guidance))
+    ))
+
+    score = calculate_success_percentage(course, title, "Medium", description, tech_stack)
+    rows.append((
+        "score",
+        count_tokens(LEGACY_SYSTEM_PROMPT) + count_tokens(legacy_score_prompt(course, title, "Medium", description, tech_stack)),
+        count_tokens(system_prompt_for("score")) + count_tokens(build_score_prompt(course, title, "Medium", description, tech_stack)),
+        count_tokens(system_prompt_for("score")),
+        LEGACY_MAX_TOKENS,
+        SCORE_TOKENS,
+        count_tokens(json.dumps(score, indent=2)),
+        count_tokens(json.dumps(score))
+    ))
+
+    print(f"Tokenizer: {TOKENIZER}")
+    header = ("request", "in before", "in after", "static prefix", "max_out before", "max_out after", "out before", "out after")
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for row in rows:
+        print("| " + " | ".join(str(v) for v in row) + " |")
+
+if __name__ == "__main__":
+    main()
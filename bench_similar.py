@@ -0,0 +1,87 @@
+"""
+Benchmark for the similar-projects index (similar_index.py).
+Builds an index of synthetic projects drawn from topic clusters, then reports
+bulk and single insert cost, top-k query latency and quality against an
+exhaustive search over the same sketches (recall@k and the ratio of mean
+similarity returned to the best achievable).
+
+Usage: python bench_similar.py [--size 120000] [--queries 2000] [--k 10]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from similar_index import SimilarIndex
+
+def synthetic_projects(size: int, seed: int = 0):
+    """Projects whose titles, descriptions and stacks mix topic words with Zipf-distributed noise."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(3000)]
+    techs = [f"tech{i}" for i in range(300)]
+    word_weights = [1 / (i + 1) ** 0.9 for i in range(len(vocabulary))]
+    tech_weights = [1 / (i + 1) ** 0.8 for i in range(len(techs))]
+    topics = [
+        (rng.choices(vocabulary, word_weights, k=6), rng.choices(techs, tech_weights, k=5))
+        for _ in range(max(1, size // 40))
+    ]
+    for i in range(size):
+        words, stack = rng.choice(topics)
+        yield {
+            "id": f"p{i}",
+            "title": " ".join(rng.sample(words, 3) + rng.choices(vocabulary, word_weights, k=2)),
+            "description": " ".join(rng.sample(words, 4) + rng.choices(vocabulary, word_weights, k=12)),
+            "tech_stack": rng.sample(stack, 3) + rng.choices(techs, tech_weights, k=1),
+            "difficulty": "Medium"
+        }
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=120000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    projects = list(synthetic_projects(args.size))
+    index = SimilarIndex()
+    start = time.perf_counter()
+    for i in range(0, len(projects), 1000):
+        index.add_many(projects[i:i + 1000])
+    print(f"bulk insert: {len(index)} projects in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for i in range(200):
+        start = time.perf_counter()
+        index.add(dict(projects[i], id=f"extra{i}"))
+        timings.append(time.perf_counter() - start)
+    print(f"single insert: p50 {percentile(timings, 50) * 1e6:.0f}us  p99 {percentile(timings, 99) * 1e6:.0f}us")
+
+    rng = random.Random(1)
+    query_ids = [f"p{i}" for i in rng.sample(range(args.size), min(args.queries, args.size))]
+    index.similar(query_ids[0], args.k)  # warm-up
+    timings = []
+    for project_id in query_ids:
+        start = time.perf_counter()
+        index.similar(project_id, args.k)
+        timings.append(time.perf_counter() - start)
+    print(f"top-{args.k} query: p50 {percentile(timings, 50) * 1e6:.0f}us  p99 {percentile(timings, 99) * 1e6:.0f}us")
+
+    recalls, ratios = [], []
+    sketches = index.sketches[:len(index)]
+    for project_id in query_ids[:200]:
+        position = index.positions[project_id]
+        exact = sketches @ sketches[position]
+        exact[position] = -np.inf
+        best = np.sort(exact)[::-1][:args.k]
+        found = np.array([p["similarity"] for p in index.similar(project_id, args.k)])
+        recalls.append(float(np.mean(found >= best[-1] - 1e-3)))
+        ratios.append(float(found.mean() / best.mean()))
+    print(f"recall@{args.k}: {np.mean(recalls):.3f}  similarity ratio: {np.mean(ratios):.3f}")
+
+if __name__ == "__main__":
+    main()
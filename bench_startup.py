@@ -0,0 +1,98 @@
+"""
+Import-time benchmark for the API process (cold start cost of api:app).
+Runs `python -X importtime -c "import api"` in fresh interpreters, reports the
+median total and the heaviest modules, and appends the result to a history
+file so start-up cost can be tracked over time.
+
+Usage: python bench_startup.py [--runs 5] [--top 15] [--history startup_history.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules the API must not import at start-up
+LAZY_MODULES = ["pandas", "numpy", "openai", "requests", "streamlit"]
+
+def measure_once(module: str) -> dict:
+    """Import the module in a fresh interpreter and parse the -X importtime log."""
+    check = f"import sys, json; import {module}; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.split(":", 1)[1].split("|")]
+        # Nested imports repeat top-level names only once, so the first entry wins
+        modules.setdefault(name, (int(self_us), int(cumulative_us)))
+
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": modules.get(module, (0, 0))[1] / 1000,
+        "modules": modules,
+        "lazy_imported": json.loads(proc.stdout.strip().splitlines()[-1])
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="api")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--history", default="startup_history.jsonl", help="JSONL file to append results to ('' to skip)")
+    args = parser.parse_args()
+
+    # First run warms the .pyc cache and is discarded
+    measure_once(args.module)
+    runs = [measure_once(args.module) for _ in range(args.runs)]
+
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    wall_ms = statistics.median(run["wall_ms"] for run in runs)
+    last = runs[-1]
+
+    print(f"import {args.module}: median {import_ms:.1f} ms cumulative import time, "
+          f"{wall_ms:.1f} ms process wall time ({args.runs} runs)")
+    print(f"\nHeaviest modules by self time (last run):")
+    heaviest = sorted(last["modules"].items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    if last["lazy_imported"]:
+        print(f"\nWARNING: imported at start-up but should be lazy: {', '.join(last['lazy_imported'])}")
+    else:
+        print(f"\nNone of {', '.join(LAZY_MODULES)} imported at start-up")
+
+    if args.history:
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "module": args.module,
+            "python": sys.version.split()[0],
+            "import_ms": round(import_ms, 1),
+            "wall_ms": round(wall_ms, 1),
+            "lazy_imported": last["lazy_imported"]
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Appended result to {args.history}")
+
+if __name__ == "__main__":
+    main()
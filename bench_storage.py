@@ -0,0 +1,115 @@
+"""
+Benchmark for compressed storage (compression.py).
+Stores the same projects plainly and compressed, then reports bytes per
+entry for each layout, the in-memory size of the project registry, the
+on-disk size of the project corpus and the decompression latency per entry.
+
+Projects come from the local generator unless --corpus points at an existing
+project corpus; the local generator's template text compresses better than
+real LLM output, so prefer a real corpus when one is available.
+
+Usage: python bench_storage.py [--projects 2000] [--corpus project_corpus.sqlite3]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+from compression import Compressor, PackedProject, pack_project
+from project_corpus import ProjectCorpus
+
+def local_projects(count: int):
+    from local_generator import generate_project_ideas
+
+    courses = ["BTech CSE", "BTech ECE", "AIML", "BTech IT", "Data Science", "Mechanical Engineering"]
+    projects, variant = [], 0
+    while len(projects) < count:
+        for project in generate_project_ideas(courses[variant % len(courses)], 1 + variant % 4, "All", "both", 10, variant=variant):
+            project.update(success_percentage=round(55 + (variant * 7 + len(projects)) % 40, 1), detail_level="full")
+            projects.append(project)
+        variant += 1
+    return projects[:count]
+
+def corpus_projects(path: str, count: int):
+    corpus = ProjectCorpus(path)
+    return [project for _, project in corpus.iter_projects()][:count]
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def memory_of(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+def disk_size(path: str) -> int:
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--corpus", help="read projects from this project corpus instead of generating them")
+    args = parser.parse_args()
+
+    projects = corpus_projects(args.corpus, args.projects) if args.corpus else local_projects(args.projects)
+    print(f"{len(projects)} projects from {args.corpus or 'the local generator'}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        plain = ProjectCorpus(os.path.join(directory, "plain.sqlite3"))
+        plain.compressor = Compressor(plain._connect, enabled=False)
+        compressed = ProjectCorpus(os.path.join(directory, "compressed.sqlite3"))
+        for corpus in (plain, compressed):
+            for i, project in enumerate(projects):
+                # One course per project so title fingerprints never collide
+                corpus.add(f"course{i}", "both", [project])
+            corpus._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            corpus._connect().execute("VACUUM")
+
+        trained = compressed.compressor
+        builtin = Compressor()
+        layouts = {
+            "json": lambda project: json.dumps(project).encode("utf-8"),
+            "positional": lambda project: json.dumps(pack_project(project), separators=(",", ":")).encode("utf-8"),
+            "positional+zlib": lambda project: zlib.compress(json.dumps(pack_project(project), separators=(",", ":")).encode("utf-8"), 9),
+            "positional+built-in dictionary": builtin.encode_project,
+            "positional+trained dictionary": trained.encode_project
+        }
+        raw_total = sum(len(layouts["json"](project)) for project in projects)
+        print("\nbytes per entry:")
+        for name, encode in layouts.items():
+            total = sum(len(encode(project)) for project in projects)
+            print(f"  {name:32s} {total / len(projects):8.0f}  ({raw_total / total:.1f}x)")
+
+        plain_memory = memory_of(lambda: [json.loads(json.dumps(project)) for project in projects])
+        packed_memory = memory_of(lambda: [PackedProject(project) for project in projects])
+        print(f"\nregistry memory: {plain_memory / 1e6:.2f} MB as dicts, {packed_memory / 1e6:.2f} MB packed "
+              f"({1 - packed_memory / plain_memory:.0%} saved)")
+        plain_disk, compressed_disk = disk_size(plain.path), disk_size(compressed.path)
+        print(f"corpus on disk: {plain_disk / 1e6:.2f} MB plain, {compressed_disk / 1e6:.2f} MB compressed "
+              f"({1 - compressed_disk / plain_disk:.0%} saved)")
+
+        rows = [bytes(row[0]) for row in sqlite3.connect(compressed.path).execute("SELECT data FROM projects")]
+        packed = [PackedProject(project) for project in projects]
+        for name, decode, values in (
+            ("corpus row", trained.decode_project, rows),
+            ("registry entry", PackedProject.unpack, packed),
+            ("plain json (baseline)", json.loads, [json.dumps(project) for project in projects])
+        ):
+            timings = []
+            for value in values:
+                start = time.perf_counter()
+                decode(value)
+                timings.append(time.perf_counter() - start)
+            print(f"decode {name:22s} p50 {percentile(timings, 50) * 1e6:6.1f}us  p99 {percentile(timings, 99) * 1e6:6.1f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Throughput benchmark for the API launch modes.
+Starts the server with the development launcher (`python start_api.py`) and
+the production launcher (`python start_api.py --prod`), using the local stub
+provider so no API keys are needed, then drives each with concurrent
+keep-alive clients and reports requests/second and latency percentiles.
+
+Usage: python bench_throughput.py [--duration 10] [--concurrency 32] [--workers N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# (method, path, JSON body) requests cycled by every client
+REQUEST_MIX = [
+    ("POST", "/projects", {"course": "BTech CSE", "academic_year": 3, "difficulty_level": "All", "project_type": "both"}),
+    ("POST", "/projects", {"course": "BTech AIML", "academic_year": 2, "difficulty_level": "All", "detail": "summary"}),
+    ("GET", "/predict-success?course=BTech%20CSE&project_title=Smart%20Traffic&difficulty=Medium", None),
+    ("GET", "/hackathons?months_ahead=12", None),
+    ("GET", "/sih?domain=AI", None)
+]
+
+def start_server(mode: str, port: int, workers: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "AI_PROVIDER": "local",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        # Keep benchmark state out of the working tree
+        "SHARED_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        "JOBS_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "PROJECT_CORPUS_PATH": os.path.join(workdir, "project_corpus.sqlite3"),
+        "SCORE_LOG_PATH": ""
+    })
+    command = [sys.executable, "start_api.py"] + (["--prod"] if mode == "prod" else [])
+    return subprocess.Popen(
+        command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+def drive(base_url: str, duration: float, concurrency: int) -> dict:
+    """Run concurrent keep-alive clients for duration seconds."""
+    import httpx
+
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset: int) -> None:
+        local_latencies, local_errors = [], 0
+        with httpx.Client(base_url=base_url, timeout=30.0) as http:
+            i = offset
+            while time.monotonic() < stop_at:
+                method, path, body = REQUEST_MIX[i % len(REQUEST_MIX)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    response = http.request(method, path, json=body)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                local_latencies.append(time.perf_counter() - start)
+                local_errors += not ok
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1)
+    }
+
+def stop_server(proc: subprocess.Popen) -> None:
+    import signal
+
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+def main() -> None:
+    from start_api import default_workers
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=default_workers(), help="workers for --prod")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("dev", "prod"):
+        workdir = tempfile.mkdtemp(prefix=f"bench-{mode}-")
+        proc = start_server(mode, args.port, args.workers, workdir)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_ready(base_url)
+            drive(base_url, 2.0, args.concurrency)  # warm-up
+            results[mode] = drive(base_url, args.duration, args.concurrency)
+        finally:
+            stop_server(proc)
+            shutil.rmtree(workdir, ignore_errors=True)
+        print(f"{mode:5s} {results[mode]}")
+
+    if results["dev"]["rps"]:
+        print(f"\nprod / dev throughput: {results['prod']['rps'] / results['dev']['rps']:.2f}x "
+              f"({args.workers} worker(s), {args.concurrency} clients)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cooperative cancellation of LLM work.
+API handlers run generation inside a CancelScope. The scope is attached to
+the worker thread's context, so code deep in the call stack can check it
+without extra arguments: generate_with_ai skips provider calls once the
+scope is cancelled, and streaming OpenAI calls stop reading (which closes
+the connection and stops generation) mid-response. Cancelled derives from
+BaseException, like asyncio.CancelledError, so the `except Exception`
+fallbacks along the way do not swallow it.
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class Cancelled(BaseException):
+    """
+    Raised inside cancelled work. tokens_saved estimates the output tokens not
+    generated; started tells whether a provider call was already under way.
+    """
+
+    def __init__(self, tokens_saved: int = 0, started: bool = False):
+        super().__init__("request cancelled")
+        self.tokens_saved = tokens_saved
+        self.started = started
+
+class CancelScope:
+    """A cancellation flag; a child scope is also cancelled when its parent is."""
+
+    def __init__(self, parent: Optional["CancelScope"] = None):
+        self._event = threading.Event()
+        self.parent = parent
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self.parent is not None and self.parent.cancelled)
+
+_current_scope = contextvars.ContextVar("cancel_scope", default=None)
+
+@contextmanager
+def cancel_scope(scope: CancelScope):
+    """Make scope the current scope for this thread's context."""
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+def current_scope() -> Optional[CancelScope]:
+    return _current_scope.get()
+
+def check_cancelled(tokens_saved: int = 0) -> None:
+    """Raise Cancelled if the current scope has been cancelled."""
+    scope = _current_scope.get()
+    if scope is not None and scope.cancelled:
+        raise Cancelled(tokens_saved)
+
+def submit_in_context(executor, fn, *args):
+    """executor.submit that carries the caller's context (and so its scope) into the worker."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+_stats = {"requests_cancelled": 0, "calls_skipped": 0, "calls_aborted": 0, "estimated_tokens_saved": 0, "tokens_saved_by_task": {}}
+_stats_lock = threading.Lock()
+
+def record_request_cancelled() -> None:
+    with _stats_lock:
+        _stats["requests_cancelled"] += 1
+
+def record_call_cancelled(task: str, tokens_saved: int, started: bool) -> None:
+    """Count a provider call that was skipped (not started) or aborted mid-stream."""
+    with _stats_lock:
+        _stats["calls_aborted" if started else "calls_skipped"] += 1
+        _stats["estimated_tokens_saved"] += tokens_saved
+        by_task = _stats["tokens_saved_by_task"]
+        by_task[task] = by_task.get(task, 0) + tokens_saved
+
+def stats() -> Dict:
+    with _stats_lock:
+        return dict(_stats, tokens_saved_by_task=dict(_stats["tokens_saved_by_task"]))
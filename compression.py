@@ -0,0 +1,295 @@
+"""
+Compact storage for generated projects and LLM responses.
+Stored values are compressed against a shared dictionary, so the JSON keys
+and stock phrases every entry repeats cost almost nothing. zstd is used when
+the `zstandard` package is installed, otherwise zlib with a preset
+dictionary. Projects are additionally stored positionally (values of
+PROJECT_FIELDS in order, plus a bitmask of the fields present) instead of
+as key/value JSON.
+
+Each store (the LLM cache, the project corpus) starts with a built-in
+dictionary and trains its own, once, from the first DICTIONARY_TRAIN_SAMPLES
+values it writes. The trained dictionary is kept in the store's SQLite file
+and used by every process from then on, so entries stay readable by all
+processes and across restarts. Older dictionaries that no stored value
+refers to any more are deleted when a store opens. Encoded values carry a
+codec byte and dictionary id; plain strings written before compression
+existed are returned unchanged.
+"""
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STORAGE_COMPRESSION = os.getenv("STORAGE_COMPRESSION", "true").lower() == "true"
+# Values collected before a store trains its own dictionary
+DICTIONARY_TRAIN_SAMPLES = int(os.getenv("DICTIONARY_TRAIN_SAMPLES", "200"))
+# zlib can only refer back 32 KB, so larger dictionaries would not help it
+DICTIONARY_SIZE = 32 * 1024 if zstandard is None else 64 * 1024
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+_HEADER = struct.Struct("<BH")  # codec, dictionary id
+
+BUILTIN_DICTIONARY_ID = 0
+
+PROJECT_FIELDS = (
+    "title", "difficulty", "success_percentage", "description", "tech_stack", "detail_level",
+    "hardware", "software", "implementation_steps", "estimated_time", "job_relevance"
+)
+
+# Stand-in for a trained dictionary: the keys and phrases generated projects
+# and guidance share. Most frequent material goes last, closest to the data.
+_BUILTIN_DICTIONARY = " ".join([
+    "Beginner Medium Advanced months weeks Python JavaScript React Node.js Flask Django FastAPI",
+    "TensorFlow PyTorch scikit-learn OpenCV Pandas NumPy MongoDB MySQL PostgreSQL Firebase Docker AWS",
+    "Arduino Raspberry Pi ESP32 sensors IoT microcontroller Computer with GPU Standard laptop/PC",
+    "Set up the development environment and install dependencies. Collect and preprocess the dataset.",
+    "Design the database schema. Build the REST API. Develop the frontend user interface.",
+    "Train and evaluate the machine learning model. Integrate the components and test thoroughly.",
+    "Deploy the application to the cloud and document the project.",
+    "Highly relevant for roles such as Software Developer, Data Scientist, Machine Learning Engineer,",
+    "Full Stack Developer, Embedded Systems Engineer and IoT Developer in industry.",
+    "A project that uses machine learning to detect, predict and analyze real-time data for students,",
+    "inspired by Smart India Hackathon problem statements. This version is tailored for BTech CSE students.",
+    '{"title": "", "difficulty": "", "description": "", "tech_stack": ["", ""], "hardware": "",',
+    '"software": ["", ""], "implementation_steps": ["", ""], "estimated_time": "", "job_relevance": "",',
+    '"success_percentage": , "detail_level": "full"}, {"projects": [{"title": "',
+    '", "difficulty": "Beginner", "difficulty": "Medium", "difficulty": "Advanced", "description": "A ',
+]).encode("utf-8")
+
+def pack_project(project: Dict) -> List:
+    """Positional form of a project: [mask, values of the PROJECT_FIELDS present..., other fields]."""
+    mask, values = 0, []
+    for bit, field in enumerate(PROJECT_FIELDS):
+        if field in project:
+            mask |= 1 << bit
+            values.append(project[field])
+    extra = {key: value for key, value in project.items() if key not in PROJECT_FIELDS}
+    return [mask] + values + ([extra] if extra else [])
+
+def unpack_project(packed: List) -> Dict:
+    mask, position, project = packed[0], 1, {}
+    for bit, field in enumerate(PROJECT_FIELDS):
+        if mask >> bit & 1:
+            project[field] = packed[position]
+            position += 1
+    if position < len(packed):
+        project.update(packed[position])
+    return project
+
+def train_dictionary(samples: List[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    """Build a dictionary from sample values."""
+    if zstandard is not None:
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except zstandard.ZstdError:
+            pass  # too few or too uniform samples: use the substring dictionary
+    # Keep strings and key runs that recur across samples, most frequent last
+    counts = {}
+    for sample in samples:
+        for fragment in set(re.findall(rb'"[^"]{0,400}"[:,\]\} ]*', sample)):
+            counts[fragment] = counts.get(fragment, 0) + 1
+    fragments = sorted((item for item in counts.items() if item[1] > 1), key=lambda item: (item[1], len(item[0])))
+    dictionary, total = [], 0
+    for fragment, _ in reversed(fragments):
+        if total + len(fragment) > size:
+            break
+        dictionary.append(fragment)
+        total += len(fragment)
+    return b"".join(reversed(dictionary))
+
+class Compressor:
+    """
+    Dictionary compression for one store. With connect (returning the
+    store's SQLite connection) dictionaries are trained and shared through a
+    `dictionaries` table; without it only the built-in dictionary is used.
+    """
+
+    def __init__(self, connect: Optional[Callable[[], sqlite3.Connection]] = None, enabled: bool = STORAGE_COMPRESSION):
+        self.enabled = enabled
+        self.codec = CODEC_RAW if not enabled else CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+        self._connect = connect
+        self._dictionaries = {BUILTIN_DICTIONARY_ID: _BUILTIN_DICTIONARY}
+        self._zstd = {}  # dictionary id -> ZstdCompressionDict
+        self._lock = threading.Lock()
+        self._samples = []
+        self.current = BUILTIN_DICTIONARY_ID
+        if connect is not None:
+            conn = connect()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dictionaries (id INTEGER PRIMARY KEY, codec INTEGER NOT NULL, "
+                "data BLOB NOT NULL, created REAL NOT NULL)"
+            )
+            row = conn.execute(
+                "SELECT id, data FROM dictionaries WHERE codec = ? ORDER BY id DESC LIMIT 1", (self.codec,)
+            ).fetchone()
+            if row is not None:
+                self.current = row[0]
+                self._dictionaries[row[0]] = bytes(row[1])
+                self._samples = None  # already trained, by this or an earlier process
+
+    def _dictionary(self, dictionary_id: int) -> bytes:
+        dictionary = self._dictionaries.get(dictionary_id)
+        if dictionary is None:
+            # Trained by another process since this one started
+            row = self._connect().execute("SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)).fetchone()
+            if row is None:
+                raise Exception(f"Unknown compression dictionary {dictionary_id}")
+            dictionary = self._dictionaries[dictionary_id] = bytes(row[0])
+        return dictionary
+
+    def _zstd_dictionary(self, dictionary_id: int):
+        dictionary = self._zstd.get(dictionary_id)
+        if dictionary is None:
+            # The built-in dictionary is plain content rather than a trained zstd dictionary
+            dict_type = zstandard.DICT_TYPE_RAWCONTENT if dictionary_id == BUILTIN_DICTIONARY_ID else zstandard.DICT_TYPE_AUTO
+            dictionary = self._zstd[dictionary_id] = zstandard.ZstdCompressionDict(self._dictionary(dictionary_id), dict_type=dict_type)
+        return dictionary
+
+    def _train(self) -> None:
+        """
+        Train a dictionary from the collected samples and make it current. If
+        another process stored one for this codec meanwhile, that one is used.
+        """
+        samples, self._samples = self._samples, None
+        dictionary = train_dictionary(samples)
+        if not dictionary:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, data FROM dictionaries WHERE codec = ? ORDER BY id DESC LIMIT 1", (self.codec,)
+                ).fetchone()
+                if row is None:
+                    cursor = conn.execute(
+                        "INSERT INTO dictionaries (codec, data, created) VALUES (?, ?, ?)", (self.codec, dictionary, time.time())
+                    )
+                    row = (cursor.lastrowid, dictionary)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            return
+        self._dictionaries[row[0]] = bytes(row[1])
+        self.current = row[0]
+
+    def prune(self, table: str, column: str) -> int:
+        """
+        Delete stored dictionaries that no value in table.column was encoded
+        with, keeping the newest one of each codec. Returns how many were deleted.
+        """
+        if self._connect is None:
+            return 0
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute("SELECT id, codec FROM dictionaries ORDER BY id").fetchall()
+                newest = {codec: dictionary_id for dictionary_id, codec in rows}
+                stale = [dictionary_id for dictionary_id, codec in rows if newest[codec] != dictionary_id]
+                if stale:
+                    used = set()
+                    for (header,) in conn.execute(
+                        f"SELECT DISTINCT substr({column}, 1, {_HEADER.size}) FROM {table} WHERE typeof({column}) = 'blob'"
+                    ):
+                        if len(header) == _HEADER.size:
+                            used.add(_HEADER.unpack(header)[1])
+                    stale = [dictionary_id for dictionary_id in stale if dictionary_id not in used]
+                    conn.executemany("DELETE FROM dictionaries WHERE id = ?", [(dictionary_id,) for dictionary_id in stale])
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            return 0  # a busy store keeps its dictionaries until the next start
+        for dictionary_id in stale:
+            self._dictionaries.pop(dictionary_id, None)
+            self._zstd.pop(dictionary_id, None)
+        return len(stale)
+
+    def encode(self, text: str) -> bytes:
+        raw = text.encode("utf-8")
+        if not self.enabled:
+            return _HEADER.pack(CODEC_RAW, 0) + raw
+        if self._connect is not None and self._samples is not None:
+            with self._lock:
+                if self._samples is not None:
+                    self._samples.append(raw)
+                    if len(self._samples) >= DICTIONARY_TRAIN_SAMPLES:
+                        self._train()
+        dictionary_id = self.current
+        if self.codec == CODEC_ZSTD:
+            data = zstandard.ZstdCompressor(level=9, dict_data=self._zstd_dictionary(dictionary_id)).compress(raw)
+        else:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=self._dictionary(dictionary_id))
+            data = compressor.compress(raw) + compressor.flush()
+        if len(data) >= len(raw):
+            return _HEADER.pack(CODEC_RAW, 0) + raw
+        return _HEADER.pack(self.codec, dictionary_id) + data
+
+    def decode(self, value) -> str:
+        """Text of an encoded value; str values (stored uncompressed) are returned as they are."""
+        if isinstance(value, str):
+            return value
+        value = bytes(value)
+        codec, dictionary_id = _HEADER.unpack_from(value)
+        data = value[_HEADER.size:]
+        if codec == CODEC_ZLIB:
+            decompressor = zlib.decompressobj(-15, zdict=self._dictionary(dictionary_id))
+            data = decompressor.decompress(data) + decompressor.flush()
+        elif codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise Exception("Entry is zstd-compressed but the zstandard package is not installed")
+            data = zstandard.ZstdDecompressor(dict_data=self._zstd_dictionary(dictionary_id)).decompress(data)
+        return data.decode("utf-8")
+
+    def encode_project(self, project: Dict) -> bytes:
+        return self.encode(json.dumps(pack_project(project), separators=(",", ":")))
+
+    def decode_project(self, value) -> Dict:
+        data = json.loads(self.decode(value))
+        # Rows written before compression hold the plain project dict
+        return data if isinstance(data, dict) else unpack_project(data)
+
+class PackedProject:
+    """
+    A project held compressed in memory (built-in dictionary only, so it
+    survives warm-restart snapshots) and decompressed only when read.
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, project: Dict):
+        self.data = _memory.encode_project(project)
+
+    def unpack(self) -> Dict:
+        return _memory.decode_project(self.data)
+
+    def __getstate__(self):
+        return self.data
+
+    def __setstate__(self, data):
+        self.data = data
+
+_memory = Compressor()
+
+def packed(value: Any) -> Any:
+    """Wrap a project dict for in-memory storage (other values are kept as they are)."""
+    return PackedProject(value) if isinstance(value, dict) and _memory.enabled else value
+
+def unpacked(value: Any) -> Any:
+    return value.unpack() if isinstance(value, PackedProject) else value
@@ -0,0 +1,245 @@
+"""
+Lightweight CSV data access for hackathons and SIH problems.
+Uses the standard csv module and streams rows, so the API process never
+needs to import pandas.
+"""
+import csv
+import hashlib
+import io
+import os
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+HACKATHONS_CSV = "hackathons.csv"
+SIH_CSV = "sih.csv"
+
+HACKATHON_FIELDS = ["name", "organizer", "date", "location", "registration_link", "prize_pool", "description"]
+
+# Serializes writers to hackathons.csv within this process
+_hackathons_lock = threading.Lock()
+# Hash index of hackathon keys, rebuilt when the file changes on disk
+_hackathon_keys = set()
+_hackathon_keys_stamp = None
+# Date-sorted hackathon index for listings, rebuilt when the file changes on disk
+_hackathon_index = None
+_hackathon_index_stamp = None
+_hackathon_index_lock = threading.Lock()
+
+def iter_csv_records(path: str) -> Iterator[Dict]:
+    """Yield one dict per CSV row; empty cells become None."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+
+def _parse_sih_record(record: Dict) -> Dict:
+    try:
+        record["year"] = int(record["year"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    if isinstance(record.get("tech_stack"), str):
+        # Parse comma-separated string to list
+        record["tech_stack"] = [t.strip() for t in record["tech_stack"].split(",") if t.strip()]
+    return record
+
+def load_hackathons() -> List[Dict]:
+    try:
+        return list(iter_csv_records(HACKATHONS_CSV))
+    except OSError:
+        return []
+
+def load_sih_problems() -> List[Dict]:
+    try:
+        return [_parse_sih_record(record) for record in iter_csv_records(SIH_CSV)]
+    except OSError:
+        return []
+
+def save_hackathons(hackathons: List[Dict]) -> None:
+    """Write all hackathons atomically (temp file + rename)."""
+    tmp_path = HACKATHONS_CSV + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HACKATHON_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for hackathon in hackathons:
+            writer.writerow({key: ("" if hackathon.get(key) is None else hackathon.get(key)) for key in HACKATHON_FIELDS})
+    os.replace(tmp_path, HACKATHONS_CSV)
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+# Date formats accepted from users and imports; numeric dates are day first
+DATE_FORMATS = (
+    "%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d", "%d.%m.%Y",
+    "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y", "%d %B, %Y", "%d %b, %Y"
+)
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """A date in one of DATE_FORMATS as YYYY-MM-DD, or None if it cannot be parsed."""
+    value = " ".join((value or "").split())
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+def _normalize_date(value: Optional[str]) -> str:
+    return parse_date(value) or (value or "").strip()
+
+def hackathon_key(record: Dict) -> str:
+    """Dedupe key: hash of normalized (name, organizer, date)."""
+    parts = [_normalize(record.get("name")), _normalize(record.get("organizer")), _normalize_date(record.get("date"))]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def file_stamp(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def file_digest(path: str) -> Optional[str]:
+    """SHA-1 of a file's contents (stable across copies, unlike file_stamp), or None if missing."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def _current_hackathon_keys() -> set:
+    """Return the key index, rebuilding it only if the file changed. Call with the lock held."""
+    global _hackathon_keys, _hackathon_keys_stamp
+    stamp = file_stamp(HACKATHONS_CSV)
+    if stamp != _hackathon_keys_stamp:
+        _hackathon_keys = {hackathon_key(record) for record in load_hackathons()}
+        _hackathon_keys_stamp = stamp
+    return _hackathon_keys
+
+def _append_hackathons(records: List[Dict]) -> None:
+    """Append records to the CSV with a single write. Call with the lock held."""
+    global _hackathon_keys_stamp
+    from facets import hackathons_appended
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=HACKATHON_FIELDS, extrasaction="ignore")
+    old_stamp = file_stamp(HACKATHONS_CSV)
+    needs_header = old_stamp is None
+    if needs_header:
+        writer.writeheader()
+    for record in records:
+        writer.writerow({key: ("" if record.get(key) is None else record.get(key)) for key in HACKATHON_FIELDS})
+
+    with open(HACKATHONS_CSV, "a+", newline="", encoding="utf-8") as f:
+        # Make sure the last existing row is terminated before appending
+        if not needs_header and f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != "\n":
+                buffer = io.StringIO("\r\n" + buffer.getvalue())
+        f.write(buffer.getvalue())
+    _hackathon_keys_stamp = file_stamp(HACKATHONS_CSV)
+    hackathons_appended(records, old_stamp, _hackathon_keys_stamp)
+
+def add_hackathon(record: Dict) -> bool:
+    """Append one hackathon. Returns False if it is a duplicate."""
+    with _hackathons_lock:
+        keys = _current_hackathon_keys()
+        key = hackathon_key(record)
+        if key in keys:
+            return False
+        _append_hackathons([record])
+        keys.add(key)
+        return True
+
+def import_hackathons(rows: Iterable[Dict], validate: Callable[[Dict], Dict], max_errors: int = 20) -> Dict:
+    """
+    Validate, dedupe and append hackathon rows in one write.
+    rows may be a lazy iterator (e.g. a streaming parser); validate returns the
+    cleaned record or raises ValueError. Returns inserted/duplicate/invalid counts
+    and the first few validation errors.
+    """
+    counts = {"inserted": 0, "duplicate": 0, "invalid": 0, "errors": []}
+    new_records = []
+    with _hackathons_lock:
+        keys = _current_hackathon_keys()
+        batch_keys = set()
+        for line_number, row in enumerate(rows, 1):
+            try:
+                record = validate(row)
+            except ValueError as e:
+                counts["invalid"] += 1
+                if len(counts["errors"]) < max_errors:
+                    counts["errors"].append({"row": line_number, "error": str(e)})
+                continue
+            key = hackathon_key(record)
+            if key in keys or key in batch_keys:
+                counts["duplicate"] += 1
+                continue
+            batch_keys.add(key)
+            new_records.append(record)
+
+        if new_records:
+            _append_hackathons(new_records)
+            keys.update(batch_keys)
+    counts["inserted"] = len(new_records)
+    return counts
+
+class HackathonIndex:
+    """
+    Hackathons with a valid YYYY-MM-DD date, sorted by (date, key).
+    The sort order is total and stable across appends, so a (date, key)
+    position can serve as a pagination cursor.
+    """
+
+    def __init__(self, hackathons: List[Dict]):
+        entries = []
+        for record in hackathons:
+            try:
+                datetime.strptime(record.get("date") or "", "%Y-%m-%d")
+            except ValueError:
+                continue
+            entries.append(((record["date"], hackathon_key(record)), record))
+        entries.sort(key=lambda entry: entry[0])
+        self.positions = [position for position, _ in entries]
+        self.records = [record for _, record in entries]
+
+    def date_range(self, after: str, until: str) -> tuple:
+        """Index range of hackathons dated after `after` and up to `until` (inclusive)."""
+        return (bisect_right(self.positions, (after, "\uffff")), bisect_right(self.positions, (until, "\uffff")))
+
+    def seek(self, position: tuple, start: int, end: int) -> int:
+        """First index in [start, end) after the given (date, key) position."""
+        return max(start, min(end, bisect_right(self.positions, position, start, end)))
+
+def get_hackathon_index() -> HackathonIndex:
+    """Return the listing index, rebuilding it only when hackathons.csv changed."""
+    global _hackathon_index, _hackathon_index_stamp
+    stamp = file_stamp(HACKATHONS_CSV)
+    if _hackathon_index is None or stamp != _hackathon_index_stamp:
+        with _hackathon_index_lock:
+            if _hackathon_index is None or stamp != _hackathon_index_stamp:
+                _hackathon_index = HackathonIndex(load_hackathons())
+                _hackathon_index_stamp = stamp
+    return _hackathon_index
+
+def hackathon_index_version() -> Dict:
+    return {"hackathons.csv": file_digest(HACKATHONS_CSV)}
+
+def snapshot_hackathon_index() -> Optional[tuple]:
+    """(objects, arrays) for a warm-restart snapshot, or None if the index is missing or stale."""
+    index = _hackathon_index
+    if index is None or _hackathon_index_stamp != file_stamp(HACKATHONS_CSV):
+        return None
+    return {"positions": index.positions, "records": index.records}, {}
+
+def restore_hackathon_index(objects: Dict, arrays: Dict) -> None:
+    global _hackathon_index, _hackathon_index_stamp
+    index = HackathonIndex([])
+    index.positions = objects["positions"]
+    index.records = objects["records"]
+    with _hackathon_index_lock:
+        _hackathon_index = index
+        _hackathon_index_stamp = file_stamp(HACKATHONS_CSV)
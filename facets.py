@@ -0,0 +1,174 @@
+"""
+Facet counts for SIH problems and hackathons.
+Each facet value keeps a posting bitset (a Python int with one bit per
+record), so counts for any combination of filters are a few ANDs and
+popcounts rather than a scan of the data. Unfiltered counts are kept up to
+date as records are added. Indexes are built when a CSV is first loaded,
+extended in place when this process appends hackathons, and rebuilt only if
+the file was changed by someone else.
+"""
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+import data_store
+
+# Attributes saved in warm-restart snapshots
+STATE_ATTRIBUTES = ("size", "bits", "counts", "labels")
+
+def _popcount(bits: int) -> int:
+    return bits.bit_count() if hasattr(bits, "bit_count") else bin(bits).count("1")
+
+class FacetIndex:
+    """Posting bitsets per facet value over a growing list of records."""
+
+    def __init__(self, extractors: Dict[str, Callable[[Dict], Iterable[str]]]):
+        self.extractors = extractors
+        self.size = 0
+        self.bits = {name: {} for name in extractors}    # facet -> value key -> bitset
+        self.counts = {name: {} for name in extractors}  # facet -> value key -> count
+        self.labels = {name: {} for name in extractors}  # facet -> value key -> first spelling seen
+        self.stamp = None
+        self._lock = threading.Lock()
+
+    def _values(self, name: str, record: Dict) -> set:
+        values = set()
+        for value in self.extractors[name](record):
+            value = str(value).strip() if value is not None else ""
+            if value:
+                key = value.casefold()
+                self.labels[name].setdefault(key, value)
+                values.add(key)
+        return values
+
+    def add_many(self, records: List[Dict]) -> None:
+        """Index records after those already indexed."""
+        with self._lock:
+            start = self.size
+            for name in self.extractors:
+                # Collect positions per value, then merge each value's bits in one step
+                positions = {}
+                for offset, record in enumerate(records):
+                    for key in self._values(name, record):
+                        positions.setdefault(key, []).append(offset)
+                for key, hits in positions.items():
+                    bitmap = bytearray((len(records) + 7) // 8)
+                    for offset in hits:
+                        bitmap[offset >> 3] |= 1 << (offset & 7)
+                    self.bits[name][key] = self.bits[name].get(key, 0) | (int.from_bytes(bitmap, "little") << start)
+                    self.counts[name][key] = self.counts[name].get(key, 0) + len(hits)
+            self.size += len(records)
+
+    def facet_counts(self, filters: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Counts per facet value for records matching the filters ({facet: value}).
+        Each facet is counted under the other facets' filters only, so it lists
+        the alternatives to its own current selection.
+        """
+        filters = {name: value.casefold() for name, value in (filters or {}).items() if value and name in self.extractors}
+        with self._lock:
+            masks = {name: self.bits[name].get(key, 0) for name, key in filters.items()}
+            matching = None
+            for mask in masks.values():
+                matching = mask if matching is None else matching & mask
+            facets = {}
+            for name in self.extractors:
+                others = None
+                for other, mask in masks.items():
+                    if other != name:
+                        others = mask if others is None else others & mask
+                if others is None:
+                    counts = dict(self.counts[name])
+                else:
+                    counts = {key: _popcount(bits & others) for key, bits in self.bits[name].items()}
+                ordered = sorted((item for item in counts.items() if item[1]), key=lambda item: (-item[1], item[0]))
+                facets[name] = {self.labels[name][key]: count for key, count in ordered}
+            return {
+                "total": self.size,
+                "matching": self.size if matching is None else _popcount(matching),
+                "facets": facets
+            }
+
+SIH_FACETS = {
+    "domain": lambda record: [record.get("domain")],
+    "year": lambda record: [record.get("year")],
+    "difficulty": lambda record: [record.get("difficulty")],
+    "tech": lambda record: record.get("tech_stack") or []
+}
+
+HACKATHON_FACETS = {
+    # YYYY-MM, for dates in the canonical YYYY-MM-DD form
+    "month": lambda record: [record["date"][:7]] if re.fullmatch(r"\d{4}-\d{2}-\d{2}", record.get("date") or "") else [],
+    "location": lambda record: [record.get("location")]
+}
+
+_sih_facets = None
+_hackathon_facets = None
+_facets_lock = threading.Lock()
+
+def get_sih_facets() -> FacetIndex:
+    """Return the SIH facet index, rebuilding it only when sih.csv changed."""
+    global _sih_facets
+    stamp = data_store.file_stamp(data_store.SIH_CSV)
+    if _sih_facets is None or _sih_facets.stamp != stamp:
+        with _facets_lock:
+            if _sih_facets is None or _sih_facets.stamp != stamp:
+                index = FacetIndex(SIH_FACETS)
+                index.add_many(data_store.load_sih_problems())
+                index.stamp = stamp
+                _sih_facets = index
+    return _sih_facets
+
+def get_hackathon_facets() -> FacetIndex:
+    """Return the hackathon facet index, rebuilding it only when hackathons.csv changed elsewhere."""
+    global _hackathon_facets
+    stamp = data_store.file_stamp(data_store.HACKATHONS_CSV)
+    if _hackathon_facets is None or _hackathon_facets.stamp != stamp:
+        with _facets_lock:
+            if _hackathon_facets is None or _hackathon_facets.stamp != stamp:
+                index = FacetIndex(HACKATHON_FACETS)
+                index.add_many(data_store.load_hackathons())
+                index.stamp = stamp
+                _hackathon_facets = index
+    return _hackathon_facets
+
+def _snapshot(index: Optional[FacetIndex], path: str) -> Optional[tuple]:
+    if index is None or index.stamp != data_store.file_stamp(path):
+        return None
+    with index._lock:
+        return {name: getattr(index, name) for name in STATE_ATTRIBUTES}, {}
+
+def _restore(extractors: Dict, objects: Dict, path: str) -> FacetIndex:
+    index = FacetIndex(extractors)
+    for name in STATE_ATTRIBUTES:
+        setattr(index, name, objects[name])
+    index.stamp = data_store.file_stamp(path)
+    return index
+
+def sih_facets_version() -> Dict:
+    return {"sih.csv": data_store.file_digest(data_store.SIH_CSV)}
+
+def snapshot_sih_facets() -> Optional[tuple]:
+    """(objects, arrays) for a warm-restart snapshot, or None if the index is missing or stale."""
+    return _snapshot(_sih_facets, data_store.SIH_CSV)
+
+def restore_sih_facets(objects: Dict, arrays: Dict) -> None:
+    global _sih_facets
+    _sih_facets = _restore(SIH_FACETS, objects, data_store.SIH_CSV)
+
+def hackathon_facets_version() -> Dict:
+    return {"hackathons.csv": data_store.file_digest(data_store.HACKATHONS_CSV)}
+
+def snapshot_hackathon_facets() -> Optional[tuple]:
+    return _snapshot(_hackathon_facets, data_store.HACKATHONS_CSV)
+
+def restore_hackathon_facets(objects: Dict, arrays: Dict) -> None:
+    global _hackathon_facets
+    _hackathon_facets = _restore(HACKATHON_FACETS, objects, data_store.HACKATHONS_CSV)
+
+def hackathons_appended(records: List[Dict], old_stamp: Optional[tuple], new_stamp: Optional[tuple]) -> None:
+    """Extend the hackathon index in place after this process appended records to the CSV."""
+    index = _hackathon_facets
+    if index is not None and index.stamp == old_stamp:
+        index.add_many(records)
+        index.stamp = new_stamp
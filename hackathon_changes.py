@@ -0,0 +1,205 @@
+"""
+Change feed for hackathons.
+Changes to hackathons.csv (API adds and imports as well as edits to the
+file itself) are found by diffing the file against the last state seen,
+whenever the file's stamp changes, and logged in SQLite under a monotonic
+version shared by all workers. Clients poll changes(since) for the records
+added, updated or removed after the version they hold; since=0 pages
+through every current record in key order. The log keeps the last HACKATHON_CHANGES_RETENTION
+changes; clients holding an older version must resync from 0.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import data_store
+
+HACKATHON_CHANGES_ENABLED = os.getenv("HACKATHON_CHANGES_ENABLED", "true").lower() == "true"
+HACKATHON_CHANGES_PATH = os.getenv("HACKATHON_CHANGES_PATH", "hackathon_changes.sqlite3")
+HACKATHON_CHANGES_RETENTION = int(os.getenv("HACKATHON_CHANGES_RETENTION", "10000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    op TEXT NOT NULL,
+    record TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS current (
+    key TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class ResyncRequired(Exception):
+    """The requested version is older than the log retains (or newer than it knows)."""
+
+    def __init__(self, version: int):
+        super().__init__(f"Resync required: version is no longer in the change log (latest is {version}). Poll again with since=0.")
+        self.version = version
+
+class HackathonChangeLog:
+    """SQLite-backed change log, safe to use from many threads and processes."""
+
+    def __init__(self, path: str = HACKATHON_CHANGES_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._synced_stamp = None
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self) -> int:
+        """Latest version (0 before anything was logged)."""
+        row = self._connect().execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+        return row[0] if row else 0
+
+    def sync(self) -> int:
+        """Log the changes made to hackathons.csv since the last sync by any process. Returns the version."""
+        stamp = json.dumps(data_store.file_stamp(data_store.HACKATHONS_CSV))
+        if stamp == self._synced_stamp:
+            return self.version()
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front, so concurrent syncs diff one at a time
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'stamp'").fetchone()
+            if row is None or row[0] != stamp:
+                self._apply_diff(conn)
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('stamp', ?)", (stamp,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._synced_stamp = stamp
+        return self.version()
+
+    def _apply_diff(self, conn: sqlite3.Connection) -> None:
+        records = {}
+        for record in data_store.load_hackathons():
+            records[data_store.hackathon_key(record)] = json.dumps(record, sort_keys=True)
+        known = dict(conn.execute("SELECT key, record FROM current"))
+        now = time.time()
+        changes = []
+        for key, record in records.items():
+            if key not in known:
+                changes.append((key, "added", record, now))
+            elif known[key] != record:
+                changes.append((key, "updated", record, now))
+        changes += [(key, "removed", record, now) for key, record in known.items() if key not in records]
+        if not changes:
+            return
+        conn.executemany("INSERT INTO changes (key, op, record, created) VALUES (?, ?, ?, ?)", changes)
+        for key, op, record, _ in changes:
+            if op == "removed":
+                conn.execute("DELETE FROM current WHERE key = ?", (key,))
+            else:
+                conn.execute("INSERT OR REPLACE INTO current (key, record) VALUES (?, ?)", (key, record))
+        conn.execute(
+            "DELETE FROM changes WHERE version <= (SELECT seq FROM sqlite_sequence WHERE name = 'changes') - ?",
+            (HACKATHON_CHANGES_RETENTION,)
+        )
+
+    def snapshot(self, limit: int = 500, after: Optional[str] = None, version: Optional[int] = None) -> Dict:
+        """
+        Up to limit current records with a key greater than after, in key
+        order, as added. The first page takes the current version; later pages
+        pass the version of the first page back with the key of the last
+        record ("after" in the result while has_more is true). Changes made
+        while paging are returned by the next changes(version).
+        """
+        self.sync()
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            if version is None:
+                version = self.version()
+            rows = conn.execute(
+                "SELECT key, record FROM current WHERE key > ? ORDER BY key LIMIT ?", (after or "", limit + 1)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "version": version,
+            "has_more": has_more,
+            "added": [dict(json.loads(record), key=key) for key, record in rows],
+            "updated": [],
+            "removed": [],
+            "after": rows[-1][0] if has_more else None
+        }
+
+    def changes(self, since: int, limit: int = 500) -> Dict:
+        """
+        Records added, updated or removed after version since, up to limit
+        logged changes. Several changes to one record are merged into its
+        latest state. since=0 returns the first page of snapshot(). Raises
+        ResyncRequired if since is outside the log.
+        """
+        if since == 0:
+            return self.snapshot(limit)
+        self.sync()
+        conn = self._connect()
+        # One read transaction, so the version matches the rows read
+        conn.execute("BEGIN")
+        try:
+            version = self.version()
+            oldest = conn.execute("SELECT MIN(version) FROM changes").fetchone()[0]
+            if since > version or (oldest is not None and since < oldest - 1):
+                raise ResyncRequired(version)
+            rows = conn.execute(
+                "SELECT version, key, op, record FROM changes WHERE version > ? ORDER BY version LIMIT ?", (since, limit + 1)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Per key: whether the client can have it (first op was not an add) and its latest change
+        merged = {}
+        for _, key, op, record in rows:
+            existed = merged[key][0] if key in merged else op != "added"
+            merged[key] = (existed, op, record)
+        result = {"version": rows[-1][0] if rows else version, "has_more": has_more, "added": [], "updated": [], "removed": []}
+        for key, (existed, op, record) in merged.items():
+            record = dict(json.loads(record), key=key)
+            if op == "removed":
+                if existed:
+                    result["removed"].append(record)
+            else:
+                result["updated" if existed else "added"].append(record)
+        return result
+
+_change_log = None
+_change_log_lock = threading.Lock()
+
+def get_change_log() -> Optional[HackathonChangeLog]:
+    """Return the process-wide change log, or None when disabled or unavailable."""
+    global _change_log, HACKATHON_CHANGES_ENABLED
+    if not HACKATHON_CHANGES_ENABLED:
+        return None
+    if _change_log is None:
+        with _change_log_lock:
+            if _change_log is None:
+                try:
+                    _change_log = HackathonChangeLog()
+                except sqlite3.Error:
+                    HACKATHON_CHANGES_ENABLED = False
+                    return None
+    return _change_log
@@ -0,0 +1,202 @@
+"""
+Background generation jobs.
+Jobs are persisted in SQLite so they survive restarts and can be picked up by
+any API worker process. A bounded pool of worker threads per process claims
+queued jobs, runs them, stores the result with a TTL and optionally notifies
+a local webhook.
+"""
+import ipaddress
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "200"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", str(24 * 3600)))
+# A running job not updated for this long is assumed lost (its process died)
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))
+WEBHOOK_TIMEOUT = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    webhook_url TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created);
+"""
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting."""
+
+def is_local_url(url: str) -> bool:
+    """Webhooks may only target loopback or private-network hosts."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+    if parsed.hostname == "localhost":
+        return True
+    try:
+        address = ipaddress.ip_address(parsed.hostname)
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private
+
+class JobManager:
+    """
+    Persistent job queue with a bounded worker pool.
+    runners maps a job kind to a callable taking the request dict and
+    returning a JSON-serializable result.
+    """
+
+    def __init__(self, runners: Dict[str, Callable], path: str = JOBS_DB_PATH, workers: int = JOB_WORKERS):
+        self.runners = runners
+        self.path = path
+        self.workers = workers
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def start(self) -> None:
+        """Recover jobs lost by a dead process and start the worker threads."""
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET status = 'queued', updated = ? WHERE status = 'running' AND updated < ?",
+            (now, now - JOB_STALE_SECONDS)
+        )
+        self.purge_expired()
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        self._threads = []
+
+    def submit(self, kind: str, request: Dict, webhook_url: Optional[str] = None) -> str:
+        if kind not in self.runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if webhook_url and not is_local_url(webhook_url):
+            raise ValueError("webhook_url must point to localhost or a private network address")
+        conn = self._connect()
+        pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+        if pending >= JOB_MAX_PENDING:
+            raise JobQueueFull(f"Too many pending jobs ({pending}). Try again later.")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, request, webhook_url, created, updated) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(request), webhook_url, now, now)
+        )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (row["expires"] is not None and row["expires"] < time.time()):
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "created": row["created"],
+            "updated": row["updated"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"]
+        }
+
+    def purge_expired(self) -> int:
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE expires IS NOT NULL AND expires < ?", (time.time(),)
+        ).rowcount
+
+    def stats(self) -> Dict:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest queued job to running; safe across processes."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', updated = ? WHERE id = ?", (time.time(), row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _worker(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                # Poll occasionally so jobs queued by other processes get picked up too
+                self._wakeup.wait(timeout=1.0)
+                self._wakeup.clear()
+                continue
+            self._run(row)
+
+    def _run(self, row: sqlite3.Row) -> None:
+        result, error = None, None
+        try:
+            result = json.dumps(self.runners[row["kind"]](json.loads(row["request"])))
+            status = "succeeded"
+        except Exception as e:
+            error, status = str(e), "failed"
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ?, expires = ? WHERE id = ?",
+            (status, result, error, now, now + JOB_RESULT_TTL, row["id"])
+        )
+        if row["webhook_url"]:
+            self._notify(row["webhook_url"], {"id": row["id"], "kind": row["kind"], "status": status})
+
+    def _notify(self, url: str, payload: Dict) -> None:
+        """Best-effort webhook POST; failures are ignored (clients can still poll)."""
+        from urllib import request as urllib_request
+
+        data = json.dumps(payload).encode("utf-8")
+        req = urllib_request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            urllib_request.urlopen(req, timeout=WEBHOOK_TIMEOUT).close()
+        except Exception:
+            pass
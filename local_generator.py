@@ -0,0 +1,275 @@
+"""
+Local in-process generator used by the "local" AI provider.
+Builds project ideas, guidance and success scores by recombining PROJECT_BANK,
+SIH problem statements and a tech-stack vocabulary. No network calls are made,
+and the same inputs always produce the same output.
+"""
+import hashlib
+import json
+import random
+from typing import List, Optional, Dict
+
+# Technologies that fit each course category, grouped by difficulty
+TECH_VOCABULARY = {
+    "ai": {
+        "beginner": ["Python", "Scikit-learn", "Pandas", "NLTK", "Streamlit", "Flask", "Matplotlib"],
+        "medium": ["TensorFlow", "Keras", "OpenCV", "Hugging Face Transformers", "FastAPI", "PostgreSQL"],
+        "advanced": ["PyTorch", "ONNX Runtime", "Ray", "Kubernetes", "MLflow", "Vector Database"]
+    },
+    "cse": {
+        "beginner": ["HTML", "CSS", "JavaScript", "React", "Node.js", "SQLite", "Express"],
+        "medium": ["Django", "PostgreSQL", "Redis", "Docker", "REST API", "WebSockets"],
+        "advanced": ["Kubernetes", "Kafka", "gRPC", "Terraform", "Microservices", "Prometheus"]
+    },
+    "ece": {
+        "beginner": ["Arduino", "Sensors", "Embedded C", "Bluetooth", "Python", "LCD Display"],
+        "medium": ["ESP32", "MQTT", "Raspberry Pi", "Firebase", "Mobile App", "PCB Design"],
+        "advanced": ["RTOS", "FPGA", "ROS", "LoRaWAN", "Edge AI", "PID Control"]
+    }
+}
+
+TITLE_PREFIXES = {
+    "beginner": ["Smart", "Simple", "Interactive", "Student-Friendly"],
+    "medium": ["AI-Assisted", "Real-Time", "Cloud-Connected", "Data-Driven"],
+    "advanced": ["Scalable", "Autonomous", "Distributed", "Predictive"]
+}
+
+ESTIMATED_TIME = {
+    "beginner": ["2-3 weeks", "3-4 weeks"],
+    "medium": ["4-6 weeks", "6-8 weeks"],
+    "advanced": ["8-10 weeks", "10-12 weeks"]
+}
+
+DIFFICULTIES = ["beginner", "medium", "advanced"]
+
+_sih_problems = None
+
+def _load_sih_problems() -> List[Dict]:
+    """Read sih.csv once and keep it in memory."""
+    global _sih_problems
+    if _sih_problems is None:
+        from data_store import load_sih_problems
+        _sih_problems = load_sih_problems()
+    return _sih_problems
+
+def _seeded_random(*parts) -> random.Random:
+    """Return a Random seeded from the inputs, so output is repeatable."""
+    key = "|".join(str(p).lower() for p in parts)
+    seed = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:16], 16)
+    return random.Random(seed)
+
+def _course_category(course: str) -> str:
+    course_lower = course.lower()
+    if "ai" in course_lower or "artificial intelligence" in course_lower or "aiml" in course_lower:
+        return "ai"
+    if "ece" in course_lower or "electronics" in course_lower:
+        return "ece"
+    return "cse"
+
+def allowed_difficulties(academic_year: Optional[int], difficulty_level: Optional[str]) -> List[str]:
+    if difficulty_level and difficulty_level.lower() in DIFFICULTIES:
+        return [difficulty_level.lower()]
+    if academic_year == 1:
+        return ["beginner"]
+    if academic_year == 2:
+        return ["beginner", "medium"]
+    if academic_year in (3, 4):
+        return ["medium", "advanced"]
+    return list(DIFFICULTIES)
+
+def generate_project_ideas(
+    course: str,
+    academic_year: Optional[int] = None,
+    difficulty_level: Optional[str] = None,
+    project_type: Optional[str] = None,
+    num_projects: int = 5,
+    exclude_titles: Optional[List[str]] = None,
+    variant: int = 0
+) -> List[Dict]:
+    """Build project ideas by recombining bank projects with SIH themes, skipping excluded titles."""
+    from ai_brain import PROJECT_BANK
+
+    category = _course_category(course)
+    exclude_titles = exclude_titles or []
+    seed_parts = ["projects", course, academic_year, difficulty_level, project_type, num_projects]
+    if exclude_titles or variant:
+        # Vary the draw per "more ideas" round and per parallel shard
+        seed_parts += [len(exclude_titles), variant]
+    rng = _seeded_random(*seed_parts)
+    difficulties = allowed_difficulties(academic_year, difficulty_level)
+    themes = [p for p in _load_sih_problems() if p.get("problem_statement")]
+
+    projects = []
+    seen_titles = {title.lower() for title in exclude_titles}
+    attempts = 0
+    while len(projects) < num_projects and attempts < num_projects * 10:
+        attempts += 1
+        difficulty = difficulties[len(projects) % len(difficulties)]
+        bank = PROJECT_BANK[category].get(difficulty) or PROJECT_BANK["cse"][difficulty]
+        base = rng.choice(bank)
+
+        # Alternate between a SIH-themed idea and a variation of a bank project
+        if themes and rng.random() < 0.5:
+            theme = rng.choice(themes)
+            title = f"{rng.choice(TITLE_PREFIXES[difficulty])} {theme['problem_statement'].title()}"
+            theme_stack = list(theme.get("tech_stack") or [])
+            description = (
+                f"A {difficulty} level {theme.get('domain', 'software')} project that tackles "
+                f"{theme['problem_statement'].lower()}, inspired by Smart India Hackathon problem statements. "
+                f"It borrows its approach from the '{base['title']}' project and adapts it to {course} coursework."
+            )
+        else:
+            title = f"{rng.choice(TITLE_PREFIXES[difficulty])} {base['title']}"
+            theme_stack = []
+            description = f"{base['description']} This version is tailored for {course} students."
+
+        if title.lower() in seen_titles:
+            continue
+        seen_titles.add(title.lower())
+
+        vocabulary = TECH_VOCABULARY[category][difficulty]
+        tech_stack = []
+        for tech in theme_stack + base["tech_stack"] + rng.sample(vocabulary, 2):
+            if tech not in tech_stack:
+                tech_stack.append(tech)
+
+        projects.append({
+            "title": title,
+            "difficulty": difficulty.capitalize(),
+            "description": description,
+            "tech_stack": tech_stack[:7],
+            "hardware": base["hardware"],
+            "software": list(base["software"]),
+            "implementation_steps": list(base["implementation_steps"]),
+            "estimated_time": rng.choice(ESTIMATED_TIME[difficulty]),
+            "job_relevance": base["job_relevance"]
+        })
+
+    return projects
+
+def generate_project_detail(
+    project_title: str,
+    course: str,
+    difficulty: str = "Beginner",
+    description: str = "",
+    tech_stack: Optional[List[str]] = None
+) -> Dict:
+    """Fill the heavy project fields from the closest bank project."""
+    from ai_brain import PROJECT_BANK
+
+    category = _course_category(course)
+    level = difficulty.lower() if difficulty and difficulty.lower() in DIFFICULTIES else "beginner"
+    rng = _seeded_random("detail", project_title, course, level)
+    words = set(f"{project_title} {description}".lower().split())
+
+    bank = PROJECT_BANK[category].get(level) or PROJECT_BANK["cse"][level]
+    base = max(bank, key=lambda p: (len(words & set(p["title"].lower().split())), rng.random()))
+
+    return {
+        "hardware": base["hardware"],
+        "software": list(base["software"]),
+        "implementation_steps": list(base["implementation_steps"]),
+        "estimated_time": rng.choice(ESTIMATED_TIME[level]),
+        "job_relevance": base["job_relevance"]
+    }
+
+def generate_implementation_guidance(project_title: str, course: str, description: str = "") -> Dict:
+    """Build implementation guidance from the tech stack implied by the project text."""
+    category = _course_category(course)
+    rng = _seeded_random("guidance", project_title, course)
+    text = f"{project_title} {description}".lower()
+
+    tech_stack = [
+        tech for level in DIFFICULTIES for tech in TECH_VOCABULARY[category][level]
+        if tech.lower() in text
+    ]
+    if not tech_stack:
+        tech_stack = rng.sample(TECH_VOCABULARY[category]["beginner"], 3)
+    needs_hardware = category == "ece" or any(
+        kw in text for kw in ["iot", "sensor", "arduino", "raspberry", "drone", "hardware"]
+    )
+
+    return {
+        "hardware_setup": (
+            "Assemble the microcontroller, sensors and power supply on a breadboard, verify each "
+            "component with a test sketch, then move to a soldered or PCB build."
+            if needs_hardware else
+            "This is a software-only project. No hardware setup required beyond a development machine."
+        ),
+        "software_setup": f"Install {', '.join(tech_stack)}, create a virtual environment or project workspace, and set up Git for version control.",
+        "implementation_steps": [
+            f"Define the scope and success criteria for {project_title}",
+            "Collect requirements and sketch the system architecture",
+            f"Set up the development environment with {tech_stack[0]}",
+            "Build the core data model and storage layer",
+            "Implement the main feature end to end as a minimal prototype",
+            "Add the user interface and connect it to the core logic",
+            "Write tests for the critical paths and fix defects",
+            "Measure performance and optimise the slowest step",
+            "Document the project and prepare a demo"
+        ],
+        "best_practices": [
+            "Start with a small working prototype",
+            "Commit often with clear messages",
+            "Keep configuration out of the code",
+            "Test each component separately before integrating",
+            "Document decisions and setup steps as you go"
+        ],
+        "common_challenges": [
+            "Integration issues between components",
+            f"Learning curve of {tech_stack[-1]}",
+            "Getting or cleaning realistic data",
+            "Scope creep close to the deadline",
+            "Debugging intermittent failures"
+        ],
+        "resources": [f"Official {tech} documentation" for tech in tech_stack[:4]] + ["GitHub example projects"],
+        "testing_strategy": "Unit test core functions, integration test the main workflow, and run a final user test with classmates.",
+        "deployment_guide": (
+            "Flash the firmware, deploy the backend to a small cloud instance and connect the device over Wi-Fi."
+            if needs_hardware else
+            "Containerise the app and deploy it to a free tier host such as Render or Streamlit Cloud."
+        )
+    }
+
+def calculate_success_percentage(
+    course: str,
+    project_title: str,
+    difficulty: str,
+    description: str,
+    tech_stack: List[str]
+) -> Dict:
+    """Score a project with the heuristic predictor plus a small tech-stack adjustment."""
+    from predictor import predict_success
+
+    score = predict_success(course, project_title, difficulty, "None")
+    vocabulary = {tech.lower() for levels in TECH_VOCABULARY.values() for techs in levels.values() for tech in techs}
+    matched = [tech for tech in tech_stack if tech.lower() in vocabulary]
+    score = max(30.0, min(score + min(len(matched), 5), 95.0))
+
+    return {
+        "success_percentage": round(score, 2),
+        "reasoning": f"Heuristic score for a {difficulty} project with {len(matched)} well-supported technologies."
+    }
+
+def generate_local(task: str, params: Optional[Dict] = None) -> str:
+    """
+    Generate a JSON response for a task without calling any external service.
+    Output uses the same JSON shapes the LLM prompts ask for.
+    """
+    params = params or {}
+    if task == "projects":
+        result = generate_project_ideas(**params)
+    elif task == "project_summaries":
+        result = [
+            {key: project[key] for key in ("title", "difficulty", "description", "tech_stack")}
+            for project in generate_project_ideas(**params)
+        ]
+    elif task == "project_detail":
+        result = generate_project_detail(**params)
+    elif task == "guidance":
+        result = generate_implementation_guidance(**params)
+    elif task == "score":
+        result = calculate_success_percentage(**params)
+    else:
+        raise ValueError(f"Local provider does not support task: {task}")
+    return json.dumps(result)
@@ -0,0 +1,179 @@
+"""
+Per-task model profiles for LLM calls.
+Each task belongs to a tier (small, medium, large). A tier chooses the OpenAI
+model and timeout; each task sets its own output token limit and
+temperature. Short, structured tasks (scores, summaries) go to the small,
+fast model, guidance to the large one. Everything can be overridden from the
+environment:
+
+  MODEL_TIER_SMALL=gpt-4o-mini             model for a tier
+  MODEL_TIER_SMALL_TIMEOUT=20              seconds, for a tier
+  MODEL_PROFILE_GUIDANCE_TIER=medium       move a task to another tier
+  MODEL_PROFILE_GUIDANCE_MODEL=gpt-4.1     or give it a model of its own
+  MODEL_PROFILE_GUIDANCE_MAX_TOKENS=1500
+  MODEL_PROFILE_GUIDANCE_TEMPERATURE=0.4
+  MODEL_PROFILE_GUIDANCE_TIMEOUT=120
+
+Calls are timed and their tokens counted per tier and provider (a tier's
+task may be served by Hugging Face, the local generator or a pool fallback
+instead of its OpenAI model), so the cost and latency of each tier can be
+compared in /metrics.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from prompts import DETAIL_TOKENS, GUIDANCE_TOKENS, MAX_OUTPUT_TOKENS, SCORE_TOKENS
+
+TIERS = {
+    "small": {"model": os.getenv("MODEL_TIER_SMALL", "gpt-4o-mini"), "timeout": float(os.getenv("MODEL_TIER_SMALL_TIMEOUT", "20"))},
+    "medium": {"model": os.getenv("MODEL_TIER_MEDIUM", os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")), "timeout": float(os.getenv("MODEL_TIER_MEDIUM_TIMEOUT", "60"))},
+    "large": {"model": os.getenv("MODEL_TIER_LARGE", "gpt-4o"), "timeout": float(os.getenv("MODEL_TIER_LARGE_TIMEOUT", "90"))}
+}
+
+# Task -> (tier, max output tokens, temperature)
+TASK_DEFAULTS = {
+    "score": ("small", SCORE_TOKENS, 0.2),
+    "project_summaries": ("small", MAX_OUTPUT_TOKENS, 0.7),
+    "projects": ("medium", MAX_OUTPUT_TOKENS, 0.7),
+    "project_detail": ("medium", DETAIL_TOKENS, 0.5),
+    "guidance": ("large", GUIDANCE_TOKENS, 0.5),
+    "generic": ("medium", 2000, 0.7)
+}
+
+# Latencies kept per tier for percentiles
+LATENCY_WINDOW = 500
+
+def _build_profile(task: str) -> Dict:
+    tier, max_tokens, temperature = TASK_DEFAULTS[task]
+    prefix = f"MODEL_PROFILE_{task.upper()}_"
+    tier = os.getenv(prefix + "TIER", tier)
+    if tier not in TIERS:
+        raise ValueError(f"Unknown model tier for {task}: {tier}")
+    return {
+        "tier": tier,
+        "model": os.getenv(prefix + "MODEL", TIERS[tier]["model"]),
+        "max_tokens": int(os.getenv(prefix + "MAX_TOKENS", max_tokens)),
+        "temperature": float(os.getenv(prefix + "TEMPERATURE", temperature)),
+        "timeout": float(os.getenv(prefix + "TIMEOUT", TIERS[tier]["timeout"]))
+    }
+
+PROFILES = {task: _build_profile(task) for task in TASK_DEFAULTS}
+
+def profile_for(task: str) -> Dict:
+    """Model profile (tier, model, max_tokens, temperature, timeout) for a task."""
+    return PROFILES.get(task, PROFILES["generic"])
+
+class TierStats:
+    """Latency and token counts for the calls one provider served in one tier."""
+
+    def __init__(self):
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated_calls = 0
+        self.models = {}
+
+    def record(self, model: str, latency: float, usage: Optional[Dict]) -> None:
+        with self._lock:
+            if usage is None:
+                self.errors += 1
+                return
+            self.calls += 1
+            self._latencies.append(latency)
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+            self.estimated_calls += 0 if usage["reported"] else 1
+            self.models[model] = self.models.get(model, 0) + 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            calls = self.calls
+
+            def percentile(p: float) -> Optional[float]:
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))], 3) if latencies else None
+
+            return {
+                "calls": calls,
+                "errors": self.errors,
+                "p50_latency": percentile(50),
+                "p90_latency": percentile(90),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "avg_completion_tokens": round(self.completion_tokens / calls, 1) if calls else None,
+                # Calls whose provider did not report usage; their tokens are estimated from text length
+                "estimated_calls": self.estimated_calls,
+                "models": dict(self.models)
+            }
+
+_tier_stats: Dict[tuple, TierStats] = {}  # (tier, provider) -> stats
+_tier_stats_lock = threading.Lock()
+_current_usage = contextvars.ContextVar("model_usage", default=None)
+
+def report_usage(prompt_tokens: int, completion_tokens: int) -> None:
+    """Called by providers that know the tokens a call used (summed if a call is hedged)."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage["prompt_tokens"] += prompt_tokens
+        usage["completion_tokens"] += completion_tokens
+        usage["reported"] = True
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+def _stats_for(tier: str, provider: str) -> TierStats:
+    stats = _tier_stats.get((tier, provider))
+    if stats is None:
+        with _tier_stats_lock:
+            stats = _tier_stats.setdefault((tier, provider), TierStats())
+    return stats
+
+@contextmanager
+def metered_call(task: str, prompt: str, provider: str):
+    """
+    Time one call for a task to a provider and add it to the metrics of its
+    tier and provider. The caller stores the response text in the yielded
+    dict's "response" (used to estimate tokens when the provider did not
+    report usage), and in "provider" and "model" the provider and model that
+    served it if a pool chose another (failed calls count under provider).
+    """
+    profile = profile_for(task)
+    usage = {
+        "prompt_tokens": 0, "completion_tokens": 0, "reported": False, "response": "",
+        "provider": provider, "model": profile["model"]
+    }
+    token = _current_usage.set(usage)
+    started = time.perf_counter()
+    try:
+        yield usage
+    except Exception:
+        _stats_for(profile["tier"], provider).record(profile["model"], time.perf_counter() - started, None)
+        raise
+    else:
+        if not usage["reported"]:
+            usage["prompt_tokens"] = _estimate_tokens(prompt)
+            usage["completion_tokens"] = _estimate_tokens(usage["response"])
+        _stats_for(profile["tier"], usage["provider"]).record(usage["model"], time.perf_counter() - started, usage)
+    finally:
+        _current_usage.reset(token)
+
+def stats() -> Dict:
+    """Per tier: its tasks, configured model and call metrics per provider that served it."""
+    with _tier_stats_lock:
+        served = dict(_tier_stats)
+    return {
+        tier: {
+            "tasks": sorted(task for task, profile in PROFILES.items() if profile["tier"] == tier),
+            "model": TIERS[tier]["model"],
+            "providers": {provider: stats.stats() for (stats_tier, provider), stats in sorted(served.items()) if stats_tier == tier}
+        }
+        for tier in TIERS
+    }
@@ -1,4 +1,9 @@
-from typing import List
+import os
+from typing import Dict, List, Optional
+
+# How predict_success_ai scores projects: "ai" (LLM call), "model" (trained
+# success_model.npz) or "heuristic" (predict_success below)
+SUCCESS_SCORER = os.getenv("SUCCESS_SCORER", "ai")
 
 def predict_success(course: str, project_name: str, difficulty: str, hardware_required: str) -> float:
     """
@@ -77,15 +82,62 @@ def predict_success_ai(
     project_name: str,
     difficulty: str,
     description: str = "",
-    tech_stack: List[str] = None
+    tech_stack: List[str] = None,
+    scorer: Optional[str] = None
 ) -> float:
     """
     AI-powered success prediction.
-    Falls back to regular prediction if AI is not available.
+    scorer overrides SUCCESS_SCORER. The learned model falls back to the
+    heuristic when no weights file is present; the LLM falls back to the
+    heuristic if AI is not available.
     """
+    scorer = scorer or SUCCESS_SCORER
+    if scorer == "heuristic":
+        return predict_success(course, project_name, difficulty, "None")
+    if scorer == "model":
+        from success_model import get_success_model
+
+        model = get_success_model()
+        if model is None:
+            return predict_success(course, project_name, difficulty, "None")
+        return model.predict(course, project_name, difficulty, description, tech_stack or [])
+
     try:
         from ai_generator import ai_calculate_success_percentage
         return ai_calculate_success_percentage(course, project_name, difficulty, description, tech_stack or [])
     except Exception:
         # Fallback to regular prediction
         return predict_success(course, project_name, difficulty, "None")
+
+def predict_success_batch(course: str, projects: List[Dict], scorer: Optional[str] = None) -> List[float]:
+    """
+    Score several project dicts (title, difficulty, description, tech_stack).
+    With the learned model this is a single vectorized call.
+    """
+    scorer = scorer or SUCCESS_SCORER
+    if scorer == "model":
+        from success_model import get_success_model
+
+        model = get_success_model()
+        if model is not None:
+            return model.predict_batch([
+                {
+                    "course": course,
+                    "title": project.get("title", ""),
+                    "difficulty": project.get("difficulty", ""),
+                    "description": project.get("description", ""),
+                    "tech_stack": project.get("tech_stack") or []
+                }
+                for project in projects
+            ])
+    return [
+        predict_success_ai(
+            course=course,
+            project_name=project.get("title", ""),
+            difficulty=project.get("difficulty", ""),
+            description=project.get("description", ""),
+            tech_stack=project.get("tech_stack") or [],
+            scorer=scorer
+        )
+        for project in projects
+    ]
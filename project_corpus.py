@@ -0,0 +1,187 @@
+"""
+Persistent corpus of generated project ideas.
+Every validated project the LLM produces is stored in SQLite, indexed by
+canonical course, difficulty and project type, and deduplicated by a title
+fingerprint. get_project_ideas samples stored ideas first and only asks the
+LLM for the remainder, so LLM spend grows with novel ideas rather than with
+requests. Projects are stored compressed (see compression.py) and only
+decompressed when served.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from compression import Compressor
+
+PROJECT_CORPUS_ENABLED = os.getenv("PROJECT_CORPUS_ENABLED", "true").lower() == "true"
+PROJECT_CORPUS_PATH = os.getenv("PROJECT_CORPUS_PATH", "project_corpus.sqlite3")
+# Share of each response that is always newly generated (0 = serve fully from the corpus when possible)
+CORPUS_FRESH_RATIO = float(os.getenv("CORPUS_FRESH_RATIO", "0"))
+# Stored ideas older than this are no longer served
+CORPUS_MAX_AGE_DAYS = float(os.getenv("CORPUS_MAX_AGE_DAYS", "30"))
+
+# Words that do not distinguish one project title from another
+_TITLE_STOPWORDS = {
+    "a", "an", "and", "the", "of", "for", "with", "using", "based", "to", "in", "on", "by",
+    "system", "app", "application", "platform", "project", "tool"
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    course TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    project_type TEXT NOT NULL,
+    detail_level TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created REAL NOT NULL,
+    served INTEGER NOT NULL DEFAULT 0,
+    last_served REAL,
+    PRIMARY KEY (course, fingerprint)
+);
+-- projects_lookup also covered served, which sampling no longer orders by
+DROP INDEX IF EXISTS projects_lookup;
+CREATE INDEX IF NOT EXISTS projects_filter ON projects (course, difficulty, project_type);
+CREATE INDEX IF NOT EXISTS projects_created ON projects (created);
+"""
+
+def title_fingerprint(title: str) -> str:
+    """
+    Order- and filler-insensitive hash of a title, so "Smart Attendance System
+    using Face Recognition" and "Face Recognition Smart Attendance" collide.
+    """
+    words = {word for word in re.findall(r"[a-z0-9]+", title.lower()) if word not in _TITLE_STOPWORDS}
+    return hashlib.sha1(" ".join(sorted(words)).encode("utf-8")).hexdigest()[:16]
+
+def normalize_project_type(project_type: Optional[str]) -> str:
+    return (project_type or "both").strip().lower() or "both"
+
+class ProjectCorpus:
+    """SQLite-backed store of generated projects, safe across threads and processes."""
+
+    def __init__(self, path: str = PROJECT_CORPUS_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+        self.compressor = Compressor(self._connect)
+        self.compressor.prune("projects", "data")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, course: str, project_type: Optional[str], projects: Iterable[Dict]) -> int:
+        """
+        Store projects under a canonical course. A duplicate title is skipped,
+        unless the stored copy is a summary and the new one is full.
+        Returns the number of rows inserted or upgraded.
+        """
+        now = time.time()
+        rows = []
+        for project in projects:
+            title = (project.get("title") or "").strip()
+            if not title or title == "Untitled Project":
+                continue
+            stored = {key: value for key, value in project.items() if key != "id"}
+            rows.append((
+                course, title_fingerprint(title), project.get("difficulty", "").lower(),
+                normalize_project_type(project_type), project.get("detail_level", "full"),
+                self.compressor.encode_project(stored), now
+            ))
+        if not rows:
+            return 0
+        conn = self._connect()
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT INTO projects (course, fingerprint, difficulty, project_type, detail_level, data, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(course, fingerprint) DO UPDATE SET detail_level = excluded.detail_level, data = excluded.data "
+            "WHERE projects.detail_level = 'summary' AND excluded.detail_level = 'full'",
+            rows
+        )
+        return conn.total_changes - before
+
+    def sample(
+        self,
+        course: str,
+        difficulties: List[str],
+        project_type: Optional[str],
+        limit: int,
+        detail: str = "full",
+        exclude: Iterable[str] = ()
+    ) -> List[Dict]:
+        """
+        Pick up to limit fresh stored projects at random from those the user
+        has not seen: exclude holds the fingerprints of the titles already
+        shown to them. A "both" request may use ideas of any type; full
+        requests only use fully detailed ideas. Picked rows are marked as served.
+        """
+        if limit <= 0:
+            return []
+        project_type = normalize_project_type(project_type)
+        query = (
+            f"SELECT fingerprint, data FROM projects WHERE course = ? AND created > ? "
+            f"AND difficulty IN ({','.join('?' * len(difficulties))})"
+        )
+        args = [course, time.time() - CORPUS_MAX_AGE_DAYS * 86400] + list(difficulties)
+        if project_type != "both":
+            query += " AND project_type = ?"
+            args.append(project_type)
+        if detail == "full":
+            query += " AND detail_level = 'full'"
+        exclude = list(exclude)
+        if exclude:
+            query += f" AND fingerprint NOT IN ({','.join('?' * len(exclude))})"
+            args += exclude
+        query += " ORDER BY RANDOM() LIMIT ?"
+        args.append(limit)
+
+        conn = self._connect()
+        rows = conn.execute(query, args).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE projects SET served = served + 1, last_served = ? WHERE course = ? AND fingerprint = ?",
+                [(time.time(), course, fingerprint) for fingerprint, _ in rows]
+            )
+        return [self.compressor.decode_project(data) for _, data in rows]
+
+    def iter_projects(self, since: float = 0.0) -> Iterator[Tuple[float, Dict]]:
+        """Yield (created, project) for projects stored after since, oldest first."""
+        rows = self._connect().execute(
+            "SELECT created, data FROM projects WHERE created > ? ORDER BY created", (since,)
+        )
+        for created, data in rows:
+            yield created, self.compressor.decode_project(data)
+
+    def stats(self) -> Dict:
+        conn = self._connect()
+        total, served = conn.execute("SELECT COUNT(*), COALESCE(SUM(served), 0) FROM projects").fetchone()
+        courses = conn.execute("SELECT COUNT(DISTINCT course) FROM projects").fetchone()[0]
+        return {"path": self.path, "projects": total, "courses": courses, "times_served": served}
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+def get_project_corpus() -> Optional[ProjectCorpus]:
+    """Return the process-wide corpus, or None when disabled or unavailable."""
+    global _corpus, PROJECT_CORPUS_ENABLED
+    if not PROJECT_CORPUS_ENABLED:
+        return None
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                try:
+                    _corpus = ProjectCorpus()
+                except sqlite3.Error:
+                    PROJECT_CORPUS_ENABLED = False
+                    return None
+    return _corpus
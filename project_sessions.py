@@ -0,0 +1,49 @@
+"""
+"More ideas" sessions for /projects.
+A session remembers the request parameters and the titles already served,
+so a follow-up call can ask only for new ideas. State lives in its own
+shared state table (see shared_state.py), so any worker can continue a
+session, and falls back to an in-process cache when that is unavailable. Sessions expire after
+PROJECT_SESSION_TTL seconds without use.
+"""
+import json
+import os
+import secrets
+from typing import Dict, List, Optional
+
+from cache import TTLCache
+from shared_state import get_shared_state
+
+PROJECT_SESSION_TTL = float(os.getenv("PROJECT_SESSION_TTL", "3600"))
+# Most recent titles remembered per session; older ones may be suggested again
+PROJECT_SESSION_MAX_TITLES = int(os.getenv("PROJECT_SESSION_MAX_TITLES", "200"))
+
+PROJECT_SESSION_SHARED_SIZE = int(os.getenv("PROJECT_SESSION_SHARED_SIZE", "100000"))
+
+_local_sessions = TTLCache(maxsize=int(os.getenv("PROJECT_SESSION_SIZE", "10000")), ttl=PROJECT_SESSION_TTL)
+
+def _save(token: str, state: Dict) -> None:
+    shared = get_shared_state("sessions", PROJECT_SESSION_SHARED_SIZE)
+    if shared is not None:
+        shared.set(token, json.dumps(state), PROJECT_SESSION_TTL)
+    else:
+        _local_sessions.set(token, state)
+
+def start_session(params: Dict, projects: List[Dict]) -> str:
+    """Create a session for a /projects request and return its token."""
+    token = secrets.token_urlsafe(16)
+    _save(token, {"params": params, "titles": [project["title"] for project in projects][-PROJECT_SESSION_MAX_TITLES:]})
+    return token
+
+def load_session(token: str) -> Optional[Dict]:
+    """Session state ({"params", "titles"}), or None if unknown or expired."""
+    shared = get_shared_state("sessions", PROJECT_SESSION_SHARED_SIZE)
+    if shared is None:
+        return _local_sessions.get(token)
+    value = shared.get(token)
+    return json.loads(value) if value is not None else None
+
+def record_served(token: str, state: Dict, projects: List[Dict]) -> None:
+    """Add newly served titles to a session and extend its lifetime."""
+    titles = state["titles"] + [project["title"] for project in projects]
+    _save(token, dict(state, titles=titles[-PROJECT_SESSION_MAX_TITLES:]))
@@ -0,0 +1,220 @@
+"""
+Prompt templates, JSON schemas and token budgets for each AI task.
+Static instructions live in the system prompt so providers can cache the
+prompt prefix; only the short user message changes between requests.
+"""
+from typing import Dict, Optional, Sequence
+
+# Bump whenever a system prompt or schema changes (used for cache keys)
+PROMPT_VERSION = "3"
+
+PROJECT_KEYS = [
+    "title", "difficulty", "description", "tech_stack", "hardware",
+    "software", "implementation_steps", "estimated_time", "job_relevance"
+]
+
+# Fields returned in "summary" mode; the rest are generated on demand
+SUMMARY_KEYS = ["title", "difficulty", "description", "tech_stack"]
+DETAIL_KEYS = [key for key in PROJECT_KEYS if key not in SUMMARY_KEYS]
+
+GUIDANCE_KEYS = [
+    "hardware_setup", "software_setup", "implementation_steps", "best_practices",
+    "common_challenges", "resources", "testing_strategy", "deployment_guide"
+]
+
+def _object_schema(properties: Dict) -> Dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+PROJECT_SCHEMA = _object_schema({
+    "projects": {
+        "type": "array",
+        "items": _object_schema({
+            "title": _STRING,
+            "difficulty": {"type": "string", "enum": ["Beginner", "Medium", "Advanced"]},
+            "description": _STRING,
+            "tech_stack": _STRING_LIST,
+            "hardware": _STRING,
+            "software": _STRING_LIST,
+            "implementation_steps": _STRING_LIST,
+            "estimated_time": _STRING,
+            "job_relevance": _STRING
+        })
+    }
+})
+
+SUMMARY_SCHEMA = _object_schema({
+    "projects": {
+        "type": "array",
+        "items": _object_schema({
+            "title": _STRING,
+            "difficulty": {"type": "string", "enum": ["Beginner", "Medium", "Advanced"]},
+            "description": _STRING,
+            "tech_stack": _STRING_LIST
+        })
+    }
+})
+
+DETAIL_SCHEMA = _object_schema({
+    "hardware": _STRING,
+    "software": _STRING_LIST,
+    "implementation_steps": _STRING_LIST,
+    "estimated_time": _STRING,
+    "job_relevance": _STRING
+})
+
+GUIDANCE_SCHEMA = _object_schema({
+    "hardware_setup": _STRING,
+    "software_setup": _STRING,
+    "implementation_steps": _STRING_LIST,
+    "best_practices": _STRING_LIST,
+    "common_challenges": _STRING_LIST,
+    "resources": _STRING_LIST,
+    "testing_strategy": _STRING,
+    "deployment_guide": _STRING
+})
+
+SCORE_SCHEMA = _object_schema({
+    "success_percentage": {"type": "number"},
+    "reasoning": _STRING
+})
+
+PROJECTS_SYSTEM_PROMPT = """You are an expert project advisor for students. Generate unique, practical, implementable project ideas suitable for hackathons and academic submissions.
+Reply with ONLY a JSON object {"projects": [...]}. Each project has exactly these keys:
+title: catchy title
+difficulty: "Beginner", "Medium" or "Advanced"
+description: 2-3 sentences
+tech_stack: array of 5-7 technologies
+hardware: hardware requirements, or "None" if software-only
+software: array of 3-5 tools/IDEs
+implementation_steps: array of 6-8 short steps
+estimated_time: e.g. "3-4 weeks"
+job_relevance: 1 sentence on job preparation value"""
+
+SUMMARIES_SYSTEM_PROMPT = """You are an expert project advisor for students. Generate unique, practical, implementable project ideas suitable for hackathons and academic submissions.
+Reply with ONLY a JSON object {"projects": [...]}. Each project has exactly these keys:
+title: catchy title
+difficulty: "Beginner", "Medium" or "Advanced"
+description: 2-3 sentences
+tech_stack: array of 5-7 technologies"""
+
+DETAIL_SYSTEM_PROMPT = """You are an expert project advisor for students. Fill in the practical details for the given project idea.
+Reply with ONLY a JSON object with exactly these keys:
+hardware: hardware requirements, or "None" if software-only
+software: array of 3-5 tools/IDEs
+implementation_steps: array of 6-8 short steps
+estimated_time: e.g. "3-4 weeks"
+job_relevance: 1 sentence on job preparation value"""
+
+GUIDANCE_SYSTEM_PROMPT = """You are an expert project advisor for students. Write implementation guidance for the given project.
+Reply with ONLY a JSON object with exactly these keys:
+hardware_setup: hardware setup steps, or state that it is software-only
+software_setup: installation and environment setup
+implementation_steps: array of 8-10 steps
+best_practices: array of 5-7 items
+common_challenges: array of 5-7 items
+resources: array of 3-5 tutorials or docs
+testing_strategy: how to test it
+deployment_guide: how to deploy it"""
+
+SCORE_SYSTEM_PROMPT = """You are an expert project advisor for students. Rate the project's success chance from 0 to 100, considering difficulty fit for the course, feasibility, tech stack relevance and learning curve, job market demand, implementation complexity, and hackathon/portfolio appeal.
+Reply with ONLY a JSON object: {"success_percentage": <number>, "reasoning": "<one sentence>"}"""
+
+SYSTEM_PROMPTS = {
+    "projects": PROJECTS_SYSTEM_PROMPT,
+    "project_summaries": SUMMARIES_SYSTEM_PROMPT,
+    "project_detail": DETAIL_SYSTEM_PROMPT,
+    "guidance": GUIDANCE_SYSTEM_PROMPT,
+    "score": SCORE_SYSTEM_PROMPT
+}
+
+SCHEMAS = {
+    "projects": ("projects", PROJECT_SCHEMA),
+    "project_summaries": ("project_summaries", SUMMARY_SCHEMA),
+    "project_detail": ("project_detail", DETAIL_SCHEMA),
+    "guidance": ("guidance", GUIDANCE_SCHEMA),
+    "score": ("score", SCORE_SCHEMA)
+}
+
+DEFAULT_SYSTEM_PROMPT = "You are an expert project advisor for students. Generate detailed, practical project ideas with complete information."
+
+# Output token budgets, measured from typical responses plus headroom
+TOKENS_PER_PROJECT = 280
+TOKENS_PER_SUMMARY = 100
+DETAIL_TOKENS = 220
+PROJECTS_BASE_TOKENS = 40
+GUIDANCE_TOKENS = 1000
+SCORE_TOKENS = 80
+MAX_OUTPUT_TOKENS = 4000
+
+# Most recent already-served titles listed in a "more ideas" prompt
+PROMPT_EXCLUDE_TITLES = 30
+
+def system_prompt_for(task: str) -> str:
+    return SYSTEM_PROMPTS.get(task, DEFAULT_SYSTEM_PROMPT)
+
+def schema_for(task: str) -> Optional[tuple]:
+    """Return (name, JSON schema) for tasks with structured output, else None."""
+    return SCHEMAS.get(task)
+
+def projects_token_budget(num_projects: int, detail: str = "full") -> int:
+    per_project = TOKENS_PER_SUMMARY if detail == "summary" else TOKENS_PER_PROJECT
+    return min(PROJECTS_BASE_TOKENS + per_project * max(num_projects, 1), MAX_OUTPUT_TOKENS)
+
+def build_projects_prompt(
+    course: str,
+    academic_year: Optional[int] = None,
+    difficulty_level: Optional[str] = None,
+    project_type: Optional[str] = None,
+    num_projects: int = 5,
+    exclude_titles: Sequence[str] = (),
+    variant: int = 0
+) -> str:
+    difficulty_text = difficulty_level if difficulty_level and difficulty_level != "All" else "Beginner, Medium, and Advanced"
+    year_text = f"year {academic_year}" if academic_year else "any"
+    type_text = project_type if project_type else "both hackathon and academic"
+    prompt = (
+        f"Course: {course}\n"
+        f"Academic year: {year_text}\n"
+        f"Difficulty levels: {difficulty_text}\n"
+        f"Project type: {type_text}\n"
+        f"Number of projects: {num_projects}"
+    )
+    if variant:
+        # Parallel shards for the same level ask for distinct sets of ideas
+        prompt += f"\nIdea set: {variant + 1} (choose different themes from other sets)"
+    if exclude_titles:
+        prompt += "\nAlready suggested (give different ideas): " + "; ".join(exclude_titles[-PROMPT_EXCLUDE_TITLES:])
+    return prompt
+
+def build_detail_prompt(project_title: str, course: str, difficulty: str, description: str, tech_stack) -> str:
+    return (
+        f"Project: {project_title}\n"
+        f"Course: {course}\n"
+        f"Difficulty: {difficulty}\n"
+        f"Description: {description}\n"
+        f"Tech stack: {', '.join(tech_stack)}"
+    )
+
+def build_guidance_prompt(project_title: str, course: str, description: str = "") -> str:
+    return (
+        f"Project: {project_title}\n"
+        f"Course: {course}\n"
+        f"Description: {description if description else 'Not provided'}"
+    )
+
+def build_score_prompt(course: str, project_title: str, difficulty: str, description: str, tech_stack) -> str:
+    return (
+        f"Course: {course}\n"
+        f"Project: {project_title}\n"
+        f"Difficulty: {difficulty}\n"
+        f"Description: {description}\n"
+        f"Tech stack: {', '.join(tech_stack)}"
+    )
@@ -0,0 +1,212 @@
+"""
+Provider pool with health-scored routing and hedged requests.
+Each provider keeps a rolling window of latencies and errors. Calls go to the
+fastest healthy provider; latency-sensitive calls can be hedged with a second
+provider once the first is slower than its usual percentile latency. Each
+hedged attempt runs in its own cancel scope, and the losing attempt's scope is
+cancelled once the other answers; providers that cannot be interrupted finish
+in the background and their result is discarded.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cancellation import CancelScope, cancel_scope, current_scope, submit_in_context
+
+class ProviderUnavailable(Exception):
+    """Raised by a provider that cannot serve right now (e.g. model still loading)."""
+
+class ProviderHealth:
+    """Rolling latency and error statistics for one provider."""
+
+    def __init__(self, window: int = 50, cooldown: float = 30.0):
+        self._samples = deque(maxlen=window)  # (latency seconds, ok)
+        self._lock = threading.Lock()
+        self.cooldown = cooldown
+        self.unhealthy_until = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.append((latency, ok))
+            recent = list(self._samples)[-5:]
+            # Trip a cooldown after 5 consecutive failures
+            if len(recent) == 5 and not any(sample_ok for _, sample_ok in recent):
+                self.unhealthy_until = time.monotonic() + self.cooldown
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def latency_percentile(self, percentile: float, default: float = 1.0) -> float:
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return default
+        index = min(len(latencies) - 1, int(round(percentile / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def score(self) -> float:
+        """Lower is better: median latency inflated by the error rate."""
+        return self.latency_percentile(50) * (1 + 4 * self.error_rate)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            samples = len(self._samples)
+        return {
+            "samples": samples,
+            "healthy": self.healthy,
+            "error_rate": round(self.error_rate, 3),
+            "p50_latency": round(self.latency_percentile(50), 3),
+            "p90_latency": round(self.latency_percentile(90), 3),
+            "score": round(self.score(), 3)
+        }
+
+class ProviderPool:
+    """
+    Route calls across providers by health score.
+    providers maps a name to a callable(prompt, task, params, max_tokens) -> str.
+    fallback providers are only used when every primary provider fails, or as
+    the hedge target when there is a single primary. interruptible names the
+    providers that stop when their cancel scope is cancelled (e.g. streaming
+    calls); a losing hedge attempt on any other provider runs to completion.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, Callable],
+        fallback: Optional[Dict[str, Callable]] = None,
+        hedge_percentile: float = 90,
+        min_hedge_delay: float = 0.05,
+        max_hedge_delay: float = 10.0,
+        max_workers: int = 16,
+        interruptible: Iterable[str] = ()
+    ):
+        self.providers = dict(providers)
+        self.fallback = dict(fallback or {})
+        self.interruptible = set(interruptible)
+        self.health = {name: ProviderHealth() for name in list(self.providers) + list(self.fallback)}
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider")
+        # Hedges fired, and losing attempts stopped or left to finish with their result discarded
+        self._hedge_stats = {"hedged": 0, "losers_cancelled": 0, "losers_discarded": 0}
+        self._stats_lock = threading.Lock()
+
+    def ranked(self) -> List[str]:
+        """Primary providers by score (healthy first), then fallbacks."""
+        primary = sorted(self.providers, key=lambda name: (not self.health[name].healthy, self.health[name].score()))
+        return primary + list(self.fallback)
+
+    def _invoke(self, name: str, prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> str:
+        func = self.providers.get(name) or self.fallback[name]
+        start = time.monotonic()
+        try:
+            result = func(prompt, task, params, max_tokens)
+        except Exception:
+            self.health[name].record(time.monotonic() - start, ok=False)
+            raise
+        self.health[name].record(time.monotonic() - start, ok=True)
+        return result
+
+    def _attempt(self, scope: CancelScope, name: str, prompt: str, task: str, params: Optional[Dict], max_tokens: int) -> str:
+        """One hedged attempt, run under its own scope so it can be stopped on its own."""
+        with cancel_scope(scope):
+            return self._invoke(name, prompt, task, params, max_tokens)
+
+    def call(
+        self,
+        prompt: str,
+        task: str = "generic",
+        params: Optional[Dict] = None,
+        max_tokens: int = 2000,
+        hedge: bool = False
+    ) -> str:
+        """Call the best provider, failing over in rank order. hedge=True races a backup."""
+        return self.call_with_provider(prompt, task, params, max_tokens, hedge)[1]
+
+    def call_with_provider(
+        self,
+        prompt: str,
+        task: str = "generic",
+        params: Optional[Dict] = None,
+        max_tokens: int = 2000,
+        hedge: bool = False
+    ) -> Tuple[str, str]:
+        """Like call, but returns (provider name, result)."""
+        order = self.ranked()
+        errors = []
+        while order:
+            if hedge and len(order) > 1:
+                name, result, error, order = self._hedged(order, prompt, task, params, max_tokens)
+            else:
+                name, order = order[0], order[1:]
+                try:
+                    result, error = self._invoke(name, prompt, task, params, max_tokens), None
+                except Exception as e:
+                    result, error = None, e
+            if error is None:
+                return name, result
+            errors.append(f"{name}: {error}")
+        raise Exception("All AI providers failed. " + "; ".join(errors))
+
+    def _hedged(self, order: List[str], prompt: str, task: str, params: Optional[Dict], max_tokens: int):
+        """
+        Start the first provider; if it has not answered within its percentile
+        latency, start the second and take whichever succeeds first.
+        Returns (name, result, error, remaining providers).
+        """
+        primary, backup, rest = order[0], order[1], order[2:]
+        delay = self.health[primary].latency_percentile(self.hedge_percentile, default=self.max_hedge_delay)
+        delay = max(self.min_hedge_delay, min(delay, self.max_hedge_delay))
+
+        # Each attempt gets a child of the caller's scope: cancelling the request
+        # stops both, cancelling one attempt leaves the other running
+        parent = current_scope()
+        futures, scopes = {}, {}
+
+        def start(name: str) -> None:
+            scope = CancelScope(parent)
+            future = submit_in_context(self._executor, self._attempt, scope, name, prompt, task, params, max_tokens)
+            futures[future], scopes[future] = name, scope
+
+        start(primary)
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            start(backup)
+            with self._stats_lock:
+                self._hedge_stats["hedged"] += 1
+
+        pending = set(futures)
+        last_error, last_name = None, primary
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error, last_name = e, futures[future]
+                    continue
+                for loser in pending:
+                    scopes[loser].cancel()
+                    stopped = loser.cancel() or futures[loser] in self.interruptible
+                    with self._stats_lock:
+                        self._hedge_stats["losers_cancelled" if stopped else "losers_discarded"] += 1
+                return futures[future], result, None, []
+        # Both failed (or the primary failed before the hedge fired)
+        remaining = rest if backup in futures.values() else [backup] + rest
+        return last_name, None, last_error, remaining
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            hedges = dict(self._hedge_stats)
+        return {"providers": {name: health.stats() for name, health in self.health.items()}, "hedges": hedges}
@@ -0,0 +1,217 @@
+"""
+Shared, content-addressed cache for LLM responses.
+Backed by SQLite in WAL mode so every uvicorn worker and the Streamlit app on
+the same machine share one cache. Entries are keyed by a hash of
+(provider, model, prompt template version, task, normalized prompt), expire
+per task TTL, and the least recently used entries are evicted once the store
+grows past its size limit. Values are stored dictionary-compressed (see
+compression.py); sizes and the limit refer to the stored bytes. Lookups are
+counted in memory and the hit/miss counters written in batches, so reads do
+not take the write lock.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from compression import Compressor
+
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true"
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "llm_cache.sqlite3")
+SHARED_CACHE_MAX_BYTES = int(os.getenv("SHARED_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Default time-to-live per task, in seconds (override with SHARED_CACHE_TTL_<TASK>)
+DEFAULT_TTLS = {
+    "projects": 6 * 3600,
+    "project_summaries": 6 * 3600,
+    "project_detail": 7 * 24 * 3600,
+    "guidance": 7 * 24 * 3600,
+    "score": 7 * 24 * 3600
+}
+FALLBACK_TTL = 24 * 3600
+
+# Check the size limit every N writes rather than on every write
+EVICTION_CHECK_INTERVAL = 50
+# Only refresh last_access when it is older than this, to keep reads write-free
+ACCESS_UPDATE_INTERVAL = 60
+# Write the hit/miss counters after this many lookups or seconds, whichever comes first
+STATS_FLUSH_LOOKUPS = 200
+STATS_FLUSH_SECONDS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+CREATE TABLE IF NOT EXISTS stats (
+    kind TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def ttl_for(kind: str) -> float:
+    return float(os.getenv(f"SHARED_CACHE_TTL_{kind.upper()}", DEFAULT_TTLS.get(kind, FALLBACK_TTL)))
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt."""
+    return " ".join(prompt.split()).casefold()
+
+def make_key(provider: str, model: str, prompt_version: str, kind: str, prompt: str) -> str:
+    payload = json.dumps([provider, model, prompt_version, kind, normalize_prompt(prompt)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SharedCache:
+    """SQLite-backed cache safe to use from many threads and processes."""
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, max_bytes: int = SHARED_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._pending = {}  # kind -> [hits, misses] not yet written
+        self._pending_lookups = 0
+        self._flushed = time.monotonic()
+        self._stats_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self.compressor = Compressor(self._connect)
+        self.compressor.prune("entries", "value")
+        atexit.register(self.flush_stats)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, kind: str) -> Optional[str]:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, last_access FROM entries WHERE key = ? AND expires > ?", (key, now)
+        ).fetchone()
+        self._count(kind, row is not None)
+        if row is None:
+            return None
+        value, last_access = row
+        if now - last_access > ACCESS_UPDATE_INTERVAL:
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        return self.compressor.decode(value)
+
+    def _count(self, kind: str, hit: bool) -> None:
+        with self._stats_lock:
+            counts = self._pending.setdefault(kind, [0, 0])
+            counts[0 if hit else 1] += 1
+            self._pending_lookups += 1
+            due = self._pending_lookups >= STATS_FLUSH_LOOKUPS or time.monotonic() - self._flushed >= STATS_FLUSH_SECONDS
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self) -> None:
+        """Add the lookups counted in memory to the shared hit/miss counters."""
+        with self._stats_lock:
+            pending, self._pending = self._pending, {}
+            self._pending_lookups = 0
+            self._flushed = time.monotonic()
+        if not pending:
+            return
+        try:
+            self._connect().executemany(
+                "INSERT INTO stats (kind, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT(kind) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(kind, hits, misses) for kind, (hits, misses) in pending.items()]
+            )
+        except sqlite3.Error:
+            pass  # counters are best-effort; a busy store must not fail lookups
+
+    def set(self, key: str, kind: str, value: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = ttl_for(kind) if ttl is None else ttl
+        value = self.compressor.encode(value)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, kind, value, size, created, expires, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, kind, value, len(value), now, now + ttl, now)
+        )
+        with self._writes_lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under 90% of max_bytes."""
+        conn = self._connect()
+        removed = conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            target = total - int(self.max_bytes * 0.9)
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+            doomed = []
+            for key, size in rows:
+                if target <= 0:
+                    break
+                doomed.append((key,))
+                target -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+            removed += len(doomed)
+        return removed
+
+    def stats(self) -> Dict:
+        self.flush_stats()
+        conn = self._connect()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        kinds = {}
+        for kind, hits, misses in conn.execute("SELECT kind, hits, misses FROM stats ORDER BY kind"):
+            lookups = hits + misses
+            kinds[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+            }
+        return {"path": self.path, "entries": entries, "bytes": size, "max_bytes": self.max_bytes, "kinds": kinds}
+
+    def clear(self) -> None:
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        with self._stats_lock:
+            self._pending, self._pending_lookups = {}, 0
+        conn.execute("DELETE FROM stats")
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Return the process-wide cache, or None when disabled or unavailable."""
+    global _shared_cache, SHARED_CACHE_ENABLED
+    if not SHARED_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                try:
+                    _shared_cache = SharedCache()
+                except sqlite3.Error:
+                    # Read-only filesystem or similar: run without the shared tier
+                    SHARED_CACHE_ENABLED = False
+                    return None
+    return _shared_cache
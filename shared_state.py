@@ -0,0 +1,109 @@
+"""
+Expiring key/value state shared by every worker.
+Short-lived state that a follow-up request may need on another worker (the
+registry of served projects, "more ideas" sessions) is kept in its own
+SQLite WAL file, one table per kind of state, apart from the LLM response
+cache. Each table holds at most max_entries rows; expired rows and then the
+ones closest to expiring are dropped as it fills. Values are compressed with
+the built-in dictionary (see compression.py).
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from compression import Compressor
+
+SHARED_STATE_ENABLED = os.getenv("SHARED_STATE_ENABLED", "true").lower() == "true"
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "shared_state.sqlite3")
+
+# Check a table's size every N writes rather than on every write
+EVICTION_CHECK_INTERVAL = 100
+
+class SharedState:
+    """One expiring key/value table, safe to use from many threads and processes."""
+
+    def __init__(self, table: str, max_entries: int, path: str = SHARED_STATE_PATH):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid shared state table: {table}")
+        self.table = table
+        self.max_entries = max_entries
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._connect().executescript(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL);"
+            f"CREATE INDEX IF NOT EXISTS {table}_expires ON {table} (expires);"
+        )
+        self.compressor = Compressor()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            f"SELECT value FROM {self.table} WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return self.compressor.decode(row[0]) if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.set_many([(key, value)], ttl)
+
+    def set_many(self, items: Iterable[Tuple[str, str]], ttl: float) -> None:
+        """Store several values in one write."""
+        expires = time.time() + ttl
+        rows = [(key, self.compressor.encode(value), expires) for key, value in items]
+        if not rows:
+            return
+        self._connect().executemany(f"INSERT OR REPLACE INTO {self.table} (key, value, expires) VALUES (?, ?, ?)", rows)
+        with self._writes_lock:
+            before, self._writes = self._writes, self._writes + len(rows)
+            check = before // EVICTION_CHECK_INTERVAL != self._writes // EVICTION_CHECK_INTERVAL
+        if check:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def evict(self) -> int:
+        """Drop expired rows, then the ones closest to expiring until at most max_entries remain."""
+        conn = self._connect()
+        removed = conn.execute(f"DELETE FROM {self.table} WHERE expires <= ?", (time.time(),)).rowcount
+        removed += conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        return removed
+
+    def __len__(self) -> int:
+        return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+_states: Dict[str, SharedState] = {}
+_states_lock = threading.Lock()
+
+def get_shared_state(table: str, max_entries: int) -> Optional[SharedState]:
+    """Return the process-wide store for a table, or None when disabled or unavailable."""
+    global SHARED_STATE_ENABLED
+    if not SHARED_STATE_ENABLED:
+        return None
+    state = _states.get(table)
+    if state is None:
+        with _states_lock:
+            state = _states.get(table)
+            if state is None:
+                try:
+                    state = _states[table] = SharedState(table, max_entries)
+                except sqlite3.Error:
+                    # Read-only filesystem or similar: callers keep state in-process
+                    SHARED_STATE_ENABLED = False
+                    return None
+    return state
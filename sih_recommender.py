@@ -0,0 +1,216 @@
+"""
+SIH problem recommendations.
+Each problem's statement, domain and tech stack are turned into a sparse,
+L2-normalized TF-IDF vector when sih.csv is loaded. The index is stored by
+term (posting lists in flat NumPy arrays), so a query only touches the
+problems that share a term with it. A student's course and skills become a
+query vector, and problems are ranked by cosine similarity. The index is
+rebuilt only when sih.csv changes on disk.
+"""
+import math
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import data_store
+
+# Skills implied by a course, keyed by tokens of the canonical course name
+COURSE_SKILLS = {
+    "cse": ["Web Development", "Python", "Java", "Database", "REST API", "Cloud", "Machine Learning"],
+    "it": ["Web Development", "Database", "Cloud", "REST API", "Security", "Mobile App"],
+    "ai": ["Python", "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow"],
+    "aiml": ["Python", "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow"],
+    "aids": ["Python", "Machine Learning", "Analytics", "Data Science", "NLP"],
+    "ece": ["IoT", "Arduino", "Sensors", "Embedded", "Raspberry Pi", "Hardware"],
+    "eee": ["IoT", "Sensors", "Embedded", "Hardware", "Power Systems"],
+    "mechanical": ["CAD", "3D Modeling", "Sensors", "Robotics"],
+    "civil": ["GIS", "Sensors", "Analytics"],
+    "bca": ["Web Development", "Database", "Python", "Java"],
+    "mca": ["Web Development", "Database", "Cloud", "Java", "Python"]
+}
+
+# Common abbreviations expanded before matching
+SKILL_SYNONYMS = {
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "cv": "computer vision",
+    "js": "javascript",
+    "web dev": "web development",
+    "ar": "augmented reality",
+    "vr": "virtual reality"
+}
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "for", "with", "based", "to", "in", "on", "by", "system", "using"}
+
+# Skills the student named count more than skills inferred from the course,
+# and a problem's tech stack counts more than the words of its statement
+SKILL_WEIGHT = 2.0
+COURSE_WEIGHT = 1.0
+TECH_STACK_WEIGHT = 2.0
+
+def _terms(text: str) -> List[str]:
+    """Unigrams and bigrams of a phrase, so "machine learning" matches as a unit."""
+    text = SKILL_SYNONYMS.get(text.strip().lower(), text.lower())
+    words = [w for w in re.findall(r"[a-z0-9+#]+", text) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def _problem_terms(problem: Dict) -> Dict[str, float]:
+    counts = {}
+    for term in _terms(problem.get("problem_statement") or "") + _terms(problem.get("domain") or ""):
+        counts[term] = counts.get(term, 0.0) + 1.0
+    for tech in problem.get("tech_stack") or []:
+        for term in _terms(tech):
+            counts[term] = counts.get(term, 0.0) + TECH_STACK_WEIGHT
+    return counts
+
+class SIHIndex:
+    """Term-major sparse TF-IDF matrix over SIH problems."""
+
+    def __init__(self, problems: List[Dict]):
+        import numpy as np
+
+        self.problems = problems
+        # Per-problem filter columns, so domain/year filters are vectorized too
+        self.domains = np.array([(p.get("domain") or "").lower() for p in problems])
+        self.years = np.array([p.get("year") if isinstance(p.get("year"), int) else -1 for p in problems])
+        documents = [_problem_terms(problem) for problem in problems]
+
+        document_frequency = {}
+        for counts in documents:
+            for term in counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        n = len(problems)
+        self.terms = {term: i for i, term in enumerate(sorted(document_frequency))}
+        self.idf = np.array([math.log((1 + n) / (1 + document_frequency[t])) + 1 for t in sorted(document_frequency)])
+
+        # Build (term, doc, weight) triples, normalize each document, then sort by term
+        term_ids, doc_ids, weights = [], [], []
+        for doc, counts in enumerate(documents):
+            row = [(self.terms[t], (1 + math.log(c)) * self.idf[self.terms[t]]) for t, c in counts.items()]
+            norm = math.sqrt(sum(w * w for _, w in row)) or 1.0
+            for term_id, weight in row:
+                term_ids.append(term_id)
+                doc_ids.append(doc)
+                weights.append(weight / norm)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)[order]
+        self.weights = np.asarray(weights, dtype=np.float64)[order]
+        self.term_ptr = np.searchsorted(term_ids[order], np.arange(len(self.terms) + 1))
+
+    def query_vector(self, weighted_phrases: Sequence[Tuple[str, float]]) -> Dict[int, float]:
+        """Sparse, L2-normalized query vector; terms not in any problem are dropped."""
+        counts = {}
+        for phrase, weight in weighted_phrases:
+            for term in _terms(phrase):
+                if term in self.terms:
+                    counts[term] = counts.get(term, 0.0) + weight
+        vector = {self.terms[t]: (1 + math.log(c)) * self.idf[self.terms[t]] for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {term_id: weight / norm for term_id, weight in vector.items()}
+
+    def scores(self, vector: Dict[int, float]):
+        """Cosine similarity of every problem with the query vector."""
+        import numpy as np
+
+        scores = np.zeros(len(self.problems))
+        for term_id, weight in vector.items():
+            start, end = self.term_ptr[term_id], self.term_ptr[term_id + 1]
+            # Each document appears once per posting list, so fancy-index += is safe
+            scores[self.doc_ids[start:end]] += weight * self.weights[start:end]
+        return scores
+
+    # Attributes saved in warm-restart snapshots: plain objects, then NumPy arrays
+    STATE_OBJECTS = ("problems", "terms")
+    STATE_ARRAYS = ("domains", "years", "idf", "doc_ids", "weights", "term_ptr")
+
+    @classmethod
+    def from_state(cls, objects: Dict, arrays: Dict) -> "SIHIndex":
+        index = cls.__new__(cls)
+        index.__dict__.update(objects)
+        index.__dict__.update(arrays)
+        return index
+
+_index = None
+_index_stamp = None
+_index_lock = threading.Lock()
+
+def get_sih_index() -> SIHIndex:
+    """Return the index, rebuilding it only when sih.csv changed."""
+    global _index, _index_stamp
+    stamp = data_store.file_stamp(data_store.SIH_CSV)
+    if _index is None or stamp != _index_stamp:
+        with _index_lock:
+            if _index is None or stamp != _index_stamp:
+                _index = SIHIndex(data_store.load_sih_problems())
+                _index_stamp = stamp
+    return _index
+
+def index_version() -> Dict:
+    return {"sih.csv": data_store.file_digest(data_store.SIH_CSV)}
+
+def snapshot_index() -> Optional[tuple]:
+    """(objects, arrays) for a warm-restart snapshot, or None if the index is missing or stale."""
+    index = _index
+    if index is None or _index_stamp != data_store.file_stamp(data_store.SIH_CSV):
+        return None
+    return (
+        {name: getattr(index, name) for name in SIHIndex.STATE_OBJECTS},
+        {name: getattr(index, name) for name in SIHIndex.STATE_ARRAYS}
+    )
+
+def restore_index(objects: Dict, arrays: Dict) -> None:
+    global _index, _index_stamp
+    with _index_lock:
+        _index = SIHIndex.from_state(objects, arrays)
+        _index_stamp = data_store.file_stamp(data_store.SIH_CSV)
+
+def course_skills(course: str) -> List[str]:
+    from ai_brain import canonical_course
+
+    skills = []
+    for token in canonical_course(course).split():
+        skills.extend(COURSE_SKILLS.get(token, []))
+    return skills
+
+def recommend_sih_problems(
+    course: str,
+    skills: Sequence[str] = (),
+    top_k: int = 5,
+    domain: Optional[str] = None,
+    year: Optional[int] = None
+) -> List[Dict]:
+    """
+    Rank SIH problems for a student by course and skills.
+    Each result is the problem plus a similarity score and the student's
+    skills that appear in it.
+    """
+    import numpy as np
+
+    index = get_sih_index()
+    if not index.problems:
+        return []
+    phrases = [(skill, SKILL_WEIGHT) for skill in skills if skill.strip()]
+    phrases += [(skill, COURSE_WEIGHT) for skill in course_skills(course)]
+    phrases.append((course, COURSE_WEIGHT))
+    scores = index.scores(index.query_vector(phrases))
+
+    if domain:
+        scores[index.domains != domain.lower()] = -1.0
+    if year:
+        scores[index.years != year] = -1.0
+
+    k = min(top_k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    results = []
+    for i in top:
+        if scores[i] <= 0:
+            break
+        problem = dict(index.problems[i])
+        problem_terms = set(_problem_terms(problem))
+        problem["score"] = round(float(scores[i]), 4)
+        problem["matched_skills"] = [s for s in skills if s.strip() and set(_terms(s)) & problem_terms]
+        results.append(problem)
+    return results
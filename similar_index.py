@@ -0,0 +1,459 @@
+"""
+Approximate nearest-neighbour index for "similar projects".
+Projects are hashed into sparse feature vectors (title, description, tech
+stack) and reduced by a fixed random projection to a short dense sketch;
+similarity is the cosine of two sketches. Each project keeps a list of its
+NEIGHBORS most similar projects, forming a k-nearest-neighbour graph. A
+query walks that graph from the project's own list (its neighbours and
+theirs) and re-ranks what it reaches by exact sketch similarity.
+
+A project's list is found when it is inserted: sign bits of the sketch form
+random-hyperplane LSH keys (TABLES groups of BITS planes, one hash table per
+group), and the projects sharing a bucket with it seed a search of the graph.
+The new project then takes the place of the least similar neighbour of every
+project it is closer to. Inserts are incremental, so new projects become
+searchable immediately.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FEATURE_BITS = 14
+SKETCH_DIM = 160
+TABLES = 8
+BITS = 10
+NEIGHBORS = 24
+SEED = 7
+
+# Field weights: titles carry the most signal, descriptions the least
+TITLE_WEIGHT = 2.0
+TECH_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+
+# Graph search: rounds of expanding the best SEARCH_WIDTH candidates not yet expanded
+INSERT_ROUNDS = 8
+QUERY_ROUNDS = 2
+SEARCH_WIDTH = 8
+# Bucket members scored as search seeds at most (a sample is taken from larger buckets)
+SEED_LIMIT = 2048
+
+# Below this size search exhaustively
+EXACT_SEARCH_LIMIT = 4096
+
+# Pull projects stored by other workers into the index at most this often
+CORPUS_SYNC_INTERVAL = 5.0
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "for", "with", "using", "to", "in", "on", "by", "is", "it", "that", "this"}
+
+def project_features(project: Dict) -> Tuple[List[int], List[float]]:
+    """Hashed (indices, weights) for a project's title, description and tech stack."""
+    mask = (1 << FEATURE_BITS) - 1
+    weights = {}
+
+    def add(feature: str, weight: float) -> None:
+        index = zlib.crc32(feature.encode("utf-8")) & mask
+        weights[index] = weights.get(index, 0.0) + weight
+
+    for word in re.findall(r"[a-z0-9+#]+", (project.get("title") or "").lower()):
+        if word not in _STOPWORDS:
+            add("w=" + word, TITLE_WEIGHT)
+    for word in re.findall(r"[a-z0-9+#]+", (project.get("description") or "").lower()):
+        if word not in _STOPWORDS:
+            add("w=" + word, DESCRIPTION_WEIGHT)
+    for tech in project.get("tech_stack") or []:
+        add("s=" + " ".join(tech.lower().split()), TECH_WEIGHT)
+    return list(weights), list(weights.values())
+
+def _distinct(values):
+    """Sorted distinct values (np.unique is much slower on small arrays)."""
+    import numpy as np
+
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+def _top(candidates, scores, k: int):
+    """The k best (candidates, scores), best first."""
+    import numpy as np
+
+    top = np.argpartition(-scores, k - 1)[:k] if len(candidates) > k else np.arange(len(candidates))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return candidates[top], scores[top]
+
+class SimilarIndex:
+    """k-nearest-neighbour graph over projected project features, seeded by LSH."""
+
+    def __init__(self, tables: int = TABLES, bits: int = BITS, neighbors: int = NEIGHBORS, seed: int = SEED):
+        import numpy as np
+
+        if tables * bits > SKETCH_DIM:
+            raise ValueError(f"tables * bits must be at most {SKETCH_DIM}")
+        self.tables = tables
+        self.bits = bits
+        self.degree = neighbors
+        self.projection = np.random.default_rng(seed).standard_normal((1 << FEATURE_BITS, SKETCH_DIM)).astype(np.float32)
+        self._powers = (1 << np.arange(bits)).astype(np.int64)
+        self._rng = np.random.default_rng(seed)
+        self.items = []       # stored project summaries, by position
+        self.positions = {}   # project id -> position
+        # Per position: unit sketch, and its neighbours' positions (-1 = none
+        # yet) and similarities, most similar first when first linked
+        self.sketches = np.zeros((1024, SKETCH_DIM), dtype=np.float32)
+        self.neighbors = np.full((1024, neighbors), -1, dtype=np.int64)
+        self.neighbor_scores = np.full((1024, neighbors), -np.inf, dtype=np.float32)
+        # One dict per table: bucket key -> [positions array with spare capacity, used length]
+        self.buckets = [{} for _ in range(tables)]
+        self._lock = threading.Lock()  # serializes inserts
+        # (neighbors, sketches, count) as of the last finished insert; replaced
+        # together with positions under _view_lock, which queries hold only briefly
+        self._published = (self.neighbors, self.sketches, 0)
+        self._view_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sketch(self, project: Dict):
+        """Unit-length dense sketch of a project."""
+        import numpy as np
+
+        indices, weights = project_features(project)
+        if not indices:
+            return np.zeros(SKETCH_DIM, dtype=np.float32)
+        vector = np.asarray(weights, dtype=np.float32) @ self.projection[indices]
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _keys(self, sketches):
+        """LSH bucket key per table for each sketch (rows)."""
+        import numpy as np
+
+        signs = sketches[:, :self.tables * self.bits] > 0
+        return signs.reshape(len(sketches), self.tables, self.bits).astype(np.int64) @ self._powers
+
+    def _grow(self, size: int) -> None:
+        import numpy as np
+
+        capacity = len(self.sketches)
+        if size <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < size:
+            capacity *= 2
+        for name, fill in (("sketches", 0), ("neighbors", -1), ("neighbor_scores", -np.inf)):
+            old = getattr(self, name)
+            grown = np.full((capacity, old.shape[1]), fill, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _append(self, table: int, key: int, positions) -> None:
+        import numpy as np
+
+        entry = self.buckets[table].get(key)
+        if entry is None:
+            entry = self.buckets[table][key] = [np.empty(max(4, len(positions)), dtype=np.int64), 0]
+        array, used = entry
+        if used + len(positions) > len(array):
+            grown = np.empty(max(2 * len(array), used + len(positions)), dtype=np.int64)
+            grown[:used] = array[:used]
+            entry[0] = array = grown
+        array[used:used + len(positions)] = positions
+        entry[1] = used + len(positions)
+
+    def _seeds(self, keys, count: int):
+        """Positions sharing a bucket with the given keys, or a random sample if there are none."""
+        import numpy as np
+
+        parts = []
+        for table, key in enumerate(keys):
+            entry = self.buckets[table].get(key)
+            if entry is not None:
+                parts.append(entry[0][:entry[1]])
+        if not parts:
+            return _distinct(self._rng.integers(0, count, min(count, SEED_LIMIT)))
+        seeds = _distinct(np.concatenate(parts))
+        if len(seeds) > SEED_LIMIT:
+            seeds = self._rng.choice(seeds, SEED_LIMIT, replace=False)
+        return seeds
+
+    def _search(self, neighbors, sketches, count: int, query, candidates, rounds: int, exclude: int, expand_all: bool = False):
+        """
+        Best-first search of the graph (neighbors, sketches; positions below
+        count) from candidates: each round scores the neighbours of the
+        SEARCH_WIDTH best candidates not yet expanded (of all of them first if
+        expand_all). Returns (candidates, scores).
+        """
+        import numpy as np
+
+        candidates = candidates[(candidates != exclude) & (candidates < count)]
+        scores = np.take(sketches, candidates, axis=0) @ query
+        expanded = np.zeros(len(candidates), dtype=bool)
+        seen = np.zeros(count, dtype=bool)
+        seen[candidates] = True
+        if 0 <= exclude < len(seen):
+            seen[exclude] = True
+        for round_ in range(rounds + expand_all):
+            if expand_all and round_ == 0:
+                pick = np.arange(len(candidates))
+            else:
+                open_scores = np.where(expanded, -np.inf, scores)
+                if len(open_scores) > SEARCH_WIDTH:
+                    pick = np.argpartition(-open_scores, SEARCH_WIDTH - 1)[:SEARCH_WIDTH]
+                else:
+                    pick = np.arange(len(open_scores))
+                pick = pick[~expanded[pick]]
+                if not len(pick):
+                    break
+            expanded[pick] = True
+            reached = np.take(neighbors, candidates[pick], axis=0).ravel()
+            reached = reached[(reached >= 0) & (reached < len(seen))]
+            reached = _distinct(reached[~seen[reached]])
+            if not len(reached):
+                continue
+            seen[reached] = True
+            candidates = np.concatenate([candidates, reached])
+            scores = np.concatenate([scores, np.take(sketches, reached, axis=0) @ query])
+            expanded = np.concatenate([expanded, np.zeros(len(reached), dtype=bool)])
+        return candidates, scores
+
+    def _link(self, position: int, candidates, scores) -> None:
+        """Make the best candidates the neighbours of position, and position theirs where it is closer."""
+        import numpy as np
+
+        neighbors, neighbor_scores = _top(candidates, scores, self.degree)
+        self.neighbors[position, :len(neighbors)] = neighbors
+        self.neighbor_scores[position, :len(neighbors)] = neighbor_scores
+        worst = self.neighbor_scores[neighbors].argmin(axis=1)
+        closer = neighbor_scores > self.neighbor_scores[neighbors, worst]
+        self.neighbors[neighbors[closer], worst[closer]] = position
+        self.neighbor_scores[neighbors[closer], worst[closer]] = neighbor_scores[closer]
+
+    def add_many(self, projects: Iterable[Dict]) -> int:
+        """Insert projects (each needs an "id"); already indexed ids are skipped."""
+        import numpy as np
+
+        with self._lock:
+            new, seen = [], set()
+            for project in projects:
+                project_id = project.get("id")
+                if not project_id or project_id in self.positions or project_id in seen:
+                    continue
+                seen.add(project_id)
+                new.append(project)
+            if not new:
+                return 0
+
+            sketches = np.stack([self.sketch(project) for project in new])
+            keys = self._keys(sketches)
+            start, end = len(self.items), len(self.items) + len(new)
+            self._grow(end)
+            self.sketches[start:end] = sketches
+            for project in new:
+                self.items.append({
+                    "id": project["id"],
+                    "title": project.get("title", ""),
+                    "difficulty": project.get("difficulty", ""),
+                    "description": project.get("description", ""),
+                    "tech_stack": list(project.get("tech_stack") or [])
+                })
+
+            if end <= EXACT_SEARCH_LIMIT:
+                # Small index: every new project is compared with all others
+                scores = sketches @ self.sketches[:end].T
+                everyone = np.arange(end)
+                for offset in range(len(new)):
+                    position = start + offset
+                    row = scores[offset, :position]
+                    if position:
+                        self._link(position, everyone[:position], row)
+            else:
+                # New projects in the batch are compared with each other directly,
+                # and with the existing ones through buckets and the graph
+                batch = sketches @ sketches.T
+                for offset in range(len(new)):
+                    position = start + offset
+                    candidates, scores = self._search(
+                        self.neighbors, self.sketches, end,
+                        sketches[offset], self._seeds(keys[offset].tolist(), start), INSERT_ROUNDS, position
+                    )
+                    if offset:
+                        # Earlier projects of the batch may also have been reached through the graph
+                        older = candidates < start
+                        candidates = np.concatenate([candidates[older], np.arange(start, position)])
+                        scores = np.concatenate([scores[older], batch[offset, :offset]])
+                    self._link(position, candidates, scores)
+
+            positions = np.arange(start, end)
+            for table in range(self.tables):
+                if len(new) == 1:
+                    self._append(table, int(keys[0, table]), positions)
+                    continue
+                # Group the batch by bucket so each touched bucket is extended once
+                order = np.argsort(keys[:, table], kind="stable")
+                sorted_keys = keys[order, table]
+                bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+                for key, group in zip(sorted_keys[np.r_[0, bounds]].tolist(), np.split(positions[order], bounds)):
+                    self._append(table, key, group)
+
+            # Publish last so concurrent queries only see fully inserted items
+            with self._view_lock:
+                for offset, project in enumerate(new):
+                    self.positions[project["id"]] = start + offset
+                self._published = (self.neighbors, self.sketches, end)
+        return len(new)
+
+    def add(self, project: Dict) -> bool:
+        return self.add_many([project]) == 1
+
+    def similar(self, project_id: str, k: int = 5) -> Optional[List[Dict]]:
+        """Top-k most similar indexed projects, or None if project_id is not indexed."""
+        import numpy as np
+
+        # Inserts regrow the arrays: take the published view under the lock, search outside it
+        with self._view_lock:
+            position = self.positions.get(project_id)
+            neighbors, sketches, count = self._published
+        if position is None:
+            return None
+        items = self.items
+        query = sketches[position]
+        if count <= EXACT_SEARCH_LIMIT:
+            candidates = np.arange(count)
+            candidates = candidates[candidates != position]
+            scores = sketches[:count] @ query
+            scores = np.delete(scores, position)
+        else:
+            own = neighbors[position]
+            candidates, scores = self._search(neighbors, sketches, count, query, own[own >= 0], QUERY_ROUNDS, position, expand_all=True)
+        if not len(candidates):
+            return []
+        candidates, scores = _top(candidates, scores, k)
+        return [dict(items[candidate], similarity=round(float(score), 4)) for candidate, score in zip(candidates.tolist(), scores.tolist())]
+
+    def state(self) -> Tuple[Dict, Dict]:
+        """(objects, arrays) describing the index, for warm-restart snapshots."""
+        import numpy as np
+
+        with self._lock:
+            count = len(self.items)
+            objects = {"items": list(self.items), "positions": dict(self.positions)}
+            arrays = {
+                "sketches": self.sketches[:count],
+                "neighbors": self.neighbors[:count],
+                "neighbor_scores": self.neighbor_scores[:count]
+            }
+            # Buckets flattened per table: sorted keys, offsets into one positions array
+            for table, buckets in enumerate(self.buckets):
+                keys = sorted(buckets)
+                arrays[f"bucket_keys_{table}"] = np.array(keys, dtype=np.int64)
+                arrays[f"bucket_offsets_{table}"] = np.cumsum([0] + [buckets[key][1] for key in keys], dtype=np.int64)
+                arrays[f"bucket_positions_{table}"] = (
+                    np.concatenate([buckets[key][0][:buckets[key][1]] for key in keys]) if keys else np.zeros(0, dtype=np.int64)
+                )
+        return objects, arrays
+
+    @classmethod
+    def from_state(cls, objects: Dict, arrays: Dict) -> "SimilarIndex":
+        """
+        Rebuild an index from state(). Arrays are used as given (e.g. memory-mapped
+        copy-on-write) and copied on the first insert that needs more room.
+        """
+        index = cls()
+        index.items = objects["items"]
+        index.positions = objects["positions"]
+        index.sketches, index.neighbors, index.neighbor_scores = arrays["sketches"], arrays["neighbors"], arrays["neighbor_scores"]
+        index._published = (index.neighbors, index.sketches, len(index.items))
+        for table in range(index.tables):
+            offsets, positions = arrays[f"bucket_offsets_{table}"], arrays[f"bucket_positions_{table}"]
+            index.buckets[table] = {
+                key: [positions[offsets[i]:offsets[i + 1]], int(offsets[i + 1] - offsets[i])]
+                for i, key in enumerate(arrays[f"bucket_keys_{table}"].tolist())
+            }
+        return index
+
+_index = None
+_index_lock = threading.Lock()
+_corpus_synced_until = 0.0
+_corpus_checked_at = None
+
+def _bank_projects() -> List[Dict]:
+    from ai_brain import PROJECT_BANK, project_id
+
+    projects = []
+    for levels in PROJECT_BANK.values():
+        for difficulty, bank in levels.items():
+            for project in bank:
+                projects.append(dict(project, id=project_id(project["title"]), difficulty=difficulty.capitalize()))
+    return projects
+
+def _sync_corpus(index: SimilarIndex) -> None:
+    """Add projects stored in the corpus (by any process) since the last sync."""
+    global _corpus_synced_until, _corpus_checked_at
+    from ai_brain import project_id
+    from project_corpus import get_project_corpus
+
+    _corpus_checked_at = time.monotonic()
+    corpus = get_project_corpus()
+    if corpus is None:
+        return
+    projects = []
+    for created, project in corpus.iter_projects(since=_corpus_synced_until):
+        projects.append(dict(project, id=project_id(project["title"])))
+        _corpus_synced_until = max(_corpus_synced_until, created)
+    index.add_many(projects)
+
+def _corpus_sync_due() -> bool:
+    return _corpus_checked_at is None or time.monotonic() - _corpus_checked_at > CORPUS_SYNC_INTERVAL
+
+def get_similar_index(sync_corpus: bool = True) -> SimilarIndex:
+    """
+    Return the process-wide index, building it from the project bank on first
+    use. Corpus projects are added on first use and then every few seconds;
+    sync_corpus=False skips that (e.g. in a pre-fork parent with no SQLite).
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SimilarIndex()
+                index.add_many(_bank_projects())
+                _index = index
+    if sync_corpus and _corpus_sync_due():
+        with _index_lock:
+            if _corpus_sync_due():
+                _sync_corpus(_index)
+    return _index
+
+def index_projects(projects: List[Dict]) -> None:
+    """Add newly served projects to the index if it has been built in this process."""
+    if _index is not None:
+        _index.add_many(projects)
+
+def index_version() -> Dict:
+    """Index parameters and a digest of the project bank it was seeded from."""
+    bank = hashlib.sha1(json.dumps(_bank_projects(), sort_keys=True).encode("utf-8")).hexdigest()
+    return {
+        "params": [FEATURE_BITS, SKETCH_DIM, TABLES, BITS, NEIGHBORS, SEED, TITLE_WEIGHT, TECH_WEIGHT, DESCRIPTION_WEIGHT],
+        "bank": bank
+    }
+
+def snapshot_index() -> Optional[tuple]:
+    """(objects, arrays) for a warm-restart snapshot, or None if the index has not been built."""
+    index = _index
+    if index is None:
+        return None
+    objects, arrays = index.state()
+    objects["corpus_synced_until"] = _corpus_synced_until
+    return objects, arrays
+
+def restore_index(objects: Dict, arrays: Dict) -> None:
+    """Install a snapshotted index; corpus sync resumes from where the snapshot left off."""
+    global _index, _corpus_synced_until
+    index = SimilarIndex.from_state(objects, arrays)
+    with _index_lock:
+        _index = index
+        _corpus_synced_until = objects["corpus_synced_until"]
@@ -0,0 +1,168 @@
+"""
+Warm-restart snapshots of in-process indexes and caches.
+A snapshot is one file: a JSON manifest, one pickle per component and the
+components' NumPy arrays, each aligned so it can be memory-mapped. On start
+the arrays are mapped copy-on-write rather than read, so a restored index is
+usable at once and forked workers share its pages. Each component records
+the version of the data it was built from (e.g. a digest of sih.csv) and is
+restored only if that still matches; otherwise it is rebuilt as usual.
+
+The LLM cache, project corpus and jobs are already persistent SQLite and are
+not part of the snapshot.
+"""
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "warm_snapshot.bin")
+# Seconds between periodic snapshots while the API runs (0 = only on shutdown)
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "600"))
+
+SNAPSHOT_FORMAT = 1
+_MAGIC = b"APSNAP\x00\x01"
+_HEADER = struct.Struct("<8sQQ")  # magic, manifest offset, manifest length
+_ALIGN = 64
+
+_loaded = False
+_stop = threading.Event()
+
+def _components() -> Dict[str, Tuple[Callable, Callable, Callable]]:
+    """Snapshot name -> (version, snapshot, restore) functions."""
+    import ai_brain
+    import data_store
+    import facets
+    import sih_recommender
+    import similar_index
+
+    return {
+        "sih_index": (sih_recommender.index_version, sih_recommender.snapshot_index, sih_recommender.restore_index),
+        "sih_facets": (facets.sih_facets_version, facets.snapshot_sih_facets, facets.restore_sih_facets),
+        "hackathon_index": (data_store.hackathon_index_version, data_store.snapshot_hackathon_index, data_store.restore_hackathon_index),
+        "hackathon_facets": (facets.hackathon_facets_version, facets.snapshot_hackathon_facets, facets.restore_hackathon_facets),
+        "similar_index": (similar_index.index_version, similar_index.snapshot_index, similar_index.restore_index),
+        "project_caches": (ai_brain.caches_version, ai_brain.snapshot_caches, ai_brain.restore_caches)
+    }
+
+def _pad(f) -> int:
+    offset = f.tell()
+    padding = -offset % _ALIGN
+    f.write(b"\0" * padding)
+    return offset + padding
+
+def save_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """
+    Write a snapshot of every built component. The file is written next to
+    path and renamed into place, so readers never see a partial snapshot.
+    Returns {"components", "bytes", "seconds"}, or None if it could not be written.
+    """
+    import numpy as np
+
+    if not path:
+        return None
+    started = time.perf_counter()
+    manifest = {"format": SNAPSHOT_FORMAT, "created": time.time(), "components": {}}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 0, 0))
+            for name, (version, snapshot, _) in _components().items():
+                state = snapshot()
+                if state is None:
+                    continue
+                objects, arrays = state
+                entry = {"version": version(), "arrays": {}}
+                blob = pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+                entry["objects"] = [f.tell(), len(blob)]
+                f.write(blob)
+                for array_name, array in arrays.items():
+                    array = np.ascontiguousarray(array)
+                    offset = _pad(f)
+                    f.write(array.tobytes())
+                    entry["arrays"][array_name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+                manifest["components"][name] = entry
+            data = json.dumps(manifest).encode("utf-8")
+            offset = f.tell()
+            f.write(data)
+            size = f.tell()
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, offset, len(data)))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    return {"components": list(manifest["components"]), "bytes": size, "seconds": round(time.perf_counter() - started, 3)}
+
+def _read_array(path: str, spec: Dict):
+    import numpy as np
+
+    dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+    if not int(np.prod(shape)):
+        return np.zeros(shape, dtype=dtype)
+    # Copy-on-write: pages are read lazily and shared until an index writes to them
+    return np.memmap(path, dtype=dtype, mode="c", offset=spec["offset"], shape=shape)
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Dict:
+    """
+    Restore every component whose version still matches. Returns
+    {"restored": [...], "skipped": {name: reason}}; a missing or unreadable
+    snapshot restores nothing.
+    """
+    global _loaded
+    _loaded = True
+    result = {"restored": [], "skipped": {}}
+    try:
+        with open(path, "rb") as f:
+            magic, offset, length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError("not a snapshot")
+            f.seek(offset)
+            manifest = json.loads(f.read(length))
+            if manifest.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError("unsupported format")
+            for name, (version, _, restore) in _components().items():
+                entry = manifest["components"].get(name)
+                if entry is None:
+                    continue
+                if entry["version"] != version():
+                    result["skipped"][name] = "stale"
+                    continue
+                start, size = entry["objects"]
+                f.seek(start)
+                objects = pickle.loads(f.read(size))
+                arrays = {array_name: _read_array(path, spec) for array_name, spec in entry["arrays"].items()}
+                restore(objects, arrays)
+                result["restored"].append(name)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def ensure_loaded() -> Optional[Dict]:
+    """Load the snapshot once per process tree (a pre-fork parent's load covers its workers)."""
+    if _loaded or not SNAPSHOT_ENABLED:
+        return None
+    return load_snapshot()
+
+def _periodic() -> None:
+    while not _stop.wait(SNAPSHOT_INTERVAL):
+        save_snapshot()
+
+def start_periodic_snapshots() -> None:
+    if SNAPSHOT_ENABLED and SNAPSHOT_INTERVAL > 0:
+        _stop.clear()
+        threading.Thread(target=_periodic, name="snapshot-writer", daemon=True).start()
+
+def stop_periodic_snapshots(save: bool = True) -> None:
+    """Stop periodic snapshots and, by default, write a final one."""
+    _stop.set()
+    if save and SNAPSHOT_ENABLED:
+        save_snapshot()
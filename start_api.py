@@ -1,15 +1,146 @@
 """
 Quick start script for the AI Project & Hackathon Assistant API
 Run this file to start the API server.
+
+  python start_api.py           development server with auto-reload
+  python start_api.py --prod    production server: one worker per core, app
+                                preloaded in the parent, uvloop/httptools
+
+Production settings can also come from the environment (WEB_CONCURRENCY,
+API_KEEP_ALIVE, API_GRACEFUL_TIMEOUT, API_LIMIT_CONCURRENCY, API_BACKLOG).
 """
-import uvicorn
+import argparse
+import os
+import sys
 
-if __name__ == "__main__":
-    print("Starting AI Project & Hackathon Assistant API...")
-    print("API will be available at: http://localhost:8000")
-    print("API Documentation at: http://localhost:8000/docs")
-    print("Alternative docs at: http://localhost:8000/redoc")
-    print("\nPress Ctrl+C to stop the server\n")
-    
-    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
+def default_workers() -> int:
+    """One worker per core available to this process."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, cores)
+
+def preload() -> None:
+    """
+    Load modules and read-only data in the parent process so forked workers
+    share them copy-on-write. Nothing here may open SQLite connections or
+    start threads; those are created per worker. Indexes come from the
+    warm-restart snapshot when it is still current.
+    """
+    import ai_brain  # noqa: F401 (project bank, prompts, provider wiring)
+    import predictor
+    import snapshots
+    from facets import get_hackathon_facets, get_sih_facets
+    from sih_recommender import get_sih_index
+    from similar_index import get_similar_index
+
+    snapshots.ensure_loaded()
+    get_sih_index()
+    get_sih_facets()
+    get_hackathon_facets()
+    get_similar_index(sync_corpus=False)
+
+    if predictor.SUCCESS_SCORER == "model":
+        from success_model import get_success_model
+        get_success_model()
+
+def run_gunicorn(args) -> None:
+    from gunicorn.app.base import BaseApplication
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        import warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            from uvicorn.workers import UvicornWorker
+
+    class ProductionWorker(UvicornWorker):
+        # "auto" picks uvloop and httptools when they are installed
+        CONFIG_KWARGS = {
+            "loop": "auto",
+            "http": "auto",
+            "limit_concurrency": args.limit_concurrency or None,
+            "timeout_graceful_shutdown": args.graceful_timeout
+        }
+
+    class APIApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("worker_class", ProductionWorker)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("keepalive", args.keep_alive)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("backlog", args.backlog)
+            # LLM calls run in the worker thread pool, so the event loop never blocks this long
+            self.cfg.set("timeout", 120)
 
+        def load(self):
+            preload()
+            from api import app
+            return app
+
+    APIApplication().run()
+
+def run_uvicorn(args, reload: bool = False) -> None:
+    import uvicorn
+
+    if reload:
+        uvicorn.run("api:app", host=args.host, port=args.port, reload=True)
+        return
+    # uvicorn spawns (not forks) its workers, so each one imports the app itself
+    uvicorn.run(
+        "api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_concurrency=args.limit_concurrency or None,
+        backlog=args.backlog
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Start the AI Project & Hackathon Assistant API")
+    parser.add_argument("--prod", action="store_true", help="production mode (multiple workers, no reload)")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(default_workers()))))
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("API_KEEP_ALIVE", "30")),
+                        help="seconds to keep idle HTTP connections open")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("API_GRACEFUL_TIMEOUT", "30")),
+                        help="seconds in-flight requests get to finish on shutdown")
+    parser.add_argument("--limit-concurrency", type=int, default=int(os.getenv("API_LIMIT_CONCURRENCY", "0")),
+                        help="max concurrent connections per worker before answering 503 (0 = unlimited)")
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("API_BACKLOG", "2048")))
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default=os.getenv("API_SERVER", "auto"),
+                        help="process manager for --prod (gunicorn preloads the app; not available on Windows)")
+    args = parser.parse_args()
+
+    if not args.prod:
+        print("Starting AI Project & Hackathon Assistant API...")
+        print(f"API will be available at: http://localhost:{args.port}")
+        print(f"API Documentation at: http://localhost:{args.port}/docs")
+        print(f"Alternative docs at: http://localhost:{args.port}/redoc")
+        print("\nPress Ctrl+C to stop the server\n")
+        run_uvicorn(args, reload=True)
+        return
+
+    server = args.server
+    if server == "auto":
+        try:
+            import gunicorn  # noqa: F401
+            server = "gunicorn" if sys.platform != "win32" else "uvicorn"
+        except ImportError:
+            server = "uvicorn"
+    print(f"Starting API in production mode: {args.workers} worker(s) via {server} on {args.host}:{args.port}")
+    if server == "gunicorn":
+        run_gunicorn(args)
+    else:
+        run_uvicorn(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Learned success-percentage model.
+A linear model over hashed word n-grams of the course, title, description,
+tech stack and difficulty. Inference is a NumPy gather-and-sum, so scoring a
+batch of projects takes microseconds instead of one LLM round-trip each.
+Weights are trained offline with train_success_model.py and stored sparsely
+in a small .npz file.
+"""
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SUCCESS_MODEL_PATH = os.getenv("SUCCESS_MODEL_PATH", "success_model.npz")
+# Where LLM success scores are logged as training data (empty disables logging)
+SCORE_LOG_PATH = os.getenv("SCORE_LOG_PATH", "score_log.jsonl")
+
+FEATURE_BITS = 14
+MIN_SCORE = 0.0
+MAX_SCORE = 100.0
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return [token.rstrip(".") for token in _TOKEN_PATTERN.findall((text or "").lower())]
+
+def extract_features(
+    course: str,
+    title: str,
+    difficulty: str,
+    description: str = "",
+    tech_stack: Optional[Sequence[str]] = None
+) -> List[str]:
+    """Named features for one project; each is hashed to a weight index."""
+    difficulty = (difficulty or "").strip().lower()
+    course_tokens = _tokens(course)
+    title_tokens = _tokens(title)
+    description_tokens = _tokens(description)
+
+    features = [f"d={difficulty}"]
+    features += [f"c={token}" for token in course_tokens]
+    # Crosses let the weight of a difficulty or title word depend on the course
+    features += [f"cd={token}|{difficulty}" for token in course_tokens]
+    features += [f"t={token}" for token in title_tokens]
+    features += [f"t2={a}_{b}" for a, b in zip(title_tokens, title_tokens[1:])]
+    features += [f"x={token}" for token in description_tokens]
+    features += [f"x2={a}_{b}" for a, b in zip(description_tokens, description_tokens[1:])]
+    features += [f"s={' '.join(_tokens(tech))}" for tech in (tech_stack or []) if tech]
+    features += [f"ct={token}|{t}" for token in course_tokens for t in set(title_tokens)]
+    return features
+
+def hash_features(features: List[str], bits: int = FEATURE_BITS) -> Tuple[List[int], List[float]]:
+    """Hash features to (indices, values); values are scaled so long texts do not dominate."""
+    mask = (1 << bits) - 1
+    counts = {}
+    for feature in features:
+        index = zlib.crc32(feature.encode("utf-8")) & mask
+        counts[index] = counts.get(index, 0) + 1
+    scale = 1.0 / len(features) ** 0.5 if features else 1.0
+    return list(counts), [count * scale for count in counts.values()]
+
+def featurize_batch(projects: Sequence[Dict], bits: int = FEATURE_BITS):
+    """
+    Turn project dicts (course, title, difficulty, description, tech_stack)
+    into flat (rows, indices, values) arrays for sparse dot products.
+    """
+    import numpy as np
+
+    rows, indices, values = [], [], []
+    for row, project in enumerate(projects):
+        idx, val = hash_features(extract_features(
+            project.get("course", ""),
+            project.get("title", ""),
+            project.get("difficulty", ""),
+            project.get("description", ""),
+            project.get("tech_stack") or []
+        ), bits)
+        rows.extend([row] * len(idx))
+        indices.extend(idx)
+        values.extend(val)
+    return (
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(values, dtype=np.float32)
+    )
+
+class SuccessModel:
+    """Hashed-feature linear regressor producing a 0-100 success percentage."""
+
+    def __init__(self, weights, bias: float, bits: int = FEATURE_BITS, meta: Optional[Dict] = None):
+        self.weights = weights
+        self.bias = bias
+        self.bits = bits
+        self.meta = meta or {}
+
+    def predict_batch(self, projects: Sequence[Dict]) -> List[float]:
+        import numpy as np
+
+        if not projects:
+            return []
+        rows, indices, values = featurize_batch(projects, self.bits)
+        scores = np.bincount(rows, weights=self.weights[indices] * values, minlength=len(projects)) + self.bias
+        return [round(float(score), 2) for score in np.clip(scores, MIN_SCORE, MAX_SCORE)]
+
+    def predict(
+        self,
+        course: str,
+        title: str,
+        difficulty: str,
+        description: str = "",
+        tech_stack: Optional[Sequence[str]] = None
+    ) -> float:
+        return self.predict_batch([{
+            "course": course,
+            "title": title,
+            "difficulty": difficulty,
+            "description": description,
+            "tech_stack": tech_stack or []
+        }])[0]
+
+    def save(self, path: str = SUCCESS_MODEL_PATH) -> None:
+        """Store only the non-zero weights, as float16, in a compressed .npz."""
+        import numpy as np
+
+        nonzero = np.flatnonzero(self.weights)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            indices=nonzero.astype(np.uint32),
+            values=self.weights[nonzero].astype(np.float16),
+            bias=np.array(self.bias),
+            bits=np.array(self.bits),
+            meta=np.array(json.dumps(self.meta))
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = SUCCESS_MODEL_PATH) -> "SuccessModel":
+        import numpy as np
+
+        with np.load(path) as data:
+            bits = int(data["bits"])
+            weights = np.zeros(1 << bits, dtype=np.float32)
+            weights[data["indices"]] = data["values"].astype(np.float32)
+            bias = float(data["bias"])
+            meta = json.loads(str(data["meta"]))
+        return cls(weights, bias, bits, meta)
+
+_model = None
+_model_stamp = None
+_model_lock = threading.Lock()
+
+def get_success_model() -> Optional[SuccessModel]:
+    """Return the trained model, reloading it if the weights file changed; None if unavailable."""
+    global _model, _model_stamp
+    try:
+        stat = os.stat(SUCCESS_MODEL_PATH)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    if stamp != _model_stamp:
+        with _model_lock:
+            if stamp != _model_stamp:
+                try:
+                    _model = SuccessModel.load(SUCCESS_MODEL_PATH)
+                except Exception:
+                    # Missing numpy or a corrupt file: callers fall back to other scorers
+                    _model = None
+                _model_stamp = stamp
+    return _model
+
+_log_lock = threading.Lock()
+
+def log_score(
+    course: str,
+    title: str,
+    difficulty: str,
+    description: str,
+    tech_stack: Sequence[str],
+    score: float,
+    latency: float,
+    source: str
+) -> None:
+    """Append one scored project to SCORE_LOG_PATH for offline training."""
+    if not SCORE_LOG_PATH:
+        return
+    line = json.dumps({
+        "course": course,
+        "title": title,
+        "difficulty": difficulty,
+        "description": description,
+        "tech_stack": list(tech_stack or []),
+        "score": score,
+        "latency": round(latency, 4),
+        "source": source
+    })
+    try:
+        with _log_lock, open(SCORE_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
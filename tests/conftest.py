@@ -0,0 +1,42 @@
+"""
+Shared setup for the API tests.
+Tests run with the local generator (no network, no API key) in a scratch
+directory holding copies of the CSV files, so the SQLite stores, logs and
+CSV appends they create never touch the working tree.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="api-tests-")
+
+for name in ("hackathons.csv", "sih.csv"):
+    shutil.copy(os.path.join(ROOT, name), WORKDIR)
+sys.path.insert(0, ROOT)
+
+# Set before any app module is imported: configuration is read at import time
+os.environ.update({
+    "AI_PROVIDER": "local",
+    "USE_AI": "true",
+    "SNAPSHOT_ENABLED": "false",
+    "SCORE_LOG_PATH": "",
+    "JOB_WORKERS": "2"
+})
+
+def pytest_sessionstart(session):
+    # Only once pytest has resolved testpaths against the repository root
+    os.chdir(WORKDIR)
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import api
+
+    with TestClient(api.app) as test_client:
+        yield test_client
+    shutil.rmtree(WORKDIR, ignore_errors=True)
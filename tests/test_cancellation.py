@@ -0,0 +1,128 @@
+"""Request coalescing and disconnect cancellation in api._run_cancellable."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import api
+from cancellation import Cancelled, check_cancelled
+
+class FakeRequest:
+    """Stands in for a Starlette request; disconnects after `after` seconds."""
+
+    def __init__(self, after=None):
+        self.deadline = None if after is None else time.monotonic() + after
+
+    async def is_disconnected(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(api, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+def slow_work(calls, stopped, seconds=2.0):
+    """Blocking work that checks its cancel scope, like a streaming LLM call."""
+
+    def work(value):
+        calls.append(value)
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                check_cancelled()
+                time.sleep(0.005)
+        except Cancelled:
+            stopped.set()
+            raise
+        return value * 2
+
+    return work
+
+def test_identical_requests_share_one_run():
+    calls, stopped = [], threading.Event()
+    work = slow_work(calls, stopped, seconds=0.2)
+
+    async def main():
+        return await asyncio.gather(
+            api._run_cancellable(FakeRequest(), ("test", "shared"), work, 21),
+            api._run_cancellable(FakeRequest(), ("test", "shared"), work, 21)
+        )
+
+    assert asyncio.run(main()) == [42, 42]
+    assert calls == [21]
+    assert ("test", "shared") not in api._flights
+
+def test_requests_without_key_run_separately():
+    calls, stopped = [], threading.Event()
+    work = slow_work(calls, stopped, seconds=0.05)
+
+    async def main():
+        return await asyncio.gather(
+            api._run_cancellable(FakeRequest(), None, work, 1),
+            api._run_cancellable(FakeRequest(), None, work, 1)
+        )
+
+    assert asyncio.run(main()) == [2, 2]
+    assert calls == [1, 1]
+
+def test_disconnect_cancels_the_run():
+    calls, stopped = [], threading.Event()
+    work = slow_work(calls, stopped)
+
+    async def main():
+        return await api._run_cancellable(FakeRequest(after=0.05), ("test", "disconnect"), work, 1)
+
+    started = time.monotonic()
+    assert asyncio.run(main()) is None
+    assert stopped.wait(1.0)
+    assert time.monotonic() - started < 1.5
+    assert ("test", "disconnect") not in api._flights
+
+def test_run_continues_while_another_client_waits():
+    calls, stopped = [], threading.Event()
+    work = slow_work(calls, stopped, seconds=0.3)
+
+    async def main():
+        return await asyncio.gather(
+            api._run_cancellable(FakeRequest(after=0.05), ("test", "survivor"), work, 5),
+            api._run_cancellable(FakeRequest(), ("test", "survivor"), work, 5)
+        )
+
+    assert asyncio.run(main()) == [None, 10]
+    assert calls == [5]
+    assert not stopped.is_set()
+
+def test_disconnect_is_counted(client):
+    before = client.get("/metrics").json()["cancellation"]["requests_cancelled"]
+    calls, stopped = [], threading.Event()
+
+    async def main():
+        return await api._run_cancellable(FakeRequest(after=0.02), ("test", "counted"), slow_work(calls, stopped), 1)
+
+    asyncio.run(main())
+    assert client.get("/metrics").json()["cancellation"]["requests_cancelled"] == before + 1
+
+def test_abandoned_batch_stream_stops_generation(monkeypatch):
+    calls, stopped = [], threading.Event()
+    work = slow_work(calls, stopped)
+
+    def fake_ideas(**request):
+        if request["academic_year"] == 2:
+            return work(2)
+        # Answer the first request only once the second is generating
+        while not calls:
+            time.sleep(0.005)
+        return []
+
+    monkeypatch.setattr(api, "get_project_ideas", fake_ideas)
+    batch = api.BatchProjectRequest(requests=[api.ProjectRequest(course="BTech CSE", academic_year=year) for year in (1, 2)])
+
+    async def main():
+        body = (await api.get_projects_batch(batch)).body_iterator
+        first = await body.__anext__()
+        # The client goes away after the first line
+        await body.aclose()
+        return first
+
+    assert '"indexes": [0]' in asyncio.run(main())
+    assert stopped.wait(1.0)
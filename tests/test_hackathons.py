@@ -0,0 +1,112 @@
+"""Hackathon and SIH listings: cursor paging, the change feed and imports."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import hackathon_changes
+
+def future_date(days: int) -> str:
+    return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+def add(client, name: str, days: int, organizer: str = "Test Org") -> None:
+    response = client.post("/hackathons/add", json={
+        "name": name, "organizer": organizer, "date": future_date(days), "location": "Online"
+    })
+    assert response.status_code == 200, response.text
+
+def pages(client, path: str, params: dict) -> list:
+    """Every page of a listing, following X-Next-Cursor."""
+    records, cursor = [], None
+    while True:
+        response = client.get(path, params=dict(params, cursor=cursor) if cursor else params)
+        assert response.status_code == 200, response.text
+        records.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return records
+
+def test_hackathon_cursor_round_trip(client):
+    for i in range(7):
+        add(client, f"Paging Hack {i}", days=10 + i % 3)
+    full = client.get("/hackathons", params={"months_ahead": 2}).json()
+    paged = pages(client, "/hackathons", {"months_ahead": 2, "limit": 3})
+    assert all(len(page) <= 3 for page in paged)
+    assert [record for page in paged for record in page] == full
+    assert len([record for record in full if record["name"].startswith("Paging Hack")]) == 7
+    assert [record["date"] for record in full] == sorted(record["date"] for record in full)
+
+def test_hackathon_fields_and_bad_cursor(client):
+    add(client, "Fields Hack", days=5)
+    records = client.get("/hackathons", params={"fields": "name,date"}).json()
+    assert records and all(set(record) == {"name", "date"} for record in records)
+    assert client.get("/hackathons", params={"fields": "name,nope"}).status_code == 400
+    assert client.get("/hackathons", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_sih_cursor_round_trip(client):
+    full = client.get("/sih").json()
+    assert len(full) > 2
+    paged = pages(client, "/sih", {"limit": 2})
+    assert [record for page in paged for record in page] == full
+
+    domain = full[0]["domain"]
+    filtered = client.get("/sih", params={"domain": domain}).json()
+    paged = pages(client, "/sih", {"domain": domain, "limit": 1})
+    assert [record for page in paged for record in page] == filtered
+
+def test_change_feed_deltas(client):
+    version = client.get("/hackathons/changes", params={"since": 0, "limit": 1}).json()["version"]
+    add(client, "Delta Hack", days=20)
+    changes = client.get("/hackathons/changes", params={"since": version}).json()
+    assert [record["name"] for record in changes["added"]] == ["Delta Hack"]
+    assert changes["updated"] == [] and changes["removed"] == []
+    assert changes["version"] > version and not changes["has_more"]
+
+    unchanged = client.get("/hackathons/changes", params={"since": changes["version"]}).json()
+    assert unchanged["added"] == [] and unchanged["version"] == changes["version"]
+
+def test_change_feed_snapshot_is_paged(client):
+    add(client, "Snapshot Hack", days=30)
+    first = client.get("/hackathons/changes", params={"since": 0, "limit": 2}).json()
+    assert len(first["added"]) == 2 and first["has_more"] and first["cursor"]
+    keys, page = [], first
+    while True:
+        keys += [record["key"] for record in page["added"]]
+        assert page["version"] == first["version"]
+        if not page["has_more"]:
+            assert page["cursor"] is None
+            break
+        page = client.get("/hackathons/changes", params={"since": 0, "limit": 2, "cursor": page["cursor"]}).json()
+    assert keys == sorted(set(keys))
+    everything = client.get("/hackathons/changes", params={"since": 0}).json()
+    assert keys == [record["key"] for record in everything["added"]]
+
+def test_change_feed_resync(client, monkeypatch):
+    latest = client.get("/hackathons/changes", params={"since": 0, "limit": 1}).json()["version"]
+    response = client.get("/hackathons/changes", params={"since": latest + 100})
+    assert response.status_code == 410
+    assert response.headers["X-Hackathons-Version"] == str(latest)
+
+    # Let the log keep only the last two changes: an old version must resync
+    monkeypatch.setattr(hackathon_changes, "HACKATHON_CHANGES_RETENTION", 2)
+    for i in range(4):
+        add(client, f"Retention Hack {i}", days=40)
+    assert client.get("/hackathons/changes", params={"since": latest}).status_code == 410
+    current = client.get("/hackathons/changes", params={"since": 0, "limit": 1}).json()["version"]
+    assert client.get("/hackathons/changes", params={"since": current - 1}).status_code == 200
+    assert client.get("/hackathons/changes", params={"since": 3, "cursor": "x"}).status_code == 400
+
+@pytest.mark.parametrize("date", ["15/03/2031", "March 15, 2031", "15 Mar 2031", "2031-03-15"])
+def test_import_normalizes_dates(client, date):
+    upload = f'name,organizer,date,location\nDate Format Hack,Formats Org,"{date}",Online\n'
+    counts = client.post("/hackathons/import", files={"file": ("events.csv", upload)}).json()
+    assert counts["invalid"] == 0
+    # Every spelling is the same event: only the first import inserts it
+    assert counts["inserted"] + counts["duplicate"] == 1
+    listed = [record for record in client.get("/hackathons", params={"months_ahead": 12 * 6}).json() if record["name"] == "Date Format Hack"]
+    assert [record["date"] for record in listed] == ["2031-03-15"]
+
+def test_import_rejects_unparseable_dates(client):
+    upload = "name,organizer,date,location\nVague Hack,Org,sometime soon,Online\n"
+    counts = client.post("/hackathons/import", files={"file": ("events.csv", upload)}).json()
+    assert counts["invalid"] == 1 and counts["inserted"] == 0
+    assert "date" in counts["errors"][0]["error"]
@@ -0,0 +1,62 @@
+"""Background jobs: queued, run, polled, failed, and refused when the queue is full."""
+import time
+
+import api
+import jobs
+
+def wait_for(client, job_id, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/projects/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_project_job_lifecycle(client):
+    response = client.post("/projects/jobs", json={
+        "kind": "projects",
+        "projects": {"course": "BTech CSE", "academic_year": 2, "num_projects": 3}
+    })
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["status_url"] == f"/projects/jobs/{body['job_id']}"
+
+    job = wait_for(client, body["job_id"])
+    assert job["status"] == "succeeded"
+    assert job["error"] is None
+    assert len(job["result"]) == 3
+    assert all(project["title"] for project in job["result"])
+
+def test_failed_job_reports_its_error(client, monkeypatch):
+    def fail(request):
+        raise RuntimeError("generation exploded")
+
+    monkeypatch.setitem(api.JOB_RUNNERS, "guidance", fail)
+    response = client.post("/projects/jobs", json={
+        "kind": "guidance",
+        "guidance": {"project_title": "Smart Parking", "course": "BTech CSE"}
+    })
+    job = wait_for(client, response.json()["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "generation exploded"
+    assert job["result"] is None
+
+def test_missing_payload_and_unknown_job(client):
+    assert client.post("/projects/jobs", json={"kind": "projects"}).status_code == 422
+    assert client.get("/projects/jobs/does-not-exist").status_code == 404
+
+def test_full_queue_answers_429(client, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_PENDING", 0)
+    response = client.post("/projects/jobs", json={"kind": "projects", "projects": {"course": "BTech CSE"}})
+    assert response.status_code == 429
+    assert "Too many pending jobs" in response.json()["detail"]
+
+def test_private_webhooks_only(client):
+    response = client.post("/projects/jobs", json={
+        "kind": "projects",
+        "projects": {"course": "BTech CSE"},
+        "webhook_url": "https://example.com/hook"
+    })
+    assert response.status_code == 400
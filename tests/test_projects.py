@@ -0,0 +1,53 @@
+"""Corpus-first project ideas and "more ideas" sessions."""
+import ai_brain
+from project_corpus import title_fingerprint
+
+def test_more_ideas_skip_everything_already_shown(client):
+    response = client.post("/projects", json={"course": "BTech CSE", "academic_year": 3, "num_projects": 4})
+    assert response.status_code == 200
+    token = response.headers["X-Session-Token"]
+    shown = {title_fingerprint(project["title"]) for project in response.json()}
+
+    for _ in range(2):
+        more = client.post("/projects/more", json={"session": token})
+        assert more.status_code == 200
+        assert more.headers["X-Session-Token"] == token
+        titles = {title_fingerprint(project["title"]) for project in more.json()}
+        assert titles and not titles & shown
+        shown |= titles
+
+def test_more_ideas_with_an_unknown_session(client):
+    assert client.post("/projects/more", json={"session": "no-such-session"}).status_code == 404
+
+def test_stored_ideas_are_served_before_generating(client, monkeypatch):
+    generated = []
+
+    def fake_generate(course, academic_year, difficulty_level, project_type, num_projects, detail, exclude_titles):
+        projects = [
+            {
+                "title": f"Stored Idea {len(generated) + i}", "difficulty": "Medium", "success_percentage": 70,
+                "description": "An idea kept in the corpus.", "tech_stack": ["Python"], "detail_level": detail
+            }
+            for i in range(num_projects)
+        ]
+        generated.extend(project["title"] for project in projects)
+        return projects
+
+    # The corpus is skipped for the local generator; pretend a real model is configured
+    monkeypatch.setattr(ai_brain, "AI_PROVIDER", "openai")
+    monkeypatch.setattr(ai_brain, "ai_generate_project_ideas_sharded", fake_generate)
+    request = {"course": "B.Tech Corpus Studies", "academic_year": 3, "num_projects": 3}
+
+    first = client.post("/projects", json=request).json()
+    assert len(first) == 3 and len(generated) == 3
+
+    # Same course spelled differently: served from the corpus, no new generation
+    second = client.post("/projects", json=dict(request, course="btech corpus studies")).json()
+    assert len(generated) == 3
+    assert {project["title"] for project in second} <= set(generated)
+
+    # Ideas already shown are excluded, so the shortfall is generated
+    token = client.post("/projects", json=request).headers["X-Session-Token"]
+    more = client.post("/projects/more", json={"session": token}).json()
+    assert len(more) == 3 and len(generated) == 6
+    assert not {project["title"] for project in more} & set(generated[:3])
@@ -0,0 +1,213 @@
+"""
+Train and evaluate the learned success-percentage model (success_model.py).
+Training data is the LLM score log (SCORE_LOG_PATH, written by
+ai_calculate_success_percentage) plus projects from the local generator
+labelled by the heuristic predictor, which fills in courses and topics the
+log has not seen yet. LLM scores are weighted higher than heuristic labels.
+
+Usage:
+  python train_success_model.py train [--log score_log.jsonl] [--out success_model.npz]
+  python train_success_model.py eval [--log score_log.jsonl] [--model success_model.npz]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from success_model import FEATURE_BITS, SCORE_LOG_PATH, SUCCESS_MODEL_PATH, SuccessModel, featurize_batch
+
+HEURISTIC_COURSES = [
+    "BTech CSE", "BTech AIML", "BTech AI & Data Science", "BTech ECE", "BTech IT",
+    "BCA", "MCA", "BSc Computer Science", "MTech AI", "BE Electronics"
+]
+
+def load_log(path: str) -> List[Dict]:
+    """Read logged LLM scores, keeping the latest score per (course, title, difficulty)."""
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    float(record["score"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                key = (record.get("course", "").lower(), record.get("title", "").lower(), record.get("difficulty", "").lower())
+                latencies = records[key]["latencies"] if key in records else []
+                latencies.append(float(record.get("latency") or 0.0))
+                record["latencies"] = latencies
+                records[key] = record
+    except OSError:
+        return []
+    return list(records.values())
+
+def heuristic_records() -> List[Dict]:
+    """Projects from the local generator, labelled by predictor.predict_success."""
+    from local_generator import generate_project_ideas
+    from predictor import predict_success
+
+    records, seen = [], set()
+    for course in HEURISTIC_COURSES:
+        for year in (1, 2, 3, 4):
+            for project_type in (None, "software", "hardware"):
+                for project in generate_project_ideas(course, year, None, project_type, num_projects=10):
+                    key = (course, project["title"].lower())
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    records.append({
+                        "course": course,
+                        "title": project["title"],
+                        "difficulty": project["difficulty"],
+                        "description": project.get("description", ""),
+                        "tech_stack": project.get("tech_stack", []),
+                        "score": predict_success(course, project["title"], project["difficulty"], project.get("hardware") or "None")
+                    })
+    return records
+
+def fit(
+    records: List[Dict],
+    sample_weights: List[float],
+    bits: int = FEATURE_BITS,
+    epochs: int = 300,
+    learning_rate: float = 2.0,
+    l2: float = 1e-4
+) -> Tuple[np.ndarray, float]:
+    """Weighted least squares with L2, optimized by full-batch AdaGrad over the hashed features."""
+    rows, indices, values = featurize_batch(records, bits)
+    targets = np.array([float(r["score"]) for r in records])
+    sw = np.array(sample_weights, dtype=np.float64)
+    sw /= sw.sum()
+
+    weights = np.zeros(1 << bits)
+    bias = float(np.dot(sw, targets))
+    grad_sq = np.full(1 << bits, 1e-8)
+    for _ in range(epochs):
+        predictions = np.bincount(rows, weights=weights[indices] * values, minlength=len(records)) + bias
+        errors = (predictions - targets) * sw
+        gradient = np.bincount(indices, weights=errors[rows] * values, minlength=1 << bits) + l2 * weights
+        grad_sq += gradient ** 2
+        weights -= learning_rate * gradient / np.sqrt(grad_sq)
+        bias -= errors.sum()
+    # Drop weights too small to matter so the file stays compact
+    weights[np.abs(weights) < 1e-3] = 0.0
+    return weights.astype(np.float32), bias
+
+def evaluate(model: SuccessModel, records: List[Dict]) -> Dict:
+    """Agreement with the reference scores, plus model vs LLM latency."""
+    if not records:
+        return {"samples": 0}
+    targets = np.array([float(r["score"]) for r in records])
+    predictions = np.array(model.predict_batch(records))
+
+    # Time batch inference over several repeats and keep the fastest
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        model.predict_batch(records)
+        timings.append(time.perf_counter() - start)
+    model_us = min(timings) / len(records) * 1e6
+
+    errors = predictions - targets
+    report = {
+        "samples": len(records),
+        "mae": round(float(np.mean(np.abs(errors))), 2),
+        "rmse": round(float(np.sqrt(np.mean(errors ** 2))), 2),
+        "within_5": round(float(np.mean(np.abs(errors) <= 5)), 3),
+        "within_10": round(float(np.mean(np.abs(errors) <= 10)), 3),
+        "pearson_r": round(float(np.corrcoef(predictions, targets)[0, 1]), 3) if np.std(targets) > 0 and np.std(predictions) > 0 else None,
+        "model_us_per_project": round(model_us, 1)
+    }
+    latencies = [latency for r in records for latency in r.get("latencies", []) if latency > 0]
+    if latencies:
+        llm_ms = statistics.median(latencies) * 1000
+        report["llm_ms_per_project"] = round(llm_ms, 1)
+        report["latency_saved_ms_per_project"] = round(llm_ms - model_us / 1000, 1)
+        report["speedup"] = round(llm_ms * 1000 / model_us) if model_us else None
+    return report
+
+def print_report(label: str, report: Dict) -> None:
+    print(f"{label}:")
+    for key, value in report.items():
+        print(f"  {key:32s} {value}")
+
+def train(args) -> None:
+    llm = load_log(args.log)
+    rng = random.Random(args.seed)
+    rng.shuffle(llm)
+    holdout_size = int(len(llm) * args.holdout) if len(llm) >= 10 else 0
+    llm_eval, llm_train = llm[:holdout_size], llm[holdout_size:]
+
+    heuristic = heuristic_records() if args.heuristic_weight > 0 else []
+    rng.shuffle(heuristic)
+    heuristic_eval = heuristic[:len(heuristic) // 10]
+    heuristic_train = heuristic[len(heuristic) // 10:]
+
+    records = llm_train + heuristic_train
+    if not records:
+        raise SystemExit("No training data: score log is empty and heuristic labels are disabled.")
+    sample_weights = [1.0] * len(llm_train) + [args.heuristic_weight] * len(heuristic_train)
+    print(f"Training on {len(llm_train)} LLM-scored and {len(heuristic_train)} heuristic-labelled projects...")
+
+    start = time.perf_counter()
+    weights, bias = fit(records, sample_weights, bits=args.bits, epochs=args.epochs)
+    model = SuccessModel(weights, bias, args.bits)
+    print(f"Trained in {time.perf_counter() - start:.1f}s, {int(np.count_nonzero(weights))} non-zero weights")
+
+    reports = {}
+    if llm_eval:
+        reports["llm_holdout"] = evaluate(model, llm_eval)
+    if heuristic_eval:
+        reports["heuristic_holdout"] = evaluate(model, heuristic_eval)
+    for label, report in reports.items():
+        print_report(label, report)
+
+    model.meta = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "llm_samples": len(llm_train),
+        "heuristic_samples": len(heuristic_train),
+        "heuristic_weight": args.heuristic_weight,
+        "eval": reports
+    }
+    model.save(args.out)
+    print(f"Saved {args.out}")
+
+def evaluate_saved(args) -> None:
+    model = SuccessModel.load(args.model)
+    print(f"Model trained {model.meta.get('trained_at', 'unknown')} "
+          f"on {model.meta.get('llm_samples', 0)} LLM / {model.meta.get('heuristic_samples', 0)} heuristic samples")
+    records = load_log(args.log)
+    if not records:
+        print(f"No logged LLM scores in {args.log}; reporting agreement with the heuristic instead.")
+        records = heuristic_records()
+    print_report("agreement", evaluate(model, records))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="fit a model and write the weights file")
+    train_parser.add_argument("--log", default=SCORE_LOG_PATH, help="JSONL log of LLM scores")
+    train_parser.add_argument("--out", default=SUCCESS_MODEL_PATH)
+    train_parser.add_argument("--bits", type=int, default=FEATURE_BITS, help="log2 of the hashed feature space")
+    train_parser.add_argument("--epochs", type=int, default=300)
+    train_parser.add_argument("--heuristic-weight", type=float, default=0.3, help="sample weight of heuristic labels (0 disables)")
+    train_parser.add_argument("--holdout", type=float, default=0.2, help="share of LLM scores kept for evaluation")
+    train_parser.add_argument("--seed", type=int, default=0)
+    train_parser.set_defaults(func=train)
+
+    eval_parser = subparsers.add_parser("eval", help="report agreement with logged LLM scores and latency saved")
+    eval_parser.add_argument("--log", default=SCORE_LOG_PATH)
+    eval_parser.add_argument("--model", default=SUCCESS_MODEL_PATH)
+    eval_parser.set_defaults(func=evaluate_saved)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()